@@ -1,7 +1,8 @@
 "use client";
 
+import { useEffect, useState } from "react";
 import { motion, AnimatePresence } from "framer-motion";
-import { Player } from "../types";
+import { Player, PlayerHistory } from "../types";
 import { X } from "lucide-react";
 import Image from "next/image";
 
@@ -10,8 +11,58 @@ interface PlayerCardProps {
   onClose: () => void;
 }
 
+const SHARDS_URL = `${process.env.NEXT_PUBLIC_BASE_PATH || ""}/collections/players`;
+// Same rule as shard_file() in scripts/player_shards.py
+const SAFE_ID = /^[a-z0-9][a-z0-9_-]*$/;
+
+// Shards keep their names as the weekly save appends to them, so both they
+// and the index are revalidated (a 304 when unchanged) instead of served
+// stale from the HTTP cache
+async function fetchHistory(id: string): Promise<PlayerHistory | null> {
+  let file = `${id}.json`;
+  if (!SAFE_ID.test(id) || id === "index") {
+    const index = await fetch(`${SHARDS_URL}/index.json`, { cache: "no-cache" }).then((r) =>
+      r.ok ? r.json() : {}
+    );
+    if (!index[id]) return null;
+    file = index[id].file;
+  }
+  const res = await fetch(`${SHARDS_URL}/${file}`, { cache: "no-cache" });
+  return res.ok ? res.json() : null;
+}
+
+function Sparkline({ values }: { values: number[] }) {
+  const w = 160;
+  const h = 28;
+  const max = Math.max(...values, 1);
+  const step = values.length > 1 ? w / (values.length - 1) : 0;
+  const points = values
+    .map((v, i) => `${(i * step).toFixed(1)},${(h - (v / max) * h).toFixed(1)}`)
+    .join(" ");
+  return (
+    <svg width={w} height={h} viewBox={`0 0 ${w} ${h}`} className="mx-auto mt-2 overflow-visible">
+      <polyline points={points} fill="none" stroke="currentColor" strokeWidth={1.5} opacity={0.7} />
+    </svg>
+  );
+}
+
 export default function PlayerCard({ player, onClose }: PlayerCardProps) {
   const isElite = player && player.tier === "legendary";
+  const [loaded, setLoaded] = useState<PlayerHistory | null>(null);
+  const history = player && loaded?.id === player.id ? loaded : null;
+
+  useEffect(() => {
+    if (!player) return;
+    let cancelled = false;
+    fetchHistory(player.id)
+      .then((h) => {
+        if (!cancelled) setLoaded(h);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [player]);
 
   return (
     <AnimatePresence>
@@ -137,6 +188,9 @@ export default function PlayerCard({ player, onClose }: PlayerCardProps) {
                   <span className="text-xs uppercase opacity-60">
                     Weekly Power
                   </span>
+                  {history && history.plw.length > 1 && (
+                    <Sparkline values={history.plw} />
+                  )}
                 </div>
               </motion.div>
 
@@ -5,19 +5,43 @@ import { Player } from "../types";
 
 interface PlayerDotProps {
   player: Player;
+  x: number; // dot centre, % of the plot width
+  y: number; // ... and height, from the bottom
+  size: number; // diameter in px
+  outlier?: string[]; // fields beyond the axes (the dot sits on the edge)
+  animated: boolean; // scale in and ping; off for large boards
   onClick: () => void;
 }
 
-export default function PlayerDot({ player, onClick }: PlayerDotProps) {
+export default function PlayerDot({
+  player,
+  x,
+  y,
+  size,
+  outlier,
+  animated,
+  onClick,
+}: PlayerDotProps) {
   const isElite = player.tier === "legendary";
-  const xPos = Math.min((player.uscf / 2000) * 100, 98);
-  const yPos = Math.min((player.plw / 400) * 100, 98);
+  const offChart = outlier
+    ?.map(
+      (field) =>
+        `${field.toUpperCase()} ${field === "uscf" ? player.uscf : player.plw}`
+    )
+    .join(", ");
 
   return (
     <motion.div
       className="absolute cursor-pointer group"
-      style={{ left: `${xPos}%`, bottom: `${yPos}%` }}
-      initial={{ scale: 0, opacity: 0 }}
+      style={{
+        left: `${x}%`,
+        bottom: `${y}%`,
+        width: size,
+        height: size,
+        marginLeft: -size / 2,
+        marginBottom: -size / 2,
+      }}
+      initial={animated ? { scale: 0, opacity: 0 } : false}
       animate={{ scale: 1, opacity: 1 }}
       whileHover={{ scale: 1.3, zIndex: 10 }}
       whileTap={{ scale: 0.95 }}
@@ -25,7 +49,7 @@ export default function PlayerDot({ player, onClick }: PlayerDotProps) {
       onClick={onClick}
     >
       {/* Ping animation for rising players */}
-      {player.delta > 0 && (
+      {animated && player.delta > 0 && (
         <motion.div
           className="absolute -inset-4 rounded-full border border-yellow-500/50"
           animate={{ scale: [1, 1.5], opacity: [0.75, 0] }}
@@ -35,7 +59,9 @@ export default function PlayerDot({ player, onClick }: PlayerDotProps) {
 
       {/* Player dot */}
       <motion.div
-        className={`relative w-10 h-10 rounded-full border-2 flex items-center justify-center shadow-lg ${
+        className={`relative w-full h-full rounded-full flex items-center justify-center shadow-lg ${
+          size >= 24 ? "border-2" : "border"
+        } ${outlier ? "border-dashed" : ""} ${
           isElite
             ? "bg-yellow-500 border-yellow-200"
             : "bg-slate-700 border-slate-500 group-hover:bg-indigo-500"
@@ -43,9 +69,11 @@ export default function PlayerDot({ player, onClick }: PlayerDotProps) {
         whileHover={{ rotate: [0, -5, 5, 0] }}
         transition={{ duration: 0.3 }}
       >
-        <span className="text-[10px] font-bold text-white">
-          {player.name.split(" ")[0].charAt(0)}
-        </span>
+        {size >= 24 && (
+          <span className="text-[10px] font-bold text-white">
+            {player.name.split(" ")[0].charAt(0)}
+          </span>
+        )}
       </motion.div>
 
       {/* Tooltip */}
@@ -55,6 +83,7 @@ export default function PlayerDot({ player, onClick }: PlayerDotProps) {
         whileHover={{ y: 0 }}
       >
         {player.name}
+        {offChart && ` (${offChart})`}
       </motion.div>
     </motion.div>
   );
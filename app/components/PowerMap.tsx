@@ -1,16 +1,75 @@
 "use client";
 
+import { useMemo } from "react";
 import { motion } from "framer-motion";
 import { Zap } from "lucide-react";
-import { Player } from "../types";
+import { Player, PowerMapAxis, PowerMapLayout } from "../types";
 import PlayerDot from "./PlayerDot";
 
+// Boards up to this size scale their dots in one after another and ping
+// rising players; larger ones just appear
+const ANIMATE_LIMIT = 100;
+// Axes when there is no layout file
+const FALLBACK_X: PowerMapAxis = {
+  field: "uscf",
+  min: 0,
+  max: 2000,
+  ticks: [0, 500, 1000, 1500, 2000],
+};
+const FALLBACK_Y: PowerMapAxis = {
+  field: "plw",
+  min: 0,
+  max: 400,
+  ticks: [0, 100, 200, 300, 400],
+};
+const MAX_DOT = 40;
+
+// Value → % along an axis, kept off the very edge
+function scale(value: number, axis: PowerMapAxis): number {
+  const t = ((value - axis.min) / (axis.max - axis.min)) * 100;
+  return Math.min(Math.max(t, 2), 98);
+}
+
 interface PowerMapProps {
   players: Player[];
+  layout: PowerMapLayout | null; // precomputed by scripts/power_map.py
   onPlayerClick: (player: Player) => void;
 }
 
-export default function PowerMap({ players, onPlayerClick }: PowerMapProps) {
+export default function PowerMap({ players, layout, onPlayerClick }: PowerMapProps) {
+  // id → dot centre in % of the plot
+  const positions = useMemo(() => {
+    const map = new Map<string, { x: number; y: number }>();
+    if (layout) {
+      layout.ids.forEach((id, i) =>
+        map.set(id, { x: layout.x[i] / 100, y: layout.y[i] / 100 })
+      );
+    }
+    return map;
+  }, [layout]);
+
+  const xAxis = layout ? layout.xAxis : FALLBACK_X;
+  const yAxis = layout ? layout.yAxis : FALLBACK_Y;
+  // The layout's dot size is for the whole board; a group's board is
+  // sparser, so its dots grow as power_map.dot_size() would size them
+  const dot = layout
+    ? Math.min(
+        MAX_DOT,
+        Math.floor(layout.dot * Math.sqrt(layout.ids.length / Math.max(players.length, 1)))
+      )
+    : MAX_DOT;
+  const animated = players.length <= ANIMATE_LIMIT;
+
+  // Players missing from the layout (it predates the board) go by value
+  function position(player: Player) {
+    return (
+      positions.get(player.id) || {
+        x: scale(player.uscf, xAxis),
+        y: scale(player.plw, yAxis),
+      }
+    );
+  }
+
   return (
     <motion.section
       className="mb-8"
@@ -42,7 +101,7 @@ export default function PowerMap({ players, onPlayerClick }: PowerMapProps) {
           <div className="flex">
             {/* Y-axis numbers */}
             <div className="flex flex-col justify-between items-end pr-3 py-2 w-12">
-              {[400, 300, 200, 100, 0].map((val) => (
+              {[...yAxis.ticks].reverse().map((val) => (
                 <span key={val} className="text-sm text-slate-300 font-mono font-medium">
                   {val}
                 </span>
@@ -52,26 +111,48 @@ export default function PowerMap({ players, onPlayerClick }: PowerMapProps) {
             {/* Main chart */}
             <div className="flex-1 h-[500px] bg-slate-900 rounded-xl relative overflow-hidden shadow-inner border border-slate-800">
               {/* Grid background */}
-              <div className="absolute inset-0 grid grid-cols-4 grid-rows-4 opacity-10 pointer-events-none">
-                {Array.from({ length: 16 }).map((_, i) => (
+              <div
+                className="absolute inset-0 grid opacity-10 pointer-events-none"
+                style={{
+                  gridTemplateColumns: `repeat(${xAxis.ticks.length - 1}, 1fr)`,
+                  gridTemplateRows: `repeat(${yAxis.ticks.length - 1}, 1fr)`,
+                }}
+              >
+                {Array.from({
+                  length: (xAxis.ticks.length - 1) * (yAxis.ticks.length - 1),
+                }).map((_, i) => (
                   <div key={i} className="border border-slate-500" />
                 ))}
               </div>
 
               {/* Player dots */}
-        {players.map((player, index) => (
-          <motion.div
-            key={player.id}
-            initial={{ opacity: 0, scale: 0 }}
-            animate={{ opacity: 1, scale: 1 }}
-            transition={{ delay: index * 0.05 }}
-          >
-            <PlayerDot
-              player={player}
-              onClick={() => onPlayerClick(player)}
-            />
-          </motion.div>
-        ))}
+              {players.map((player, index) => {
+                const { x, y } = position(player);
+                const playerDot = (
+                  <PlayerDot
+                    key={player.id}
+                    player={player}
+                    x={x}
+                    y={y}
+                    size={dot}
+                    outlier={layout?.outliers[player.id]}
+                    animated={animated}
+                    onClick={() => onPlayerClick(player)}
+                  />
+                );
+                return animated ? (
+                  <motion.div
+                    key={player.id}
+                    initial={{ opacity: 0, scale: 0 }}
+                    animate={{ opacity: 1, scale: 1 }}
+                    transition={{ delay: index * 0.05 }}
+                  >
+                    {playerDot}
+                  </motion.div>
+                ) : (
+                  playerDot
+                );
+              })}
 
               {/* Empty state */}
               {players.length === 0 && (
@@ -91,7 +172,7 @@ export default function PowerMap({ players, onPlayerClick }: PowerMapProps) {
 
           {/* X-axis numbers */}
           <div className="flex justify-between pl-12 pr-0 pt-2">
-            {[0, 500, 1000, 1500, 2000].map((val) => (
+            {xAxis.ticks.map((val) => (
               <span key={val} className="text-sm text-slate-300 font-mono font-medium">
                 {val}
               </span>
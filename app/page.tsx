@@ -3,33 +3,100 @@
 import { useState, useEffect, useMemo } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import { Search, X } from "lucide-react";
-import { Player } from "./types";
+import { GroupSummary, Player, PowerMapLayout } from "./types";
+import { SEARCH_VERSION, SearchIndex, searchPlayers } from "./search";
 import PowerMap from "./components/PowerMap";
 import PlayerCard from "./components/PlayerCard";
 
+// manifest.json is tiny and revalidated on every load; the hashed files it
+// points at never change, so caches keep them. Fetched once per page load.
+let manifestPromise: Promise<Record<string, string>> | null = null;
+function loadManifest(base: string): Promise<Record<string, string>> {
+  manifestPromise ??= fetch(`${base}/manifest.json`, { cache: "no-cache" })
+    .then((r) => (r.ok ? r.json() : {}))
+    .catch(() => ({}));
+  return manifestPromise;
+}
+
+// The hashed file manifest.json names under key, parsed; null if missing
+function loadManifestEntry<T>(base: string, key: string): Promise<T | null> {
+  return loadManifest(base)
+    .then((manifest) =>
+      manifest[key] ? fetch(`${base}/${manifest[key]}`) : null
+    )
+    .then((r) => (r && r.ok ? r.json() : null))
+    .catch(() => null);
+}
+
 export default function Home() {
   const [players, setPlayers] = useState<Player[]>([]);
   const [selectedPlayer, setSelectedPlayer] = useState<Player | null>(null);
   const [searchQuery, setSearchQuery] = useState("");
+  const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
+  const [layout, setLayout] = useState<PowerMapLayout | null>(null);
+  // public/groups/index.json; null until loaded
+  const [groups, setGroups] = useState<Record<string, GroupSummary> | null>(null);
+  // Slug of the group being viewed ("" for the whole roster), kept in
+  // ?group=; null until the URL has been read
+  const [group, setGroup] = useState<string | null>(null);
   const [status, setStatus] = useState<"loading" | "connected" | "error">(
     "loading"
   );
 
-  // Filter players based on search query
+  const playersById = useMemo(
+    () => new Map(players.map((p) => [p.id, p])),
+    [players]
+  );
+
+  // Filter players based on search query: posting-list lookups in the
+  // prebuilt index, or a scan when there is none
   const searchResults = useMemo(() => {
     if (!searchQuery.trim()) return [];
+    if (searchIndex) return searchPlayers(searchIndex, searchQuery, playersById);
     const query = searchQuery.toLowerCase();
     return players.filter(
       (p) =>
         p.name.toLowerCase().includes(query) ||
         p.pokemonName.toLowerCase().includes(query)
     );
-  }, [players, searchQuery]);
+  }, [players, playersById, searchIndex, searchQuery]);
 
   useEffect(() => {
+    const base = process.env.NEXT_PUBLIC_BASE_PATH || "";
+    setGroup(new URLSearchParams(window.location.search).get("group") || "");
+    fetch(`${base}/groups/index.json`, { cache: "no-cache" })
+      .then((r) => (r.ok ? r.json() : {}))
+      .catch(() => ({}))
+      .then(setGroups);
+    loadManifestEntry<SearchIndex>(base, "search").then((index) => {
+      if (index?.v === SEARCH_VERSION) setSearchIndex(index);
+    });
+    loadManifestEntry<PowerMapLayout>(base, "powerMap").then((map) => {
+      if (map?.v === 1) setLayout(map);
+    });
+  }, []);
+
+  // The board to show: a group's file, "" for the whole roster, null while
+  // a group board still waits for the index to name its file
+  const groupFile =
+    group === null || (group && groups === null)
+      ? null
+      : (group && groups?.[group]?.file) || "";
+
+  useEffect(() => {
+    if (groupFile === null) return;
     async function loadData() {
       try {
-        const res = await fetch(`${process.env.NEXT_PUBLIC_BASE_PATH || ""}/players.json?v=${Date.now()}`);
+        const base = process.env.NEXT_PUBLIC_BASE_PATH || "";
+        let url: string;
+        if (groupFile) {
+          // Only the group being viewed; its name changes with its content
+          url = `${base}/groups/${groupFile}`;
+        } else {
+          const manifest = await loadManifest(base);
+          url = `${base}/${manifest.players || "players.json"}`;
+        }
+        const res = await fetch(url);
         if (!res.ok) throw new Error("Failed to load");
         const data = await res.json();
         setPlayers(data);
@@ -40,7 +107,23 @@ export default function Home() {
       }
     }
     loadData();
-  }, []);
+  }, [groupFile]);
+
+  function selectGroup(slug: string) {
+    setGroup(slug);
+    const url = new URL(window.location.href);
+    if (slug) url.searchParams.set("group", slug);
+    else url.searchParams.delete("group");
+    window.history.replaceState(null, "", url);
+  }
+
+  const groupOptions = useMemo(
+    () =>
+      Object.entries(groups || {}).sort(([, a], [, b]) =>
+        a.group.localeCompare(b.group, undefined, { numeric: true })
+      ),
+    [groups]
+  );
 
   return (
     <div className="bg-slate-950 text-slate-200 font-sans min-h-screen px-4 py-6 sm:p-8">
@@ -151,23 +234,40 @@ export default function Home() {
         animate={{ opacity: 1, y: 0 }}
         transition={{ delay: 0.5 }}
       >
-        <div className="relative">
-          <Search className="absolute left-4 top-1/2 -translate-y-1/2 text-slate-500 w-5 h-5" />
-          <input
-            type="text"
-            placeholder="Search players or Pokemon..."
-            value={searchQuery}
-            onChange={(e) => setSearchQuery(e.target.value)}
-            className="w-full bg-slate-900 border border-slate-700 rounded-xl py-3 pl-12 pr-12 text-white placeholder-slate-500 focus:outline-none focus:border-indigo-500 transition-colors"
-          />
-          {searchQuery && (
-            <button
-              onClick={() => setSearchQuery("")}
-              className="absolute right-4 top-1/2 -translate-y-1/2 text-slate-500 hover:text-white"
+        <div className="flex gap-3">
+          {groupOptions.length > 0 && (
+            <select
+              value={group && groups?.[group] ? group : ""}
+              onChange={(e) => selectGroup(e.target.value)}
+              className="bg-slate-900 border border-slate-700 rounded-xl px-4 text-white focus:outline-none focus:border-indigo-500 transition-colors"
+              aria-label="Group"
             >
-              <X className="w-5 h-5" />
-            </button>
+              <option value="">All groups</option>
+              {groupOptions.map(([slug, g]) => (
+                <option key={slug} value={slug}>
+                  {g.group || "No group"} ({g.players})
+                </option>
+              ))}
+            </select>
           )}
+          <div className="relative flex-1">
+            <Search className="absolute left-4 top-1/2 -translate-y-1/2 text-slate-500 w-5 h-5" />
+            <input
+              type="text"
+              placeholder="Search players or Pokemon..."
+              value={searchQuery}
+              onChange={(e) => setSearchQuery(e.target.value)}
+              className="w-full bg-slate-900 border border-slate-700 rounded-xl py-3 pl-12 pr-12 text-white placeholder-slate-500 focus:outline-none focus:border-indigo-500 transition-colors"
+            />
+            {searchQuery && (
+              <button
+                onClick={() => setSearchQuery("")}
+                className="absolute right-4 top-1/2 -translate-y-1/2 text-slate-500 hover:text-white"
+              >
+                <X className="w-5 h-5" />
+              </button>
+            )}
+          </div>
         </div>
 
         {/* Search results dropdown */}
@@ -214,6 +314,7 @@ export default function Home() {
       <main className="max-w-5xl mx-auto">
         <PowerMap
           players={players}
+          layout={layout}
           onPlayerClick={(player) => setSelectedPlayer(player)}
         />
 
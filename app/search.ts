@@ -0,0 +1,87 @@
+import { Player } from "./types";
+
+// public/search.<hash>.json (scripts/search_index.py)
+export interface SearchIndex {
+  v: number;
+  ids: string[]; // doc number → player id
+  tri: Record<string, number[]>; // trigrams of name and pokemonName
+}
+
+export const SEARCH_VERSION = 2;
+
+// Combining marks left by NFKD (a RegExp, as tsconfig targets ES2017)
+const MARKS = new RegExp("\\p{M}", "gu");
+
+// Must match search_index.normalize(): accents folded, lower case, any run
+// of other characters → one space
+export function normalize(text: string): string {
+  return text
+    .normalize("NFKD")
+    .replace(MARKS, "")
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, " ")
+    .trim();
+}
+
+// Docs in every (ascending) posting list, smallest list first
+function intersect(lists: number[][]): number[] {
+  const sorted = [...lists].sort((a, b) => a.length - b.length);
+  let result = sorted[0] || [];
+  for (const list of sorted.slice(1)) {
+    const next: number[] = [];
+    let j = 0;
+    for (const doc of result) {
+      while (j < list.length && list[j] < doc) j++;
+      if (j === list.length) break;
+      if (list[j] === doc) next.push(doc);
+    }
+    result = next;
+    if (result.length === 0) break;
+  }
+  return result;
+}
+
+// normalize()d name and pokemonName of a player, computed once
+const searchText = new WeakMap<Player, string>();
+
+function matches(player: Player, q: string): boolean {
+  let text = searchText.get(player);
+  if (text === undefined) {
+    text = `${normalize(player.name)}\n${normalize(player.pokemonName)}`;
+    searchText.set(player, text);
+  }
+  return text.includes(q);
+}
+
+// Players matching the query anywhere in a name, in board order. Players
+// not in `byId` (e.g. outside the group being viewed) are left out.
+export function searchPlayers(
+  index: SearchIndex,
+  query: string,
+  byId: Map<string, Player>
+): Player[] {
+  const q = normalize(query);
+  if (!q) return [];
+
+  // Shorter than a trigram: no postings, scan the board (such a query
+  // matches much of it anyway)
+  let docs: number[] | null = null;
+  if (q.length >= 3) {
+    const lists: number[][] = [];
+    for (let i = 0; i + 3 <= q.length; i++) {
+      const list = index.tri[q.slice(i, i + 3)];
+      if (!list) return [];
+      lists.push(list);
+    }
+    docs = intersect(lists);
+  }
+
+  // Trigrams can all be present without the query being a substring, so
+  // the candidates are checked too
+  const results: Player[] = [];
+  for (const id of docs ? docs.map((doc) => index.ids[doc]) : index.ids) {
+    const player = byId.get(id);
+    if (player && matches(player, q)) results.push(player);
+  }
+  return results;
+}
@@ -10,3 +10,93 @@ export interface Player {
   tier: string;
   delta: number;
 }
+
+// public/groups/index.json (scripts/player_groups.py), keyed by slug
+export interface GroupSummary {
+  group: string;
+  file: string; // <slug>.<hash>.json, a Player[] board
+  roster: number;
+  players: number;
+  plwTotal: number;
+  tiers: Record<string, number>;
+  top: Record<string, { id: string; name: string; plw: number }>;
+}
+
+// public/power-map.<hash>.json (scripts/power_map.py)
+export interface PowerMapAxis {
+  field: string;
+  min: number;
+  max: number;
+  ticks: number[];
+}
+
+export interface PowerMapLayout {
+  v: number;
+  size: [number, number]; // plot size in px the layout was solved for
+  dot: number; // dot diameter in px
+  xAxis: PowerMapAxis; // USCF
+  yAxis: PowerMapAxis; // PLW
+  ids: string[];
+  x: number[]; // dot centres, 0–10000 of the plot width
+  y: number[]; // ... and height, from the bottom
+  outliers: Record<string, string[]>; // id → fields beyond the axes
+}
+
+// public/collections/aggregates.json (scripts/collection_aggregates.py)
+export interface WeekRecord {
+  date: string;
+  plw: number;
+}
+
+export interface LeaderboardEntry {
+  id: string;
+  name: string;
+  value: number;
+  date?: string; // bestWeek boards
+}
+
+export interface PlayerAggregate {
+  name: string;
+  weeks: number;
+  totalPlw: number;
+  bestWeek: WeekRecord;
+  legendaryStreak: number;
+  longestLegendaryStreak: number;
+  firstSeen: string;
+  lastSeen: string;
+  seasons: Record<string, { weeks: number; totalPlw: number; bestWeek: WeekRecord }>;
+}
+
+export interface WeekAggregate {
+  season: string;
+  players: number;
+  totalPlw: number;
+  tiers: Record<string, number>;
+  top: { id: string; name: string; plw: number } | null;
+  streaking: string[];
+}
+
+export interface Aggregates {
+  lastWeek: string | null;
+  players: Record<string, PlayerAggregate>;
+  weeks: Record<string, WeekAggregate>;
+  leaderboards: {
+    allTime: {
+      totalPlw: LeaderboardEntry[];
+      bestWeek: LeaderboardEntry[];
+      longestLegendaryStreak: LeaderboardEntry[];
+    };
+    seasons: Record<string, { totalPlw: LeaderboardEntry[]; bestWeek: LeaderboardEntry[] }>;
+  };
+}
+
+// public/collections/players/<id>.json (scripts/player_shards.py)
+export interface PlayerHistory {
+  id: string;
+  name: string;
+  dates: string[];
+  plw: number[];
+  tier: string[];
+  pokemonId: number[];
+  puzzles: number[];
+}
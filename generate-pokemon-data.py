@@ -4,11 +4,18 @@ Fetch all Pokémon data from PokeAPI and generate pokemon-data.json
 Run once to generate the data file, then scraper.py loads it.
 """
 
+import argparse
 import json
+import os
+import sys
 import time
 import requests
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from profiling import add_profile_arguments, phase, profiled
+
 BASE_URL = "https://pokeapi.co/api/v2"
+REQUEST_DELAY = 0.05  # seconds between requests, to stay under PokeAPI's rate limit
 
 def fetch_with_retry(url, retries=3):
     """Fetch URL with retry logic for rate limiting."""
@@ -83,7 +90,7 @@ def get_all_pokemon_species():
             species_to_evolution_chain[pokemon_id] = chain_id
 
         # Small delay to avoid rate limiting
-        time.sleep(0.05)
+        time.sleep(REQUEST_DELAY)
 
     return pokemon_names, legendaries, mythicals, species_to_evolution_chain
 
@@ -158,17 +165,34 @@ def get_all_evolution_chains(pokemon_names):
                 if path not in all_chains:
                     all_chains.append(path)
 
-        time.sleep(0.05)
+        time.sleep(REQUEST_DELAY)
 
     return all_chains
 
 def main():
+    global BASE_URL, REQUEST_DELAY
+    parser = argparse.ArgumentParser(description="Generate pokemon-data.json from PokeAPI")
+    parser.add_argument("--output", default="pokemon-data.json", help="Output path")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="API root, e.g. a scripts/pokeapi_stub.py server")
+    parser.add_argument("--delay", type=float, default=REQUEST_DELAY,
+                        help=f"Seconds to wait between requests (default: {REQUEST_DELAY})")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    BASE_URL = args.base_url.rstrip("/")
+    REQUEST_DELAY = args.delay
+
+    with profiled(args, args.output):
+        generate(args.output)
+
+def generate(output_path):
     print("=" * 50)
     print("Pokémon Data Generator")
     print("=" * 50)
 
     # Step 1: Get all species
-    pokemon_names, legendaries, mythicals, species_chains = get_all_pokemon_species()
+    with phase("species"):
+        pokemon_names, legendaries, mythicals, species_chains = get_all_pokemon_species()
 
     if not pokemon_names:
         print("Failed to fetch Pokémon data")
@@ -180,7 +204,8 @@ def main():
     print(f"  - {len(mythicals)} mythicals")
 
     # Step 2: Get evolution chains
-    evolution_chains = get_all_evolution_chains(pokemon_names)
+    with phase("evolution chains"):
+        evolution_chains = get_all_evolution_chains(pokemon_names)
     print(f"  - {len(evolution_chains)} evolution chains")
 
     # Combine legendaries and mythicals for the "elite" tier
@@ -203,8 +228,7 @@ def main():
     }
 
     # Save to file
-    output_path = "pokemon-data.json"
-    with open(output_path, 'w') as f:
+    with phase("write"), open(output_path, 'w') as f:
         json.dump(output, f, indent=2)
 
     print(f"\nSaved to {output_path}")
@@ -0,0 +1,1008 @@
+// ── Data (race.json, next to this script) ─────────────────────────────────
+const DATA_URL = new URL('race.json', document.currentScript.src);
+let RACERS = [];
+let TIMELINE = null; // decoded data.race — see race_sim.simulate_race()
+
+// ── Constants ─────────────────────────────────────────────────────────────
+const TARGET_LAPS   = 2;
+const ARC_SAMPLES   = 1200;
+const KART_W_BASE   = 20;
+const KART_H_BASE   = 13;
+
+const LOD_THRESHOLD = 40;      // above this many karts: batched drawing, culled labels
+const LABEL_CELL    = 48;      // px, label collision grid
+
+// ── Canvas setup ──────────────────────────────────────────────────────────
+const canvas  = document.getElementById('track');
+const ctx     = canvas.getContext('2d');
+let viewW, viewH;          // canvas size in CSS px; all drawing uses these units
+let pixelRatio = 1;        // backing-store pixels per CSS px
+let cx, cy, rx, ry, roadWidth, kartW, kartH;
+let arcTable = null; // { lengths[], angles[], totalLen }
+let staticLayer = null; // offscreen canvas, rebuilt lazily after resize
+
+// ── Adaptive quality ──────────────────────────────────────────────────────
+// The time draw() takes (measured around the call, not the rAF interval,
+// which a 30 Hz or battery-saver display stretches however cheap drawing
+// is) is tracked as a moving average over on-screen frames. When it stays
+// over DRAW_BUDGET_MS for QUALITY_HOLD_FRAMES, the next cheaper level is
+// used: no sparkle aura, then no kart shadows, then 1x resolution instead
+// of devicePixelRatio. Levels only go down; a device that could not keep
+// up once gets no retry that would stutter again. Past the last level the
+// page switches to the race video when there is one.
+const QUALITY_LEVELS = [
+  { maxScale: 2, aura: true,  shadows: true  },
+  { maxScale: 2, aura: false, shadows: true  },
+  { maxScale: 2, aura: false, shadows: false },
+  { maxScale: 1, aura: false, shadows: false },
+];
+const DRAW_BUDGET_MS      = 10;  // of a 60 Hz frame's 16.7 ms, leaving room to composite
+const DRAW_EMA_ALPHA      = 0.1;
+const QUALITY_HOLD_FRAMES = 60;
+let qualityLevel = 0;
+let drawEma      = 0;
+let slowFrames   = 0;
+
+function quality() {
+  return QUALITY_LEVELS[qualityLevel];
+}
+
+function trackDrawTime(ms) {
+  drawEma = drawEma ? drawEma + DRAW_EMA_ALPHA * (ms - drawEma) : ms;
+  slowFrames = drawEma > DRAW_BUDGET_MS ? slowFrames + 1 : 0;
+  if (slowFrames < QUALITY_HOLD_FRAMES) return;
+  drawEma = slowFrames = 0;
+  if (qualityLevel === QUALITY_LEVELS.length - 1) {
+    // Still too slow at the cheapest level: play the pre-rendered race
+    lowPower = true;
+    if (currentRace && wantsVideo(currentRace)) showVideo(currentRace.video);
+    return;
+  }
+  const prev = quality();
+  qualityLevel++;
+  if (quality().maxScale !== prev.maxScale) resizeCanvas();
+}
+
+// ── Cached bitmaps ────────────────────────────────────────────────────────
+// Name pills, the finisher list and the lap badge are text rendered once
+// into small canvases at device resolution and blitted every frame. Their
+// font sizes follow the kart size, so resizeCanvas() drops them all.
+const labelSprites = new Map();  // label → sprite
+let finisherRows = [];           // { text, color, w } per finisher, in order
+let finisherRowsW = 0;           // widest row
+let finisherPanel = null;        // sprite, rebuilt when a visible row is added
+let lapBadge = null;             // sprite, rebuilt when the lap changes
+const measureCtx = document.createElement('canvas').getContext('2d');
+
+function clearSprites() {
+  labelSprites.clear();
+  finisherRows = [];
+  finisherRowsW = 0;
+  finisherPanel = lapBadge = null;
+}
+
+// A w×h (CSS px) canvas at the current pixel ratio, painted in CSS px
+function makeSprite(w, h, paint) {
+  const sprite = document.createElement('canvas');
+  sprite.width  = Math.ceil(w * pixelRatio);
+  sprite.height = Math.ceil(h * pixelRatio);
+  sprite.w = sprite.width  / pixelRatio;
+  sprite.h = sprite.height / pixelRatio;
+  const g = sprite.getContext('2d');
+  g.scale(pixelRatio, pixelRatio);
+  paint(g);
+  return sprite;
+}
+
+function buildArcTable(rx, ry) {
+  const N = ARC_SAMPLES;
+  const lengths = new Float64Array(N + 1);
+  lengths[0] = 0;
+  for (let i = 1; i <= N; i++) {
+    const tmid = (2 * Math.PI * (i - 0.5)) / N;
+    const dxdt = -rx * Math.sin(tmid);
+    const dydt =  ry * Math.cos(tmid);
+    const ds   = Math.sqrt(dxdt * dxdt + dydt * dydt) * (2 * Math.PI / N);
+    lengths[i] = lengths[i - 1] + ds;
+  }
+  const angles = new Float64Array(N + 1);
+  for (let i = 0; i <= N; i++) angles[i] = (2 * Math.PI * i) / N;
+  return { lengths, angles, totalLen: lengths[N] };
+}
+
+function arcFracToTheta(frac) {
+  // frac in [0,1) → theta
+  const target = ((frac % 1) + 1) % 1 * arcTable.totalLen;
+  const L = arcTable.lengths;
+  let lo = 0, hi = ARC_SAMPLES;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (L[mid] < target) lo = mid + 1; else hi = mid;
+  }
+  // linear interpolation
+  const i0 = Math.max(0, lo - 1);
+  const L0 = L[i0], L1 = L[lo] ?? L[ARC_SAMPLES];
+  const t  = L1 > L0 ? (target - L0) / (L1 - L0) : 0;
+  const a0 = arcTable.angles[i0];
+  const a1 = arcTable.angles[lo] ?? 2 * Math.PI;
+  return a0 + t * (a1 - a0);
+}
+
+function thetaToXY(theta) {
+  return { x: cx + rx * Math.cos(theta), y: cy + ry * Math.sin(theta) };
+}
+
+function thetaToHeading(theta) {
+  return Math.atan2(ry * Math.cos(theta), -rx * Math.sin(theta));
+}
+
+function resizeCanvas() {
+  const wrapper = document.getElementById('canvas-wrapper');
+  viewW = wrapper.offsetWidth - 16;
+  viewH = Math.round(viewW * 0.56);
+  pixelRatio = Math.min(window.devicePixelRatio || 1, quality().maxScale);
+  canvas.width  = Math.round(viewW * pixelRatio);
+  canvas.height = Math.round(viewH * pixelRatio);
+  ctx.setTransform(pixelRatio, 0, 0, pixelRatio, 0, 0);  // reset by the size change
+  cx = viewW / 2;
+  cy = viewH / 2;
+  rx = viewW * 0.41;
+  ry = viewH * 0.37;
+  roadWidth = Math.min(viewW, viewH) * 0.13;
+  kartW = Math.max(10, viewW * 0.021);
+  kartH = Math.max(7,  viewH * 0.040);
+  arcTable = buildArcTable(rx, ry);
+  staticLayer = null;
+  clearSprites();
+}
+// Rebuilding the canvas and arc table on every resize event stalls drags;
+// wait until the window has settled
+const RESIZE_DEBOUNCE_MS = 150;
+let resizeTimer = null;
+window.addEventListener('resize', () => {
+  clearTimeout(resizeTimer);
+  resizeTimer = setTimeout(() => {
+    resizeCanvas();
+    requestFrame();  // resizing clears the canvas
+  }, RESIZE_DEBOUNCE_MS);
+});
+resizeCanvas();
+
+// ── Grass tile pattern ────────────────────────────────────────────────────
+function makeGrassTile() {
+  const oc = document.createElement('canvas');
+  oc.width = oc.height = 8;
+  const ox = oc.getContext('2d');
+  ox.fillStyle = '#2d6e3a'; ox.fillRect(0,0,8,8);
+  ox.fillStyle = '#3a7d44'; ox.fillRect(0,0,4,4); ox.fillRect(4,4,4,4);
+  return oc;
+}
+const grassTile = makeGrassTile();
+
+// ── Racer state ───────────────────────────────────────────────────────────
+let racerState = [];
+let drawOrder  = [];   // racerState by arcPos, maintained by sortDrawOrder()
+let finishers  = [];   // racerState in finishing order
+
+function initRacerState() {
+  racerState = RACERS.map((r, i) => ({
+    name:        r.name,
+    label:       r.name.split(' ')[0],
+    plw:         r.plw,
+    arcPos:      TIMELINE.count ? TIMELINE.pos[i] : 0,
+    laps:        0,
+    finished:    false,
+    finishOrder: null,
+    celebrating: false,
+    celebEnd:    0,
+    color:       r.color,
+  }));
+  drawOrder = [...racerState].sort((a, b) => a.arcPos - b.arcPos);
+  finishers = [];
+  finisherRows = [];
+  finisherRowsW = 0;
+  finisherPanel = null;
+  raceOver = false;
+  clearTimeout(overlayTimer);
+  raceClock = 0;
+  finishCount = 0;
+  document.getElementById('overlay').classList.remove('show');
+}
+
+let raceOver    = false;
+let overlayTimer = null;
+let raceClock   = 0;   // seconds into the precomputed race
+let finishCount = 0;
+
+// ── Timeline playback ─────────────────────────────────────────────────────
+// The race is simulated ahead of time in Python; keyframes hold every kart's
+// arc position each `tick` seconds (last keyframe at `end`), delta-encoded.
+function decodeTimeline(race, n) {
+  const count = race.frames.length;
+  const pos = new Float64Array(count * n);
+  for (let f = 0; f < count; f++) {
+    const row = race.frames[f];
+    for (let k = 0; k < n; k++) {
+      pos[f * n + k] = (f ? pos[(f - 1) * n + k] : 0) + row[k] / race.scale;
+    }
+  }
+  return { tick: race.tick, end: race.end, n, count, pos,
+           finish: race.finish, finishTimes: race.finishTimes };
+}
+
+function positionsAt(t) {
+  const { tick, end, n, count, pos } = TIMELINE;
+  if (count < 2) return;
+  const last = count - 1;
+  let i = Math.floor(t / tick), u;
+  if (i >= last - 1) {
+    i = last - 1;
+    const t0 = i * tick;
+    u = end > t0 ? (t - t0) / (end - t0) : 1;
+  } else {
+    u = t / tick - i;
+  }
+  u = Math.min(1, Math.max(0, u));
+  const a = i * n, b = a + n;
+  for (let k = 0; k < n; k++) {
+    racerState[k].arcPos = pos[a + k] + u * (pos[b + k] - pos[a + k]);
+  }
+}
+
+// ── Update logic ──────────────────────────────────────────────────────────
+function updateRacers(dt) {
+  if (raceOver || !TIMELINE.count) return;
+  raceClock = Math.min(raceClock + dt, TIMELINE.end);
+  positionsAt(raceClock);
+  racerState.forEach(r => { r.laps = Math.max(0, Math.floor(r.arcPos)); });
+  while (finishCount < TIMELINE.finish.length && TIMELINE.finishTimes[finishCount] <= raceClock) {
+    const r = racerState[TIMELINE.finish[finishCount]];
+    finishCount++;
+    r.finished    = true;
+    r.celebrating = true;
+    r.celebEnd    = performance.now() + 3500;
+    r.finishOrder = finishCount;
+    finishers.push(r);
+  }
+  if (raceClock >= TIMELINE.end) {
+    raceOver = true;
+    overlayTimer = setTimeout(showOverlay, 2000);
+  }
+}
+
+// ── Static layer (background, track, start/finish) ────────────────────────
+// Nothing here changes between frames, so it is rendered once into an
+// offscreen canvas (staticLayer) and blitted each frame; resizeCanvas()
+// invalidates it.
+function buildStaticLayer() {
+  const layer = document.createElement('canvas');
+  layer.width  = canvas.width;
+  layer.height = canvas.height;
+  const lctx = layer.getContext('2d');
+  lctx.scale(pixelRatio, pixelRatio);
+  drawBackground(lctx);
+  drawTrack(lctx);
+  drawStartFinish(lctx);
+  return layer;
+}
+
+// ── Draw helpers ──────────────────────────────────────────────────────────
+function drawBackground(g) {
+  // Sky
+  const grad = g.createLinearGradient(0, 0, 0, viewH);
+  grad.addColorStop(0, '#1a0a2e');
+  grad.addColorStop(1, '#2d0a5e');
+  g.fillStyle = grad;
+  g.fillRect(0, 0, viewW, viewH);
+
+  // Checkerboard border (8-bit style) — two rings of 8px squares, visiting
+  // only the edge cells rather than the whole canvas grid
+  const sq = 8;
+  const cols = Math.ceil(viewW / sq), rows = Math.ceil(viewH / sq);
+  const cell = (i, j) => {
+    g.fillStyle = ((i + j) % 2 === 0) ? '#fff' : '#111';
+    g.fillRect(i * sq, j * sq, sq, sq);
+  };
+  const edgeX = (i) => i < 2 || i * sq >= viewW - sq * 2;
+  const edgeY = (j) => j < 2 || j * sq >= viewH - sq * 2;
+  const edgeRows = [];
+  for (let j = 0; j < rows; j++) if (edgeY(j)) edgeRows.push(j);
+  for (let i = 0; i < cols; i++) {
+    if (edgeX(i)) for (let j = 0; j < rows; j++) cell(i, j);
+    else edgeRows.forEach(j => cell(i, j));
+  }
+}
+
+function drawTrack(g) {
+  // Grass fill inside oval using pattern
+  const pat = g.createPattern(grassTile, 'repeat');
+  g.save();
+  g.beginPath();
+  g.ellipse(cx, cy, rx - roadWidth / 2, ry - roadWidth / 2, 0, 0, 2 * Math.PI);
+  g.fillStyle = pat;
+  g.fill();
+  g.restore();
+
+  // Road ring (thick ellipse stroke)
+  g.beginPath();
+  g.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#2e2e2e';
+  g.lineWidth   = roadWidth;
+  g.stroke();
+
+  // Road edge (outer white line)
+  g.beginPath();
+  g.ellipse(cx, cy, rx + roadWidth / 2 - 2, ry + roadWidth / 2 - 2, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffffff';
+  g.lineWidth   = 3;
+  g.stroke();
+
+  // Road edge (inner white line)
+  g.beginPath();
+  g.ellipse(cx, cy, rx - roadWidth / 2 + 2, ry - roadWidth / 2 + 2, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffffff';
+  g.lineWidth   = 3;
+  g.stroke();
+
+  // Center dashed line
+  g.beginPath();
+  g.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffff00';
+  g.lineWidth   = 2;
+  g.setLineDash([14, 18]);
+  g.stroke();
+  g.setLineDash([]);
+}
+
+function drawStartFinish(g) {
+  // Start/finish stripe at theta = 0 (right side)
+  const theta = 0;
+  const pos   = thetaToXY(theta);
+  const hdg   = thetaToHeading(theta);
+  const perp  = hdg + Math.PI / 2;
+  const len   = roadWidth * 0.55;
+  const sq    = 5;
+  const steps = Math.ceil(len / sq);
+  for (let i = -steps; i <= steps; i++) {
+    const ox = pos.x + Math.cos(perp) * i * sq;
+    const oy = pos.y + Math.sin(perp) * i * sq;
+    for (let j = -2; j <= 2; j++) {
+      g.fillStyle = ((i + j) % 2 === 0) ? '#fff' : '#111';
+      g.fillRect(
+        ox + Math.cos(hdg) * j * sq,
+        oy + Math.sin(hdg) * j * sq,
+        sq, sq
+      );
+    }
+  }
+
+  // "S/F" label
+  g.save();
+  g.font      = `bold ${Math.max(7, kartH * 0.8)}px 'Press Start 2P', monospace`;
+  g.fillStyle = '#f9a11b';
+  g.strokeStyle = '#000';
+  g.lineWidth   = 3;
+  g.textAlign   = 'center';
+  g.textBaseline = 'middle';
+  const labelPos = thetaToXY(theta);
+  g.strokeText('S/F', labelPos.x, labelPos.y - ry * 0.18);
+  g.fillText('S/F', labelPos.x, labelPos.y - ry * 0.18);
+  g.restore();
+}
+
+// Position and heading of every kart, computed once per frame
+function layoutKart(r) {
+  const theta = arcFracToTheta(r.arcPos);
+  r.x       = cx + rx * Math.cos(theta);
+  r.y       = cy + ry * Math.sin(theta);
+  r.heading = thetaToHeading(theta);
+  r.cos     = Math.cos(r.heading);
+  r.sin     = Math.sin(r.heading);
+}
+
+function drawKart(r, ts) {
+  const W = kartW, H = kartH;
+
+  ctx.save();
+  ctx.translate(r.x, r.y);
+  ctx.rotate(r.heading);
+
+  // Shadow
+  if (quality().shadows) {
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.beginPath();
+    ctx.ellipse(2, 3, W * 0.55, H * 0.35, 0, 0, 2 * Math.PI);
+    ctx.fill();
+  }
+
+  // Body
+  ctx.fillStyle = r.color;
+  ctx.beginPath();
+  if (ctx.roundRect) {
+    ctx.roundRect(-W/2, -H/2, W, H, 3);
+  } else {
+    ctx.rect(-W/2, -H/2, W, H);
+  }
+  ctx.fill();
+
+  // Windshield
+  ctx.fillStyle = 'rgba(180,230,255,0.85)';
+  ctx.fillRect(-W * 0.15, -H * 0.38, W * 0.3, H * 0.55);
+
+  // Wheels
+  ctx.fillStyle = '#111';
+  const wx = W * 0.36, wy = H * 0.42;
+  [[-wx,-wy],[wx,-wy],[-wx,wy],[wx,wy]].forEach(([bx, by]) => {
+    ctx.beginPath();
+    ctx.ellipse(bx, by, W * 0.12, H * 0.18, 0, 0, 2 * Math.PI);
+    ctx.fill();
+  });
+
+  // Celebration sparkle aura
+  if (quality().aura && r.celebrating && performance.now() < r.celebEnd) {
+    ctx.globalAlpha = 0.5 + 0.3 * Math.sin(ts * 0.015);
+    ctx.strokeStyle = '#f9a11b';
+    ctx.lineWidth   = 2;
+    ctx.beginPath();
+    ctx.ellipse(0, 0, W * 0.75, H * 0.75, ts * 0.003, 0, 2 * Math.PI);
+    ctx.stroke();
+    ctx.globalAlpha = 1;
+  }
+
+  ctx.restore();
+}
+
+// ── Batched karts (large fields) ──────────────────────────────────────────
+// One path per layer (shadows, bodies per colour, windshields, wheels)
+// instead of a save/rotate/restore and five fills per kart.
+function kartPoint(r, px, py) {
+  return [r.x + px * r.cos - py * r.sin, r.y + px * r.sin + py * r.cos];
+}
+
+function pathRotatedRect(r, x, y, w, h) {
+  const p = [kartPoint(r, x, y), kartPoint(r, x + w, y), kartPoint(r, x + w, y + h), kartPoint(r, x, y + h)];
+  ctx.moveTo(p[0][0], p[0][1]);
+  for (let i = 1; i < 4; i++) ctx.lineTo(p[i][0], p[i][1]);
+  ctx.closePath();
+}
+
+function pathRotatedEllipse(r, ex, ey, erx, ery) {
+  const [x, y] = kartPoint(r, ex, ey);
+  ctx.moveTo(x + erx * r.cos, y + erx * r.sin);
+  ctx.ellipse(x, y, erx, ery, r.heading, 0, 2 * Math.PI);
+}
+
+function drawKartsBatched(ts) {
+  const W = kartW, H = kartH;
+  const q = quality();
+
+  if (q.shadows) {
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.beginPath();
+    drawOrder.forEach(r => pathRotatedEllipse(r, 2, 3, W * 0.55, H * 0.35));
+    ctx.fill();
+  }
+
+  const byColor = new Map();
+  drawOrder.forEach(r => {
+    if (!byColor.has(r.color)) byColor.set(r.color, []);
+    byColor.get(r.color).push(r);
+  });
+  byColor.forEach((list, color) => {
+    ctx.fillStyle = color;
+    ctx.beginPath();
+    list.forEach(r => pathRotatedRect(r, -W/2, -H/2, W, H));
+    ctx.fill();
+  });
+
+  ctx.fillStyle = 'rgba(180,230,255,0.85)';
+  ctx.beginPath();
+  drawOrder.forEach(r => pathRotatedRect(r, -W * 0.15, -H * 0.38, W * 0.3, H * 0.55));
+  ctx.fill();
+
+  ctx.fillStyle = '#111';
+  ctx.beginPath();
+  const wx = W * 0.36, wy = H * 0.42;
+  drawOrder.forEach(r => {
+    pathRotatedEllipse(r, -wx, -wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r,  wx, -wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r, -wx,  wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r,  wx,  wy, W * 0.12, H * 0.18);
+  });
+  ctx.fill();
+
+  if (!q.aura) return;
+  const now = performance.now();
+  drawOrder.forEach(r => {
+    if (!r.celebrating || now >= r.celebEnd) return;
+    ctx.globalAlpha = 0.5 + 0.3 * Math.sin(ts * 0.015);
+    ctx.strokeStyle = '#f9a11b';
+    ctx.lineWidth   = 2;
+    ctx.beginPath();
+    ctx.ellipse(r.x, r.y, W * 0.75, H * 0.75, r.heading + ts * 0.003, 0, 2 * Math.PI);
+    ctx.stroke();
+    ctx.globalAlpha = 1;
+  });
+}
+
+// ── Name labels ───────────────────────────────────────────────────────────
+function labelFontSize() {
+  return Math.max(6, Math.min(10, kartW * 0.55));
+}
+
+function labelSprite(label, fontSize) {
+  let sprite = labelSprites.get(label);
+  if (sprite) return sprite;
+  const font = `bold ${fontSize}px 'Press Start 2P', monospace`;
+  measureCtx.font = font;
+  const tw = measureCtx.measureText(label).width;
+  // Pill plus a 1px margin; the text baseline sits 3px above the pill bottom
+  sprite = makeSprite(tw + 8, fontSize + 6, g => {
+    g.fillStyle = 'rgba(0,0,0,0.65)';
+    g.beginPath();
+    if (g.roundRect) {
+      g.roundRect(1, 1, tw + 6, fontSize + 4, 3);
+    } else {
+      g.rect(1, 1, tw + 6, fontSize + 4);
+    }
+    g.fill();
+
+    g.font         = font;
+    g.textAlign    = 'center';
+    g.textBaseline = 'bottom';
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2.5;
+    g.strokeText(label, tw / 2 + 4, fontSize + 2);
+    g.fillStyle    = '#fff';
+    g.fillText(label,   tw / 2 + 4, fontSize + 2);
+  });
+  labelSprites.set(label, sprite);
+  return sprite;
+}
+
+function drawKartLabel(r, sprite, fontSize) {
+  // Name label (always upright, above kart)
+  const labelY = r.y - kartH * 0.9 - 4;
+  ctx.drawImage(sprite, r.x - sprite.w / 2, labelY - fontSize - 2, sprite.w, sprite.h);
+}
+
+// Level of detail: leaders first, skip any label whose pill would overlap
+// one already placed (uniform grid of LABEL_CELL px buckets).
+function drawLabelsCulled() {
+  const fontSize = labelFontSize();
+  const grid = new Map();
+  const h = fontSize + 4;
+  for (let i = drawOrder.length - 1; i >= 0; i--) {
+    const r = drawOrder[i];
+    const sprite = labelSprite(r.label, fontSize);
+    const x0 = r.x - sprite.w / 2 + 1, x1 = x0 + sprite.w - 2;
+    const y0 = r.y - kartH * 0.9 - 4 - fontSize - 1, y1 = y0 + h;
+    const gx0 = Math.floor(x0 / LABEL_CELL), gx1 = Math.floor(x1 / LABEL_CELL);
+    const gy0 = Math.floor(y0 / LABEL_CELL), gy1 = Math.floor(y1 / LABEL_CELL);
+    let hit = false;
+    for (let gx = gx0; gx <= gx1 && !hit; gx++) {
+      for (let gy = gy0; gy <= gy1 && !hit; gy++) {
+        const bucket = grid.get(gx * 65536 + gy);
+        if (bucket) hit = bucket.some(b => x0 < b[2] && x1 > b[0] && y0 < b[3] && y1 > b[1]);
+      }
+    }
+    if (hit) continue;
+    const box = [x0, y0, x1, y1];
+    for (let gx = gx0; gx <= gx1; gx++) {
+      for (let gy = gy0; gy <= gy1; gy++) {
+        const key = gx * 65536 + gy;
+        if (!grid.has(key)) grid.set(key, []);
+        grid.get(key).push(box);
+      }
+    }
+    drawKartLabel(r, sprite, fontSize);
+  }
+}
+
+function drawKarts(ts) {
+  sortDrawOrder();
+  drawOrder.forEach(layoutKart);
+  if (drawOrder.length > LOD_THRESHOLD) {
+    drawKartsBatched(ts);
+    drawLabelsCulled();
+    return;
+  }
+  // Small field: full detail, every label, leader on top
+  const fontSize = labelFontSize();
+  drawOrder.forEach(r => {
+    drawKart(r, ts);
+    drawKartLabel(r, labelSprite(r.label, fontSize), fontSize);
+  });
+}
+
+// Karts drawn in arcPos order (leader on top). Positions change a little per
+// frame, so an insertion sort over last frame's order is ~O(n).
+function sortDrawOrder() {
+  for (let i = 1; i < drawOrder.length; i++) {
+    const r = drawOrder[i];
+    let j = i - 1;
+    while (j >= 0 && drawOrder[j].arcPos > r.arcPos) {
+      drawOrder[j + 1] = drawOrder[j];
+      j--;
+    }
+    drawOrder[j + 1] = r;
+  }
+}
+
+function drawCelebration(r, ts) {
+  if (!r.celebrating || performance.now() >= r.celebEnd) {
+    r.celebrating = false;
+    return;
+  }
+  const pos   = { x: r.x, y: r.y };
+  const rays  = 8;
+  const len   = 20 + 8 * Math.sin(ts * 0.01);
+
+  ctx.save();
+  ctx.translate(pos.x, pos.y);
+  ctx.rotate(ts * 0.003);
+  for (let i = 0; i < rays; i++) {
+    const a = (i / rays) * 2 * Math.PI;
+    ctx.beginPath();
+    ctx.moveTo(0, 0);
+    ctx.lineTo(Math.cos(a) * len, Math.sin(a) * len);
+    ctx.strokeStyle = i % 2 === 0 ? '#f9a11b' : '#fff';
+    ctx.lineWidth   = 2;
+    ctx.stroke();
+  }
+  ctx.restore();
+
+  // "WINNER!" badge for the first finisher
+  if (r.finishOrder === 1) {
+    const alpha = 0.7 + 0.3 * Math.sin(ts * 0.01);
+    ctx.save();
+    ctx.globalAlpha = alpha;
+    ctx.font = `bold ${Math.max(10, kartW * 0.9)}px 'Press Start 2P', monospace`;
+    ctx.textAlign   = 'center';
+    ctx.textBaseline = 'middle';
+    ctx.strokeStyle = '#000';
+    ctx.lineWidth   = 4;
+    ctx.strokeText('WINNER!', pos.x, pos.y - kartH * 2.5);
+    ctx.fillStyle   = '#f9a11b';
+    ctx.fillText('WINNER!', pos.x, pos.y - kartH * 2.5);
+    ctx.restore();
+  }
+}
+
+function lapBadgeSprite(lap) {
+  if (lapBadge && lapBadge.lap === lap) return lapBadge;
+  const font = `bold ${Math.max(8, kartW * 0.7)}px 'Press Start 2P', monospace`;
+  const lapTxt = `LAP ${lap} / ${TARGET_LAPS}`;
+  const boxH = Math.max(14, kartW * 0.8) + 6;
+  measureCtx.font = font;
+  const w = Math.max(140, measureCtx.measureText(lapTxt).width + 4);
+  lapBadge = makeSprite(w, boxH, g => {
+    g.font = font;
+    g.textAlign    = 'center';
+    g.textBaseline = 'top';
+    g.fillStyle    = 'rgba(0,0,0,0.55)';
+    g.fillRect(w / 2 - 70, 0, 140, boxH);
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2;
+    g.strokeText(lapTxt, w / 2, 4);
+    g.fillStyle    = '#f9a11b';
+    g.fillText(lapTxt, w / 2, 4);
+  });
+  lapBadge.lap = lap;
+  return lapBadge;
+}
+
+// Finisher rows are measured once each; the panel bitmap is repainted only
+// when another row becomes visible, so a long race stops repainting once
+// the panel reaches the bottom of the canvas.
+function finisherPanelSprite(fontSize, lineH, padY) {
+  const medals = ['🥇','🥈','🥉'];
+  const font   = `bold ${fontSize}px 'Press Start 2P', monospace`;
+  const rows   = Math.min(finishers.length, Math.max(1, Math.floor((viewH - padY * 3) / lineH)));
+  if (finisherPanel && finisherPanel.rows === rows) return finisherPanel;
+  measureCtx.font = font;
+  for (let i = finisherRows.length; i < rows; i++) {
+    const r = finishers[i];
+    const prefix = r.finishOrder <= 3 ? medals[r.finishOrder-1] + ' ' : `${r.finishOrder}. `;
+    const text = prefix + r.label;
+    const w = measureCtx.measureText(text).width;
+    finisherRows.push({ text, color: r.color, w });
+    finisherRowsW = Math.max(finisherRowsW, w);
+  }
+  const panelW = finisherRowsW + 10 * 2 + 4;
+  const panelH = rows * lineH + padY * 2;
+  finisherPanel = makeSprite(panelW + 2, panelH + 2, g => {
+    g.fillStyle = 'rgba(0,0,0,0.62)';
+    g.beginPath();
+    if (g.roundRect) g.roundRect(1, 1, panelW, panelH, 4);
+    else g.rect(1, 1, panelW, panelH);
+    g.fill();
+    g.font = font;
+    g.textAlign    = 'left';
+    g.textBaseline = 'top';
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2.5;
+    for (let i = 0; i < rows; i++) {
+      const row = finisherRows[i];
+      const y   = 1 + padY * 0.5 + i * lineH;
+      g.strokeText(row.text, 7, y);
+      g.fillStyle = row.color;
+      g.fillText(row.text, 7, y);
+    }
+  });
+  finisherPanel.rows = rows;
+  return finisherPanel;
+}
+
+function drawHUD() {
+  // Lap counter - top center
+  const lap = Math.min(TARGET_LAPS, Math.max(1, Math.floor(racerState[0]?.arcPos ?? 0) + 1));
+  const badge = lapBadgeSprite(lap);
+  ctx.drawImage(badge, viewW / 2 - badge.w / 2, 6, badge.w, badge.h);
+
+  // Finishers list (top-left) — grows as players cross the line
+  if (finishers.length > 0) {
+    const fontSize = Math.max(6, kartW * 0.52);
+    const padX = 10, padY = 6;
+    const panel = finisherPanelSprite(fontSize, fontSize + 5, padY);
+    ctx.drawImage(panel, padX - 1, padY - 1, panel.w, panel.h);
+  }
+}
+
+function draw(ts) {
+  if (!staticLayer) staticLayer = buildStaticLayer();
+  ctx.clearRect(0, 0, viewW, viewH);
+  ctx.drawImage(staticLayer, 0, 0, viewW, viewH);
+  drawHUD();
+
+  drawKarts(ts);
+
+  // Celebrations on top
+  finishers.forEach(r => {
+    if (r.celebrating) drawCelebration(r, ts);
+  });
+}
+
+// ── Scoreboard ────────────────────────────────────────────────────────────
+
+// ── Overlay ────────────────────────────────────────────────────────────────
+function showOverlay() {
+  const sorted = [...racerState].sort((a, b) => (a.finishOrder ?? 999) - (b.finishOrder ?? 999));
+  const top3   = sorted.slice(0, 3);
+  const medals = ['🥇','🥈','🥉'];
+  const classes = ['p1','p2','p3'];
+  document.getElementById('podium').innerHTML = top3.map((r, i) =>
+    `<div class="podium-slot ${classes[i]}" style="border-color:${r.color}">
+       <span class="podium-pos">${medals[i]}</span>
+       <span>${r.name}</span>
+       <span style="color:#aaa;font-size:0.85em">PLW ${r.plw}</span>
+     </div>`
+  ).join('');
+  document.getElementById('overlay').classList.add('show');
+}
+
+// ── Game loop ─────────────────────────────────────────────────────────────
+// Frames are only scheduled while something moves: the race itself and the
+// finish celebrations. Once settled the last frame stays on the canvas and
+// nothing runs until a restart, week switch, resize or the page coming back
+// into view calls requestFrame(). Hidden tabs get no frames at all; while
+// the canvas is scrolled off-screen the race keeps time on a slow timer
+// without drawing.
+const OFFSCREEN_FPS = 4;
+let lastTs = null;
+let rafId = 0;
+let throttleTimer = 0;
+let offscreen = false;
+
+function isAnimating() {
+  if (!TIMELINE || !TIMELINE.count) return false;
+  if (!raceOver) return true;
+  const now = performance.now();
+  return finishers.some(r => r.celebrating && now < r.celebEnd);
+}
+
+function requestFrame() {
+  if (rafId || throttleTimer || document.hidden || videoEl) return;
+  if (offscreen) {
+    throttleTimer = setTimeout(() => {
+      throttleTimer = 0;
+      tick(performance.now());
+    }, 1000 / OFFSCREEN_FPS);
+  } else {
+    rafId = requestAnimationFrame(tick);
+  }
+}
+
+function cancelFrame() {
+  cancelAnimationFrame(rafId);
+  clearTimeout(throttleTimer);
+  rafId = throttleTimer = 0;
+  lastTs = null;  // don't count the pause as race time
+}
+
+function tick(ts) {
+  rafId = 0;
+  if (!lastTs) lastTs = ts;
+  const maxDt = offscreen ? 1 / OFFSCREEN_FPS : 0.05;
+  const dt = Math.min((ts - lastTs) / 1000, maxDt);
+  lastTs = ts;
+
+  updateRacers(dt);
+  if (!offscreen) {
+    const start = performance.now();
+    draw(ts);
+    trackDrawTime(performance.now() - start);
+  }
+
+  if (isAnimating()) requestFrame();
+  else lastTs = null;
+}
+
+document.addEventListener('visibilitychange', () => {
+  if (document.hidden) cancelFrame();
+  else requestFrame();
+});
+
+if ('IntersectionObserver' in window) {
+  new IntersectionObserver(entries => {
+    const wasOffscreen = offscreen;
+    offscreen = !entries[entries.length - 1].isIntersecting;
+    if (offscreen === wasOffscreen) return;
+    // Switch between rAF and the slow timer; coming back always redraws
+    const pending = rafId || throttleTimer;
+    cancelFrame();
+    if (pending || !offscreen) requestFrame();
+  }).observe(canvas);
+}
+
+// ── Participants list ─────────────────────────────────────────────────────
+function renderParticipants() {
+  const list = document.getElementById('participants');
+  list.replaceChildren(...RACERS.map((r, i) => {
+    const row = document.createElement('div');
+    row.className = 'p-row';
+    row.style.setProperty('--kc', r.color);
+    [['p-rank', `#${r.rank}`], ['p-name', r.name], ['p-plw', `PLW ${r.plw}`]].forEach(([cls, text]) => {
+      const span = document.createElement('span');
+      span.className = cls;
+      span.textContent = text;
+      row.appendChild(span);
+    });
+    return row;
+  }));
+}
+
+// ── Video fallback ────────────────────────────────────────────────────────
+// race.json may carry a pre-rendered video of the same race (--export-video).
+// Low-power clients play it instead of the canvas: few cores or little
+// memory up front, or frame time still over budget at the cheapest quality
+// level. ?video forces the video and ?live the canvas. Week files have no
+// video and always race live.
+const VIDEO_PARAMS = new URLSearchParams(location.search);
+let lowPower = (navigator.hardwareConcurrency || 8) <= 2 || (navigator.deviceMemory || 8) <= 1;
+let currentRace = null;
+let videoEl = null;
+
+function wantsVideo(data) {
+  if (!data.video || VIDEO_PARAMS.has('live')) return false;
+  return lowPower || VIDEO_PARAMS.has('video');
+}
+
+function showVideo(video) {
+  cancelFrame();
+  hideVideo();
+  const url = name => new URL(name, DATA_URL).href;
+  if (video.mp4) {
+    videoEl = document.createElement('video');
+    Object.assign(videoEl, { muted: true, defaultMuted: true, autoplay: true, loop: true, playsInline: true,
+                             poster: url(video.poster), src: url(video.mp4) });
+  } else {
+    videoEl = document.createElement('img');
+    videoEl.src = url(video.webp);
+    videoEl.alt = 'Weekly Sprint race';
+  }
+  videoEl.className = 'race-video';
+  videoEl.width  = video.width;
+  videoEl.height = video.height;
+  canvas.hidden = true;
+  canvas.after(videoEl);
+}
+
+function hideVideo() {
+  if (!videoEl) return;
+  videoEl.remove();
+  videoEl = null;
+  canvas.hidden = false;
+}
+
+function restartRace() {
+  initRacerState();
+  lastTs = null;
+  if (videoEl && videoEl.play) {
+    videoEl.currentTime = 0;
+    videoEl.play();
+  }
+  requestFrame();
+}
+
+// ── Race loading ──────────────────────────────────────────────────────────
+function loadRace(data) {
+  currentRace = data;
+  if (wantsVideo(data)) showVideo(data.video);
+  else hideVideo();
+  RACERS   = data.racers;
+  TIMELINE = decodeTimeline(data.race, RACERS.length);
+  document.getElementById('generated-date').textContent = data.generated;
+  renderParticipants();
+  initRacerState();
+  lastTs = null;
+  requestFrame();
+}
+
+// ── Season mode: week selector, week files fetched on demand ──────────────
+const weekCache = new Map();
+
+function fetchJSON(url, opts) {
+  return fetch(url, opts).then(res => {
+    if (!res.ok) throw new Error(`${res.status} ${url}`);
+    return res.json();
+  });
+}
+
+function setupSeason(current, indexPath) {
+  const select  = document.getElementById('week-select');
+  const indexUrl = new URL(indexPath, DATA_URL);
+  fetchJSON(indexUrl, { cache: 'no-cache' }).then(weeks => {
+    const opts = [['', 'This week']].concat(weeks.map(d => [d, `Week of ${d}`]));
+    select.replaceChildren(...opts.map(([value, text]) => {
+      const o = document.createElement('option');
+      o.value = value;
+      o.textContent = text;
+      return o;
+    }));
+    select.hidden = false;
+  });
+  select.addEventListener('change', () => {
+    const date = select.value;
+    if (!date) { loadRace(current); return; }
+    if (!weekCache.has(date)) {
+      weekCache.set(date, fetchJSON(new URL(`${date}.json`, indexUrl)));
+    }
+    weekCache.get(date).then(data => {
+      if (select.value === date) loadRace(data);
+    }).catch(() => weekCache.delete(date));
+  });
+}
+
+// ── Startup ───────────────────────────────────────────────────────────────
+// Canvas text doesn't trigger a font load, and labels measured in the
+// fallback font would jump, so the first frame waits for the race font
+// (capped, in case it never arrives)
+const FONT_WAIT_MS = 3000;
+function raceFontReady() {
+  if (!document.fonts) return Promise.resolve();
+  return Promise.race([
+    document.fonts.load("bold 12px 'Press Start 2P'").catch(() => {}),
+    new Promise(resolve => setTimeout(resolve, FONT_WAIT_MS)),
+  ]);
+}
+
+// A font arriving after the wait would otherwise never reach the bitmaps
+// already rendered with the fallback
+if (document.fonts) {
+  document.fonts.addEventListener('loadingdone', () => {
+    staticLayer = null;
+    clearSprites();
+    requestFrame();
+  });
+}
+
+Promise.all([fetchJSON(DATA_URL, { cache: 'no-cache' }), raceFontReady()])
+  .then(([data]) => {
+    loadRace(data);
+    if (data.season) setupSeason(data, data.season);
+  });
+
+// ── Controls ───────────────────────────────────────────────────────────────
+document.getElementById('btn-restart').addEventListener('click', restartRace);
+document.getElementById('btn-overlay-restart').addEventListener('click', restartRace);
@@ -1,11 +1,21 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
+import argparse
 import json
-import time
 import random
 import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import textwrap
+from collections import namedtuple
+
+# Selenium is only needed when fetching the live page (not for --html)
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+except ImportError:
+    webdriver = None
 
 # Try to use webdriver-manager if available (for CI), otherwise use system Chrome
 try:
@@ -16,6 +26,35 @@ except ImportError:
 
 # Load Pokemon data from generated JSON file (all 1025 Pokemon)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "scripts"))
+
+from hashed_output import write_hashed_entry
+from lean_browser import enable_selenium_blocking, selenium_options, wait_for_plw_table_selenium
+from player_groups import GroupIndex, write_groups
+from profiling import add_profile_arguments, phase, profiled
+from roster_events import (EVENTS_PATH, BoardDiff, append_events, diff_players, event_line, iter_players,
+                           load_players)
+from roster_harvest import harvest, selenium_evaluate, tee_html
+from roster_tables import iter_rows, mark_headers
+from search_index import SearchIndex
+
+# numpy is optional — without it the dashboard lays the PowerMap out itself
+try:
+    from power_map import PowerMap
+except ImportError:
+    PowerMap = None
+
+ROSTER_URL = "https://icnadmin2.com/icnroster/ck_data_PS11.html"
+MAIN_URL = "https://impactcoachingnetwork.org/ps11chessclubandteamstats"
+# Tried in order; the first with a PLW table is harvested
+ROSTER_SOURCES = [ROSTER_URL, MAIN_URL]
+PLAYERS_JSON_PATH = os.path.join("public", "players.json")
+PLAYERS_NDJSON_PATH = os.path.join("public", "players.ndjson")
+FLUSH_EVERY = 1000  # --stream: players between flushes of players.ndjson
+
+# Cell text with the .text of the Selenium <td> WebElements build_players was written for
+Cell = namedtuple("Cell", "text")
+
 POKEMON_DATA_PATH = os.path.join(SCRIPT_DIR, "pokemon-data.json")
 PLAYER_ASSIGNMENTS_PATH = os.path.join(SCRIPT_DIR, "player-pokemon.json")
 
@@ -74,99 +113,371 @@ def detect_new_week(all_players_plw):
             return True
     return False
 
-def scrape_ps11_stats():
-    global PLAYER_ASSIGNMENTS
-
-    # Load existing player assignments
-    load_player_assignments()
-
-    options = Options()
-    options.add_argument('--headless=new')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-    print("Launching headless browser...")
-    if USE_WEBDRIVER_MANAGER:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-    else:
-        driver = webdriver.Chrome(options=options)
+def data_rows(rows):
+    """(table, cells, is_header) rows → the Cells of every non-header row."""
+    for table, cells, is_header in rows:
+        if not is_header:
+            yield [Cell(text) for text in cells]
 
-    try:
-        # Fetch the iframe source directly
-        url = "https://icnadmin2.com/icnroster/ck_data_PS11.html"
-        print(f"Fetching {url}...")
-        driver.get(url)
 
-        # Wait for content to load
-        print("Waiting for content to load...")
-        time.sleep(5)
+def html_table_rows(html):
+    """Roster rows parsed from saved roster HTML (a string or an open file)."""
+    return data_rows(mark_headers(iter_rows(html, cell_tags=("td",))))
 
-        # Find tables
-        tables = driver.find_elements(By.TAG_NAME, 'table')
-        print(f"Found {len(tables)} tables")
 
-        # FIRST PASS: Collect ALL players with their PLW values (including PLW = 0)
-        all_players_plw = {}
-        raw_player_rows = []  # Store (cols, name) for second pass
+def roster_file_rows(path):
+    """Roster rows of a saved roster HTML file, read a chunk at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from html_table_rows(f)
 
-        for table in tables:
-            rows = table.find_elements(By.TAG_NAME, 'tr')
-            print(f"Table has {len(rows)} rows")
 
-            for row in rows[1:]:  # Skip header
-                cols = row.find_elements(By.TAG_NAME, 'td')
-                if len(cols) >= 6:
-                    name = cols[0].text.strip()
-                    if not name or name.lower() == 'name':
-                        continue
+def save_rows(rows, path):
+    """Pass (table, cells, is_header) rows through while saving them to path as HTML.
 
-                    # Extract PLW for weekly reset detection
-                    try:
-                        plw_text = cols[5].text if len(cols) > 5 else "0"
-                        plw = int(''.join(c for c in plw_text if c.isdigit()) or '0')
-                    except:
-                        plw = 0
+    Spooled as rows arrive; the old copy is replaced only once complete.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        yield from tee_html(rows, f)
+    os.replace(path + ".tmp", path)
+    print(f"Saved roster tables to {path}")
+
+
+def roster_row(cols):
+    """(name, plw) of a player row, or None for header/spacer rows."""
+    if len(cols) < 6:
+        return None
+    name = cols[0].text.strip()
+    if not name or name.lower() == 'name':
+        return None
+    # Extract PLW for weekly reset detection
+    try:
+        plw = int(''.join(c for c in cols[5].text if c.isdigit()) or '0')
+    except:
+        plw = 0
+    return name, plw
 
-                    player_key = name.lower().strip()
-                    all_players_plw[player_key] = plw
-                    raw_player_rows.append((cols, name))
 
-        print(f"First pass: found {len(all_players_plw)} total players")
+def build_players(table_rows):
+    """Two-pass build of players.json from roster rows. Returns the player list."""
+    global PLAYER_ASSIGNMENTS
 
-        # Check for weekly reset
-        if detect_new_week(all_players_plw):
-            print("Weekly reset detected! Clearing all player assignments.")
-            PLAYER_ASSIGNMENTS = {}
+    # FIRST PASS: Collect ALL players with their PLW values (including PLW = 0)
+    all_players_plw = {}
+    raw_player_rows = []  # Store (cols, name) for second pass
+
+    with phase("first pass"):
+        for cols in table_rows:
+            row = roster_row(cols)
+            if row:
+                name, plw = row
+                player_key = name.lower().strip()
+                all_players_plw[player_key] = plw
+                raw_player_rows.append((cols, name))
+
+    print(f"First pass: found {len(all_players_plw)} total players")
+
+    # Check for weekly reset
+    week_reset = detect_new_week(all_players_plw)
+    if week_reset:
+        print("Weekly reset detected! Clearing all player assignments.")
+        PLAYER_ASSIGNMENTS = {}
 
-        # SECOND PASS: Build player data (filter to PLW >= 20, assign Pokemon)
-        player_data = []
+    # SECOND PASS: Build player data (filter to PLW >= 20, assign Pokemon)
+    player_data = []
+    groups = GroupIndex()
+    search = SearchIndex()
+    power_map = PowerMap() if PowerMap else None
 
+    with phase("second pass"):
         for cols, name in raw_player_rows:
             player = extract_player_data(cols, name)
-            if player and player["plw"] >= 20:
+            if not player:
+                continue
+            on_board = player["plw"] >= 20
+            groups.add(player, on_board)
+            if on_board:
+                search.add(player)
+                if power_map:
+                    power_map.add(player)
                 player_data.append(player)
                 print(f"  Found player: {name} (PLW: {player['plw']})")
 
+    with phase("write"):
         # Save updated assignments
         save_player_assignments()
 
+        # Change events against the board as it was (unchanged if nobody qualifies)
+        if player_data:
+            events = diff_players(load_players(PLAYERS_JSON_PATH), player_data, week_reset)
+        else:
+            events = diff_players([], [], week_reset)
+        append_events(events, EVENTS_PATH)
+        if events:
+            print(f"Logged {len(events)} change events to {EVENTS_PATH}")
+
         if player_data:
-            with open('public/players.json', 'w') as f:
-                json.dump(player_data, f, indent=4)
-            print(f"\nSuccess! {len(player_data)} players scraped to public/players.json")
+            text = json.dumps(player_data, indent=4)
+            with open(PLAYERS_JSON_PATH, 'w') as f:
+                f.write(text)
+            # Cache-forever copy for the dashboard, found through manifest.json
+            hashed = write_hashed_entry(pathlib.Path(PLAYERS_JSON_PATH).parent, "players", "",
+                                        "players", "json", text)
+            print(f"\nSuccess! {len(player_data)} players scraped to {PLAYERS_JSON_PATH} ({hashed})")
+            written = write_groups(pathlib.Path(PLAYERS_JSON_PATH).parent, groups)
+            print(f"Group boards: {len(groups.groups)} groups, {written} file(s) updated")
+            write_search_index(search)
+            write_power_map(power_map)
+    groups.close()
+    return player_data
+
+
+def player_records(table_rows):
+    """Roster rows → (player, on_board) records, a row at a time."""
+    for cols in table_rows:
+        row = roster_row(cols)
+        if row:
+            player = extract_player_data(cols, row[0])
+            if player:
+                yield player, player["plw"] >= 20
+
+
+def stream_players(first_rows, replay_rows, to_json=False):
+    """build_players for very large rosters: players.ndjson is written as
+    the rows are read, without keeping the player dicts in memory.
+
+    The weekly reset must be known before any Pokemon is assigned, so the
+    roster is read twice: first_rows for PLW only, then replay_rows() for
+    the players. NDJSON and change events go to temp files, flushed every
+    FLUSH_EVERY players, and only replace players.ndjson / join the event
+    log once the roster has been read in full. What stays in memory per
+    player is the previous board's diff fields (BoardDiff).
+
+    to_json also derives players.json (and its hashed copy) from the NDJSON,
+    plus the outputs the dashboard reads next to it through manifest.json:
+    group boards (spooled per group by GroupIndex), the search index and
+    the PowerMap layout. The last two are as large as the board. Without
+    to_json none of them are touched, so the manifest never mixes boards.
+    Returns the number of players on the board.
+    """
+    global PLAYER_ASSIGNMENTS
+
+    # Only players who were on the board can signal the reset
+    watched = {name for name, data in PLAYER_ASSIGNMENTS.items() if data.get("last_plw", 0) >= 20}
+    plw_by_name = {}
+    roster = 0
+    with phase("first pass"):
+        for cols in first_rows:
+            row = roster_row(cols)
+            if not row:
+                continue
+            name, plw = row
+            roster += 1
+            player_key = name.lower().strip()
+            if player_key in watched:
+                plw_by_name[player_key] = plw
+    print(f"First pass: found {roster} total players")
+
+    week_reset = detect_new_week(plw_by_name)
+    if week_reset:
+        print("Weekly reset detected! Clearing all player assignments.")
+        PLAYER_ASSIGNMENTS = {}
+
+    previous = PLAYERS_NDJSON_PATH if os.path.exists(PLAYERS_NDJSON_PATH) else PLAYERS_JSON_PATH
+    diff = BoardDiff(iter_players(previous))
+    groups = GroupIndex() if to_json else None
+    search = SearchIndex() if to_json else None
+    power_map = PowerMap() if to_json and PowerMap else None
+    players_tmp = PLAYERS_NDJSON_PATH + ".tmp"
+    events_tmp = EVENTS_PATH + ".tmp"
+    board = spooled = 0
+
+    with phase("second pass"), open(players_tmp, 'w', encoding='utf-8') as out, \
+            open(events_tmp, 'w', encoding='utf-8') as log:
+        for player, on_board in player_records(replay_rows()):
+            if groups is not None:
+                groups.add(player, on_board)
+            if not on_board:
+                continue
+            if search is not None:
+                search.add(player)
+            if power_map is not None:
+                power_map.add(player)
+            out.write(json.dumps(player, ensure_ascii=False, separators=(",", ":")) + "\n")
+            for e in diff.player(player):
+                log.write(event_line(e))
+                spooled += 1
+            board += 1
+            if board % FLUSH_EVERY == 0:
+                out.flush()
+                log.flush()
+                print(f"  {board} players written")
+
+    with phase("write"):
+        save_player_assignments()
+
+        # Unchanged board if nobody qualifies, as in build_players
+        events = [diff.week_reset()] if week_reset else []
+        logged = len(events)
+        with open(EVENTS_PATH, 'a', encoding='utf-8') as f:
+            f.writelines(event_line(e) for e in events)
+            if board:
+                with open(events_tmp, 'r', encoding='utf-8') as log:
+                    shutil.copyfileobj(log, f)
+                leaves = diff.finish()
+                f.writelines(event_line(e) for e in leaves)
+                logged += spooled + len(leaves)
+        os.remove(events_tmp)
+        if logged:
+            print(f"Logged {logged} change events to {EVENTS_PATH}")
+
+        if not board:
+            os.remove(players_tmp)
+            if groups is not None:
+                groups.close()
+            return 0
+        os.replace(players_tmp, PLAYERS_NDJSON_PATH)
+        print(f"\nSuccess! {board} players streamed to {PLAYERS_NDJSON_PATH}")
+        if not to_json:
+            print(f"Kept {PLAYERS_JSON_PATH}, group boards, search and PowerMap (pass --json to derive them)")
+            return board
+        write_players_json(PLAYERS_NDJSON_PATH)
+        written = write_groups(pathlib.Path(PLAYERS_NDJSON_PATH).parent, groups)
+        groups.close()
+        print(f"Group boards: {len(groups.groups)} groups, {written} file(s) updated")
+        write_search_index(search)
+        write_power_map(power_map)
+    return board
+
+
+def write_search_index(search):
+    """search.<hash>.json for the dashboard's player search, found through manifest.json."""
+    text = search.to_json()
+    hashed = write_hashed_entry(pathlib.Path(PLAYERS_JSON_PATH).parent, "search", "",
+                                "search", "json", text)
+    print(f"Search index: {len(search.ids)} players, {len(search.tri)} trigrams ({hashed}, "
+          f"{len(text) / 1024:.0f} KB)")
+
+
+def write_power_map(power_map):
+    """power-map.<hash>.json: PowerMap axes and dot positions, found through manifest.json."""
+    if power_map is None:
+        print("numpy not installed, skipping the PowerMap layout (the dashboard falls back to its own)")
+        return
+    with phase("power map"):
+        text = power_map.to_json()
+    hashed = write_hashed_entry(pathlib.Path(PLAYERS_JSON_PATH).parent, "powerMap", "",
+                                "power-map", "json", text)
+    print(f"PowerMap layout: {len(power_map.ids)} players ({hashed}, {len(text) / 1024:.0f} KB)")
+
+
+def write_players_json(ndjson_path):
+    """players.json as build_players writes it (indent=4), derived from
+    players.ndjson a player at a time, plus its hashed copy."""
+    tmp = PLAYERS_JSON_PATH + ".tmp"
+    with open(ndjson_path, 'r', encoding='utf-8') as src, open(tmp, 'w') as out:
+        sep = "[\n"
+        for line in src:
+            if line.strip():
+                out.write(sep + textwrap.indent(json.dumps(json.loads(line), indent=4), "    "))
+                sep = ",\n"
+        out.write("[]" if sep == "[\n" else "\n]")
+    os.replace(tmp, PLAYERS_JSON_PATH)
+    hashed = write_hashed_entry(pathlib.Path(PLAYERS_JSON_PATH).parent, "players", "",
+                                "players", "json", src=pathlib.Path(PLAYERS_JSON_PATH))
+    print(f"Derived {PLAYERS_JSON_PATH} ({hashed})")
+
+
+def fetch_roster_rows(driver, urls=ROSTER_SOURCES):
+    """Load the first roster page with a PLW table; returns its (table, cells,
+    is_header) rows across every page and scroll window, harvested as they
+    are consumed."""
+    for i, url in enumerate(urls):
+        print(f"Fetching {url}...")
+        driver.get(url)
+
+        # Wait for the PLW table instead of a fixed sleep
+        print("Waiting for PLW table...")
+        if wait_for_plw_table_selenium(driver):
+            break
+        if i + 1 < len(urls):
+            print(f"No PLW header at {url}, trying the next source")
+        else:
+            print("No PLW header seen before timeout, reading tables anyway")
+
+    return harvest(selenium_evaluate(driver))
+
+
+def scrape_ps11_stats(html_path=None, save_html=None, fetch_only=False, url=None,
+                      stream=False, to_json=False):
+    """
+    Build public/players.json from the live roster, or from saved roster HTML
+    with html_path. save_html keeps the harvested tables (stable across runs
+    when the roster is unchanged) so later stages can reuse one fetch.
+    stream writes public/players.ndjson with stream_players instead.
+
+    url scrapes only that page instead of ROSTER_SOURCES. A failed fetch or
+    an empty harvest exits non-zero, so callers (scripts/pipeline.py) see it.
+    """
+    # Load existing player assignments
+    load_player_assignments()
+
+    if html_path and stream:
+        if not stream_players(roster_file_rows(html_path), lambda: roster_file_rows(html_path), to_json):
+            print(f"\nNo players with PLW >= 20 found in {html_path}")
+        return
+
+    if html_path:
+        with phase("read html"), open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if not build_players(html_table_rows(html)):
+            print(f"\nNo players with PLW >= 20 found in {html_path}")
+        return
+
+    if webdriver is None:
+        print("Selenium is not installed: pip install selenium webdriver-manager, or pass --html")
+        sys.exit(1)
+
+    options = selenium_options()
+
+    print("Launching headless browser...")
+    with phase("launch browser"):
+        if USE_WEBDRIVER_MANAGER:
+            service = Service(ChromeDriverManager().install())
+            driver = webdriver.Chrome(service=service, options=options)
         else:
+            driver = webdriver.Chrome(options=options)
+        enable_selenium_blocking(driver)
+
+    try:
+        with phase("fetch"):
+            rows = fetch_roster_rows(driver, [url] if url else ROSTER_SOURCES)
+        if stream and not fetch_only:
+            # The second pass reads the harvested tables back from disk
+            with tempfile.TemporaryDirectory() as tmp:
+                spool = save_html or os.path.join(tmp, "roster.html")
+                players = stream_players(data_rows(save_rows(rows, spool)),
+                                         lambda: roster_file_rows(spool), to_json)
+        else:
+            if save_html:
+                rows = save_rows(rows, save_html)
+            if fetch_only:
+                with phase("harvest"):
+                    players = sum(1 for _, _, is_header in rows if not is_header)
+            else:
+                players = build_players(data_rows(rows))
+
+        if not players:
             # Debug: show page content
             body = driver.find_element(By.TAG_NAME, 'body')
             print(f"\nPage text:\n{body.text[:1000]}")
+            sys.exit(1)
 
     except Exception as e:
         print(f"An error occurred: {e}")
         import traceback
         traceback.print_exc()
+        sys.exit(1)
 
     finally:
         driver.quit()
@@ -253,5 +564,27 @@ def extract_player_data(cols, name):
         "delta": random.randint(0, 5)
     }
 
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the PS11 roster into public/players.json")
+    parser.add_argument("--html", help="Build from saved roster HTML instead of the live page")
+    parser.add_argument("--save-html", help="Also save the fetched roster tables to this path")
+    parser.add_argument("--fetch-only", action="store_true",
+                        help="Only fetch (use with --save-html); don't touch players.json")
+    parser.add_argument("--url", default=None,
+                        help="Scrape only this roster page (e.g. a scripts/roster_fixtures.py server)")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"Write {PLAYERS_NDJSON_PATH} incrementally, for very large rosters")
+    parser.add_argument("--json", action="store_true",
+                        help=f"With --stream: also derive {PLAYERS_JSON_PATH} from the NDJSON, "
+                             "with the group boards, search index and PowerMap")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.json and not args.stream:
+        parser.error("--json only applies to --stream (players.json is the default output)")
+    output = PLAYERS_NDJSON_PATH if args.stream else PLAYERS_JSON_PATH
+    with profiled(args, args.save_html if args.fetch_only and args.save_html else output):
+        scrape_ps11_stats(args.html, args.save_html, args.fetch_only, args.url, args.stream, args.json)
+
+
 if __name__ == "__main__":
-    scrape_ps11_stats()
+    main()
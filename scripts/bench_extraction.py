@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark roster extraction backends on synthetic rosters.
+
+Pages come from scripts/roster_fixtures.py (served locally for the browser
+backends), so nothing touches the live site. For each roster size and backend
+it reports extracted rows, best wall time over --repeat runs, rows/s and the
+peak Python heap (tracemalloc, measured on a separate run). Browser backends
+include page load in their time; their heap figure covers this process only,
+not the browser.
+
+    stream      roster_tables.PlwTable + top_by_plw (race script default)
+    pandas      pandas.read_html                     (race script --parser pandas)
+    scraper     scraper.py html_table_rows + extract_player_data (scraper.py --html)
+    selenium    scraper.py live path against the local server
+    playwright  race script live path against the local server
+
+stream, pandas and playwright stop at the first PLW table, as the race does;
+the scraper backends read every table. Backends whose libraries aren't
+installed are skipped. --page-size and --virtual serve the browser backends
+a paginated or virtualized roster (scripts/roster_harvest.py walks it); the
+offline backends always parse the whole page.
+
+Usage:
+    python scripts/bench_extraction.py --sizes 10,1000,100000 --backends stream,scraper
+    python scripts/bench_extraction.py --sizes 1000 --backends selenium,playwright --page-size 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))  # scraper.py
+
+from roster_fixtures import page_url, roster_html, serve
+from roster_harvest import harvest
+from roster_tables import PlwTable, read_plw_table_pandas, top_by_plw
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+class Backend:
+    """One extraction path. run() returns the number of rows extracted."""
+
+    name = ""
+
+    def available(self):
+        return True
+
+    def start(self):
+        pass
+
+    def run(self, html, url):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class StreamBackend(Backend):
+    name = "stream"
+
+    def run(self, html, url):
+        return len(top_by_plw(PlwTable(html), 0))
+
+
+class PandasBackend(Backend):
+    name = "pandas"
+
+    def available(self):
+        try:
+            import pandas  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def run(self, html, url):
+        return len(read_plw_table_pandas(html) or [])
+
+
+class ScraperBackend(Backend):
+    name = "scraper"
+
+    def start(self):
+        import scraper
+        self.scraper = scraper
+
+    def run(self, html, url):
+        return self._extract(self.scraper.html_table_rows(html))
+
+    def _extract(self, rows):
+        count = 0
+        for cols in rows:
+            if len(cols) >= 6 and cols[0].text.strip():
+                self.scraper.extract_player_data(cols, cols[0].text.strip())
+                count += 1
+        return count
+
+
+class SeleniumBackend(ScraperBackend):
+    name = "selenium"
+
+    def available(self):
+        try:
+            import selenium  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def start(self):
+        super().start()
+        from selenium import webdriver
+        from lean_browser import selenium_options
+        self.driver = webdriver.Chrome(options=selenium_options())
+
+    def run(self, html, url):
+        rows = self.scraper.fetch_roster_rows(self.driver, url)
+        return self._extract(self.scraper.data_rows(rows))
+
+    def close(self):
+        self.driver.quit()
+
+
+class PlaywrightBackend(Backend):
+    name = "playwright"
+
+    def available(self):
+        try:
+            import playwright  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+        from lean_browser import CHROME_ARGS
+        self.pw = sync_playwright().start()
+        self.browser = self.pw.chromium.launch(headless=True, args=CHROME_ARGS)
+
+    def run(self, html, url):
+        from lean_browser import PLW_TABLE_JS
+        page = self.browser.new_page()
+        try:
+            page.goto(url, wait_until="domcontentloaded")
+            page.wait_for_function(PLW_TABLE_JS, polling=200)
+            return len(top_by_plw(PlwTable(rows=harvest(page.evaluate)), 0))
+        finally:
+            page.close()
+
+    def close(self):
+        self.browser.close()
+        self.pw.stop()
+
+
+BACKENDS = {b.name: b for b in (StreamBackend, PandasBackend, ScraperBackend,
+                                 SeleniumBackend, PlaywrightBackend)}
+
+
+def measure(backend, html, url, repeat):
+    """(rows, best seconds, peak heap bytes) for one backend on one page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = backend.run(html, url)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    backend.run(html, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark roster extraction backends")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated player counts")
+    parser.add_argument("--backends", default="stream,pandas,scraper",
+                        help=f"Comma-separated, from: {', '.join(BACKENDS)}")
+    parser.add_argument("--tables", type=int, default=1, help="Roster tables per page")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="Browser backends: paginate the roster, this many rows a page")
+    parser.add_argument("--virtual", type=int, default=0,
+                        help="Browser backends: virtualized table keeping this many rows in the DOM")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    unknown = set(args.backends.split(",")) - set(BACKENDS)
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(sorted(unknown))}")
+
+    backends = []
+    for name in args.backends.split(","):
+        backend = BACKENDS[name]()
+        if not backend.available():
+            print(f"Skipping {name}: not installed")
+            continue
+        backend.start()
+        backends.append(backend)
+
+    server, base_url = serve(port=0)
+    results = []
+    print(f"{'backend':<11} {'players':>8} {'rows':>8} {'seconds':>9} {'rows/s':>10} {'peak MiB':>9}")
+    try:
+        for n in sizes:
+            html = roster_html(n, args.tables, args.seed)
+            url = page_url(base_url, n, args.tables, args.seed,
+                           page_size=args.page_size, virtual=args.virtual)
+            for backend in backends:
+                rows, secs, peak = measure(backend, html, url, args.repeat)
+                rate = rows / secs if secs else 0
+                print(f"{backend.name:<11} {n:>8} {rows:>8} {secs:>9.4f} {rate:>10,.0f} {peak / 2**20:>9.2f}")
+                results.append({"backend": backend.name, "players": n, "tables": args.tables,
+                                "rows": rows, "seconds": round(secs, 6),
+                                "rows_per_sec": round(rate), "peak_bytes": peak})
+    finally:
+        for backend in backends:
+            backend.close()
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark generate-pokemon-data.py against the local PokeAPI stand-in.
+
+Each scenario (every combination of --latency and --rate-429) starts
+scripts/pokeapi_stub.py and runs the generator --repeat times in a
+subprocess pointed at it, so nothing touches the real API. It reports the
+best wall time, requests and requests/s as the stub counted them, retries
+(429s served), 404s and whether the output matches --expect. The default
+fixtures are rebuilt from pokemon-data.json, so the generator should
+reproduce pokemon-data.json exactly; a mismatch means dropped species or
+chains (retries ran out, or missing ids were never probed).
+
+--delay is the generator's pause between requests (default 0 here, so
+the stub's latency is what gets measured).
+
+Usage:
+    python scripts/bench_generator.py --latency 0,0.01 --rate-429 0,0.01
+    python scripts/bench_generator.py --fixtures pokeapi-fixtures.json --expect pokemon-data.json
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+GENERATOR = os.path.join(REPO_ROOT, "generate-pokemon-data.py")
+
+from pokeapi_stub import CHAIN_GAPS, POKEMON_DATA_PATH, load_fixtures, serve
+
+
+def compare(expected, actual):
+    """'' if the two outputs hold the same data, else a short description of how they differ."""
+    if actual == expected:
+        return ""
+    notes = []
+    names_e, names_a = expected.get("pokemon_names", {}), actual.get("pokemon_names", {})
+    if names_e != names_a:
+        notes.append(f"{len(set(names_e) - set(names_a))} species missing, "
+                     f"{sum(1 for k in names_a if names_e.get(k) not in (None, names_a[k]))} renamed")
+    chains_e = {tuple(c) for c in expected.get("evolution_chains", [])}
+    chains_a = {tuple(c) for c in actual.get("evolution_chains", [])}
+    if chains_e != chains_a:
+        notes.append(f"{len(chains_e - chains_a)} chains missing, {len(chains_a - chains_e)} extra")
+    elif expected.get("evolution_chains") != actual.get("evolution_chains"):
+        notes.append("chains reordered")
+    for key in ("legendaries", "mythicals"):
+        if expected.get(key) != actual.get(key):
+            notes.append(f"{key} differ")
+    return "; ".join(notes) or "metadata differs"
+
+
+def run_generator(base_url, output, delay, extra_args=()):
+    """(seconds, exit code, tail of output) for one generator run."""
+    cmd = [sys.executable, GENERATOR, "--base-url", base_url, "--delay", str(delay),
+           "--output", output, *extra_args]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, proc.returncode, (proc.stdout + proc.stderr)[-2000:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate-pokemon-data.py on a local PokeAPI stub")
+    parser.add_argument("--latency", default="0", help="Comma-separated per-request latencies (s)")
+    parser.add_argument("--rate-429", default="0", help="Comma-separated 429 probabilities")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this (s)")
+    parser.add_argument("--max-rps", type=int, default=0, help="Stub rate limit (0: none)")
+    parser.add_argument("--missing-species", default="", help="Comma-separated species ids that 404")
+    parser.add_argument("--gaps", type=int, default=CHAIN_GAPS, help="Unused chain ids in rebuilt fixtures")
+    parser.add_argument("--fixtures", help="Recorded fixtures (default: rebuilt from pokemon-data.json)")
+    parser.add_argument("--expect", default=POKEMON_DATA_PATH, help="Output the generator should produce")
+    parser.add_argument("--delay", type=float, default=0.0, help="Generator --delay between requests")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per scenario (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    parser.add_argument("generator_args", nargs="*", help="Extra generator arguments (after --)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.gaps, args.seed)
+    with open(args.expect, encoding="utf-8") as f:
+        expected = json.load(f)
+    missing = [int(i) for i in args.missing_species.split(",") if i]
+    latencies = [float(x) for x in args.latency.split(",") if x]
+    rates = [float(x) for x in args.rate_429.split(",") if x]
+
+    results = []
+    print(f"{'latency':>8} {'429 rate':>8} {'seconds':>9} {'requests':>9} {'req/s':>8} "
+          f"{'retries':>8} {'404s':>6}  output")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "pokemon-data.json")
+        for latency, rate in itertools.product(latencies, rates):
+            server, base_url = serve(fixtures, port=0, latency=latency, jitter=args.jitter,
+                                     rate_429=rate, max_rps=args.max_rps,
+                                     missing_species=missing, seed=args.seed)
+            try:
+                best = None
+                for _ in range(args.repeat):
+                    server.reset_stats()
+                    secs, code, log = run_generator(base_url, output, args.delay, args.generator_args)
+                    if code != 0:
+                        print(f"Generator failed (exit {code}):\n{log}")
+                        sys.exit(1)
+                    if best is None or secs < best[0]:
+                        best = (secs, dict(server.stats))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+            secs, stats = best
+            with open(output, encoding="utf-8") as f:
+                diff = compare(expected, json.load(f))
+            rate_rps = stats["requests"] / secs if secs else 0
+            print(f"{latency:>8.3f} {rate:>8.3f} {secs:>9.2f} {stats['requests']:>9} {rate_rps:>8.1f} "
+                  f"{stats['rate_limited']:>8} {stats['not_found']:>6}  {'equal' if not diff else diff}")
+            results.append({"latency": latency, "rate_429": rate, "jitter": args.jitter,
+                            "max_rps": args.max_rps, "delay": args.delay,
+                            "seconds": round(secs, 3), "requests": stats["requests"],
+                            "requests_per_sec": round(rate_rps, 1), "retries": stats["rate_limited"],
+                            "not_found": stats["not_found"], "output_equal": not diff, "diff": diff})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
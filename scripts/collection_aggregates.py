@@ -0,0 +1,165 @@
+"""
+Materialized season aggregates over the weekly collections.
+
+public/collections/aggregates.json holds per-player and per-week totals plus
+ready-made top-k leaderboards, so the dashboard never has to rescan every
+snapshot:
+
+    players        {id: {name, weeks, totalPlw, bestWeek, legendaryStreak,
+                         longestLegendaryStreak, firstSeen, lastSeen,
+                         seasons: {season: {weeks, totalPlw, bestWeek}}}}
+    weeks          {date: {season, players, totalPlw, tiers, top, streaking}}
+    leaderboards   {allTime: {totalPlw, bestWeek, longestLegendaryStreak},
+                    seasons: {season: {totalPlw, bestWeek}}}
+
+Each saved snapshot is applied in O(players that week): every aggregate
+only grows, so a leaderboard's new top-k is the top-k of its old entries
+plus that week's players. Seasons are school years starting September 1
+("2025-26"). A snapshot older than, or equal to, the last applied week
+(a re-run or a backfill) triggers a full rebuild instead.
+"""
+import heapq
+import json
+import pathlib
+
+AGGREGATES_FILE = "aggregates.json"
+LEADERBOARD_SIZE = 10
+SEASON_START_MONTH = 9  # September
+LEGENDARY = "legendary"
+
+
+def season_of(date: str) -> str:
+    """'2026-02-09' → '2025-26'; seasons run September to August."""
+    year, month = int(date[:4]), int(date[5:7])
+    start = year if month >= SEASON_START_MONTH else year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def empty_aggregates() -> dict:
+    return {
+        "lastWeek": None,
+        "players": {},
+        "weeks": {},
+        "leaderboards": {
+            "allTime": {"totalPlw": [], "bestWeek": [], "longestLegendaryStreak": []},
+            "seasons": {},
+        },
+    }
+
+
+def _top(board: list[dict], candidates: set[str], score, k: int) -> list[dict]:
+    """Top-k of the old board's ids plus candidates, by score(id) (a dict)."""
+    ids = {entry["id"] for entry in board} | candidates
+    ranked = heapq.nlargest(k, ids, key=lambda pid: (score(pid)["value"], pid))
+    return [dict(id=pid, **score(pid)) for pid in ranked]
+
+
+def apply_snapshot(agg: dict, snapshot: dict, k: int = LEADERBOARD_SIZE) -> dict:
+    """Fold one week's snapshot ({date, players}) into the aggregates, in place."""
+    date = snapshot["date"]
+    season = season_of(date)
+    players = agg["players"]
+    seen = set()
+    tiers = {}
+    total = 0
+    top = None
+
+    for p in snapshot.get("players", []):
+        pid, plw = p["id"], int(p.get("plw", 0))
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += plw
+        tiers[p.get("tier", "")] = tiers.get(p.get("tier", ""), 0) + 1
+        if top is None or plw > top["plw"]:
+            top = {"id": pid, "name": p["name"], "plw": plw}
+
+        rec = players.setdefault(pid, {
+            "name": p["name"], "weeks": 0, "totalPlw": 0, "bestWeek": None,
+            "legendaryStreak": 0, "longestLegendaryStreak": 0,
+            "firstSeen": date, "lastSeen": None, "seasons": {},
+        })
+        rec["name"] = p["name"]
+        rec["weeks"] += 1
+        rec["totalPlw"] += plw
+        if rec["bestWeek"] is None or plw > rec["bestWeek"]["plw"]:
+            rec["bestWeek"] = {"date": date, "plw": plw}
+        # A streak only continues from the immediately preceding week
+        if p.get("tier") == LEGENDARY:
+            continues = rec["lastSeen"] == agg["lastWeek"]
+            rec["legendaryStreak"] = rec["legendaryStreak"] + 1 if continues else 1
+            rec["longestLegendaryStreak"] = max(rec["longestLegendaryStreak"], rec["legendaryStreak"])
+        else:
+            rec["legendaryStreak"] = 0
+        rec["lastSeen"] = date
+
+        srec = rec["seasons"].setdefault(season, {"weeks": 0, "totalPlw": 0, "bestWeek": None})
+        srec["weeks"] += 1
+        srec["totalPlw"] += plw
+        if srec["bestWeek"] is None or plw > srec["bestWeek"]["plw"]:
+            srec["bestWeek"] = {"date": date, "plw": plw}
+
+    # Players missing this week break their streak; only those streaking
+    # last week have one to break
+    for pid in agg["weeks"].get(agg["lastWeek"], {}).get("streaking", []):
+        if pid not in seen:
+            players[pid]["legendaryStreak"] = 0
+
+    agg["weeks"][date] = {
+        "season": season,
+        "players": len(seen),
+        "totalPlw": total,
+        "tiers": tiers,
+        "top": top,
+        "streaking": sorted(pid for pid in seen if players[pid]["legendaryStreak"]),
+    }
+    agg["lastWeek"] = date
+
+    def name(pid):
+        return players[pid]["name"]
+
+    boards = agg["leaderboards"]
+    all_time = boards["allTime"]
+    all_time["totalPlw"] = _top(all_time["totalPlw"], seen, lambda pid: {
+        "name": name(pid), "value": players[pid]["totalPlw"]}, k)
+    all_time["bestWeek"] = _top(all_time["bestWeek"], seen, lambda pid: {
+        "name": name(pid), "value": players[pid]["bestWeek"]["plw"],
+        "date": players[pid]["bestWeek"]["date"]}, k)
+    all_time["longestLegendaryStreak"] = _top(
+        all_time["longestLegendaryStreak"],
+        {pid for pid in seen if players[pid]["longestLegendaryStreak"]},
+        lambda pid: {"name": name(pid), "value": players[pid]["longestLegendaryStreak"]}, k)
+
+    sboard = boards["seasons"].setdefault(season, {"totalPlw": [], "bestWeek": []})
+    sboard["totalPlw"] = _top(sboard["totalPlw"], seen, lambda pid: {
+        "name": name(pid), "value": players[pid]["seasons"][season]["totalPlw"]}, k)
+    sboard["bestWeek"] = _top(sboard["bestWeek"], seen, lambda pid: {
+        "name": name(pid), "value": players[pid]["seasons"][season]["bestWeek"]["plw"],
+        "date": players[pid]["seasons"][season]["bestWeek"]["date"]}, k)
+    return agg
+
+
+def rebuild_aggregates(collections_dir: pathlib.Path, k: int = LEADERBOARD_SIZE) -> dict:
+    """Aggregates from scratch: every dated snapshot, oldest first."""
+    agg = empty_aggregates()
+    for path in sorted(collections_dir.glob("20*.json")):
+        apply_snapshot(agg, json.loads(path.read_text(encoding="utf-8")), k)
+    return agg
+
+
+def update_aggregates(collections_dir: pathlib.Path, snapshot: dict, k: int = LEADERBOARD_SIZE) -> dict:
+    """Apply a newly saved snapshot to aggregates.json (rebuilding if out of order)."""
+    path = collections_dir / AGGREGATES_FILE
+    agg = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    if agg is None or agg["lastWeek"] is None or snapshot["date"] <= agg["lastWeek"]:
+        if agg is not None:
+            print(f"{snapshot['date']} is not after {agg['lastWeek']}, rebuilding aggregates")
+        agg = rebuild_aggregates(collections_dir, k)
+    else:
+        apply_snapshot(agg, snapshot, k)
+    write_aggregates(path, agg)
+    return agg
+
+
+def write_aggregates(path: pathlib.Path, agg: dict):
+    path.write_text(json.dumps(agg, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
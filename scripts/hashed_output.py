@@ -0,0 +1,89 @@
+"""
+Content-hashed output files and the public/manifest.json that points at them.
+
+A file named after its content (players.<hash>.json) never changes, so it
+can be cached forever; only the small manifest has to be revalidated.
+When a hashed file is replaced, the version the manifest pointed at until
+now is kept one more round for clients still holding that manifest.
+"""
+import hashlib
+import json
+import pathlib
+import shutil
+
+HASH_LEN = 10
+MANIFEST_NAME = "manifest.json"
+
+
+def content_hash(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()[:HASH_LEN]
+
+
+def file_hash(path: pathlib.Path) -> str:
+    """content_hash of a file's text, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()[:HASH_LEN]
+
+
+def _prune(out_dir: pathlib.Path, stem: str, ext: str, name: str, keep):
+    for old in out_dir.glob(f"{stem}.{'?' * HASH_LEN}.{ext}"):
+        if old.name != name and old.name not in keep:
+            old.unlink()
+
+
+def write_hashed(out_dir: pathlib.Path, stem: str, ext: str, content: str | bytes, keep=()) -> str:
+    """Write <stem>.<hash>.<ext> once and prune other hashes except `keep`. Returns the file name."""
+    name = f"{stem}.{content_hash(content)}.{ext}"
+    path = out_dir / name
+    if not path.exists():
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content, encoding="utf-8")
+    _prune(out_dir, stem, ext, name, keep)
+    return name
+
+
+def copy_hashed(out_dir: pathlib.Path, stem: str, ext: str, src: pathlib.Path, keep=()) -> str:
+    """write_hashed for content already in the file `src`, without reading it into memory."""
+    name = f"{stem}.{file_hash(src)}.{ext}"
+    path = out_dir / name
+    if not path.exists():
+        shutil.copyfile(src, path)
+    _prune(out_dir, stem, ext, name, keep)
+    return name
+
+
+def read_manifest(public_dir: pathlib.Path) -> dict:
+    path = public_dir / MANIFEST_NAME
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def write_hashed_entry(public_dir: pathlib.Path, key: str, rel_dir: str, stem: str, ext: str,
+                       content: str = None, src: pathlib.Path = None) -> str:
+    """Write a hashed file (content, or a copy of src) under public/<rel_dir> and point manifest[key] at it."""
+    manifest = read_manifest(public_dir)
+    previous = manifest.get(key, "")
+    keep = {pathlib.PurePosixPath(previous).name}
+    if src is not None:
+        name = copy_hashed(public_dir / rel_dir, stem, ext, src, keep)
+    else:
+        name = write_hashed(public_dir / rel_dir, stem, ext, content, keep)
+    update_manifest(public_dir, **{key: f"{rel_dir}/{name}" if rel_dir else name})
+    return name
+
+
+def update_manifest(public_dir: pathlib.Path, **entries) -> dict:
+    """Merge entries (paths relative to public/) into manifest.json."""
+    manifest = read_manifest(public_dir)
+    manifest.update(entries)
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    path = public_dir / MANIFEST_NAME
+    if not path.exists() or path.read_text(encoding="utf-8") != text:
+        path.write_text(text, encoding="utf-8")
+    return manifest
@@ -0,0 +1,132 @@
+"""
+Lean headless-browser profile shared by scraper.py (Selenium) and
+scripts/mario_kart_leaderboard.py (Playwright).
+
+Both scrapers only need the roster table DOM, so images, media, fonts and
+analytics requests are blocked, pages load with an eager/DOMContentLoaded
+strategy, and readiness means "a table with a PLW header exists" rather
+than network idle or a fixed sleep.
+
+Neither Selenium nor Playwright is imported at module level, so each
+scraper only needs its own browser library installed.
+"""
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+CHROME_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+    "--window-size=1920,1080",
+]
+
+# Playwright resource types that never contribute to the table DOM
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+)
+
+# Chrome DevTools Network.setBlockedURLs patterns (Selenium side)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+] + [f"*{host}*" for host in ANALYTICS_HOSTS]
+
+# True once any table's first row has a PLW header (same rule as PLW_RE)
+PLW_TABLE_JS = """() => {
+  const re = /^plw$|^points.last.week$/i;
+  for (const t of document.querySelectorAll('table')) {
+    const row = t.rows[0];
+    if (row && Array.from(row.cells).some(c => re.test(c.textContent.trim()))) return true;
+  }
+  return false;
+}"""
+
+TABLE_WAIT_TIMEOUT = 20  # seconds
+
+
+def is_blocked(resource_type, url):
+    """Whether a request is non-essential for reading the roster table."""
+    return resource_type in BLOCKED_RESOURCE_TYPES or any(h in url for h in ANALYTICS_HOSTS)
+
+
+# ── Selenium ────────────────────────────────────────────────────────────────
+def selenium_options():
+    """Headless Chrome options with eager page loads and images disabled."""
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.page_load_strategy = "eager"
+    options.add_argument("--headless=new")
+    for arg in CHROME_ARGS:
+        options.add_argument(arg)
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    })
+    return options
+
+
+def enable_selenium_blocking(driver):
+    """Block fonts, media and analytics through the DevTools protocol."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Request blocking unavailable: {e}")
+
+
+def wait_for_plw_table_selenium(driver, timeout=TABLE_WAIT_TIMEOUT):
+    """Wait until a PLW table is in the DOM. Returns False on timeout."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    script = f"return ({PLW_TABLE_JS})();"
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(script)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+# ── Playwright (async API) ──────────────────────────────────────────────────
+async def _route_lean(route):
+    request = route.request
+    if is_blocked(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def new_lean_context(browser):
+    """Browser context with non-essential requests aborted."""
+    context = await browser.new_context(user_agent=USER_AGENT)
+    await context.route("**/*", _route_lean)
+    return context
+
+
+async def wait_for_plw_table(page, timeout=TABLE_WAIT_TIMEOUT):
+    """Wait until a PLW table is in the DOM. Returns False on timeout."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+    try:
+        await page.wait_for_function(PLW_TABLE_JS, timeout=timeout * 1000, polling=200)
+        return True
+    except PlaywrightTimeout:
+        return False
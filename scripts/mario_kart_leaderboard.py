@@ -1,118 +1,199 @@
 #!/usr/bin/env python3
 """
 PS11 Chess Club Mario Kart Leaderboard
-Scrapes PLW (Points Last Week) and generates a self-contained
-HTML5 Canvas racing animation styled as Mario Kart.
+Scrapes PLW (Points Last Week) and generates an HTML5 Canvas
+racing animation styled as Mario Kart.
 
 Usage:
     python3 ~/.claude/utils/chess/mario_kart_leaderboard.py
 
-Output:
-    ~/.claude/cache/chess/mario_kart_leaderboard.html  (auto-opens)
+Output (all in the output file's directory):
+    mario_kart_leaderboard.html   HTML shell (auto-opens)
+    race.<hash>.css / .js         static assets, renamed only when they change
+    race.json                     racer data for this run
+    race.<hash>.mp4 / .webp, race-poster.<hash>.png
+                                  pre-rendered race (--export-video)
 """
+import asyncio
+import base64
+import colorsys
+import hashlib
 import io
 import json
 import pathlib
 import re
+import string
 import subprocess
 import sys
 from datetime import datetime
 
-import pandas as pd
-from playwright.sync_api import sync_playwright
+# Playwright is only needed for live scraping (not for --html)
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+from hashed_output import HASH_LEN, write_hashed
+from lean_browser import CHROME_ARGS, new_lean_context, wait_for_plw_table
+from profiling import add_profile_arguments, phase, profiled
+from race_sim import simulate_race
+from roster_harvest import harvest_async, tee_html
+from roster_tables import PlwTable, read_plw_table_pandas, top_by_plw
+
+# pandas is optional — only needed for --parser pandas
+try:
+    import pandas  # noqa: F401
+    HAVE_PANDAS = True
+except ImportError:
+    HAVE_PANDAS = False
+
+# fontTools (+ brotli for WOFF2) is optional — only needed for --font
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+# Pillow is optional — only needed for --export-video
+try:
+    import race_video
+except ImportError:
+    race_video = None
 
 # ── URLs ─────────────────────────────────────────────────────────────────────
 IFRAME_URL = "https://icnadmin2.com/icnroster/ck_data_PS11.html"
 MAIN_URL   = "https://impactcoachingnetwork.org/ps11chessclubandteamstats"
 OUTPUT_PATH = pathlib.Path.home() / ".claude/cache/chess/mario_kart_leaderboard.html"
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+COLLECTIONS_DIR = REPO_ROOT / "public" / "collections"
+
+# (url, goto timeout ms, PLW-table wait timeout ms) — fetched concurrently,
+# listed in order of preference when several finish together
+SOURCES = [
+    (IFRAME_URL, 30000, 20000),
+    (MAIN_URL,   40000, 30000),
+]
+
+TOP_N = 20  # --top default; 0 races the full roster
+
+# First 20 karts keep the classic palette; beyond that colours are generated
+KART_COLORS = [
+    '#e6001a','#007dc5','#00a651','#f9a11b','#9b59b6',
+    '#e67e22','#1abc9c','#e91e8c','#3498db','#c0392b',
+    '#27ae60','#f1c40f','#8e44ad','#16a085','#d35400',
+    '#2c3e50','#a29bfe','#fd79a8','#55efc4','#fdcb6e',
+]
+GOLDEN_ANGLE = 137.508  # degrees — successive hues stay well separated
+
+
+def kart_palette(n: int) -> list[str]:
+    """n distinct kart colours: the classic 20, then golden-angle HSL hues."""
+    colors = KART_COLORS[:n]
+    for i in range(len(colors), n):
+        hue = (i * GOLDEN_ANGLE) % 360 / 360
+        light = (0.45, 0.55, 0.65)[i % 3]
+        r, g, b = colorsys.hls_to_rgb(hue, light, 0.75)
+        colors.append(f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}")
+    return colors
+
+
+def extract_top_racers(html: str, parser: str = "stream", n: int = TOP_N, rows=None):
+    """Top-n (all if n is 0) (name, plw) rows of the first PLW table, or None, plus scanned headers.
+
+    rows= takes harvested (table, cells, is_header) rows in place of html.
+    """
+    if parser == "pandas":
+        if rows is not None:
+            buf = io.StringIO()
+            for _ in tee_html(rows, buf):
+                pass
+            html = buf.getvalue()
+        found = read_plw_table_pandas(html)
+        return (top_by_plw(found, n) if found is not None else None), []
+    table = PlwTable(html, rows=rows)
+    if not table.found:
+        return None, table.headers
+    top = top_by_plw(table, n)
+    print(f"  Using name-col={table.name_col} plw-col={table.plw_col}  kept={len(top)}")
+    return top, table.headers
+
+
+async def _fetch_plw_table(context, url, goto_timeout, table_timeout, parser, top):
+    """Load one source in its own page and extract its PLW table (or None)."""
+    page = await context.new_page()
+    try:
+        print(f"  → {url}")
+        await page.goto(url, timeout=goto_timeout, wait_until="domcontentloaded")
+        await wait_for_plw_table(page, timeout=table_timeout / 1000)
+        # Every page / scroll window of the table, not just the rows in the DOM
+        rows = [row async for row in harvest_async(page.evaluate)]
+        return extract_top_racers(None, parser, top, rows=rows)
+    finally:
+        await page.close()
+
+
+async def _race_sources(parser, top, sources=SOURCES):
+    """Fetch every source concurrently; the first to yield a PLW table wins."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=CHROME_ARGS)
+        context = await new_lean_context(browser)
+        tasks = {
+            asyncio.create_task(_fetch_plw_table(context, url, goto_t, idle_t, parser, top)): i
+            for i, (url, goto_t, idle_t) in enumerate(sources)
+        }
+        pending = set(tasks)
+        headers = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    url = sources[tasks[task]][0]
+                    if task.exception() is not None:
+                        print(f"  {url} failed: {task.exception()}")
+                        continue
+                    rows, hdrs = task.result()
+                    headers.extend(hdrs)
+                    if rows is not None:
+                        if pending:
+                            print(f"  PLW found at {url} — cancelling {len(pending)} other fetch(es)")
+                        return rows, headers
+                    print(f"  PLW not found at {url}")
+            return None, headers
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await browser.close()
+
+
+def scrape_racers(parser: str = "stream", top: int = TOP_N, sources=SOURCES) -> list[dict]:
+    """Scrape the top students by PLW (all if top is 0). Returns list of {name, plw, rank} dicts."""
+    if parser == "pandas" and not HAVE_PANDAS:
+        print("ERROR: --parser pandas requires pandas (pip install pandas lxml html5lib)")
+        sys.exit(1)
 
-PLW_RE = re.compile(r"(?i)^plw$|^points.last.week$")
-
-
-def find_plw_column(df: pd.DataFrame) -> str | None:
-    """Return the PLW column name or None if not present."""
-    for col in df.columns:
-        if PLW_RE.match(str(col).strip()):
-            return col
-    return None
-
+    if async_playwright is None:
+        print("ERROR: live scraping requires Playwright (pip install playwright), or pass --html")
+        sys.exit(1)
 
-def scrape_racers() -> list[dict]:
-    """Scrape top-20 students by PLW. Returns list of {name, plw, rank} dicts."""
     print("Launching Playwright…")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page    = browser.new_page()
-
-        # ── Try iframe URL first ──────────────────────────────────────────────
-        print(f"  → {IFRAME_URL}")
-        page.goto(IFRAME_URL, timeout=30000)
-        page.wait_for_load_state("networkidle", timeout=20000)
-        html = page.content()
-
-        tables = pd.read_html(io.StringIO(html))
-        plw_col = None
-        chosen  = None
-        for tbl in tables:
-            col = find_plw_column(tbl)
-            if col:
-                plw_col = col
-                chosen  = tbl
-                break
-
-        # ── Fall back to main page ─────────────────────────────────────────────
-        if chosen is None:
-            print(f"  PLW not found in iframe — trying main page…")
-            print(f"  → {MAIN_URL}")
-            page.goto(MAIN_URL, timeout=40000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            html = page.content()
-
-            tables = pd.read_html(io.StringIO(html))
-            for tbl in tables:
-                col = find_plw_column(tbl)
-                if col:
-                    plw_col = col
-                    chosen  = tbl
-                    break
-
-        browser.close()
-
-    if chosen is None:
+    rows, headers = asyncio.run(_race_sources(parser, top, sources))
+
+    if rows is None:
         print("\nERROR: Could not find a PLW column on any table.")
         print("Tables found and their columns:")
-        for i, tbl in enumerate(tables):
-            print(f"  Table {i}: {list(tbl.columns)}")
-        sys.exit(1)
-
-    # ── Identify name column ──────────────────────────────────────────────────
-    name_col = None
-    for col in chosen.columns:
-        if re.match(r"(?i)^name$|^student|^player", str(col).strip()):
-            name_col = col
-            break
-    if name_col is None:
-        # First string column heuristic
-        for col in chosen.columns:
-            if chosen[col].dtype == object:
-                name_col = col
-                break
-    if name_col is None:
-        print(f"ERROR: Cannot identify a Name column. Columns: {list(chosen.columns)}")
+        for i, cols in enumerate(headers):
+            print(f"  Table {i}: {cols}")
         sys.exit(1)
 
-    print(f"  Using name='{name_col}' plw='{plw_col}'  rows={len(chosen)}")
+    return ranked_racers(rows)
 
-    df = chosen[[name_col, plw_col]].copy()
-    df.columns = ["name", "plw"]
-    df["plw"] = pd.to_numeric(df["plw"], errors="coerce").fillna(0)
-    df = df[df["name"].notna() & (df["name"].astype(str).str.strip() != "")]
-    df = df.sort_values("plw", ascending=False).head(20).reset_index(drop=True)
 
+def ranked_racers(rows) -> list[dict]:
+    """(name, plw) rows, best first → [{name, plw, rank}], with a short printout."""
     racers = [
-        {"name": str(row["name"]).strip(), "plw": int(row["plw"]), "rank": i + 1}
-        for i, row in df.iterrows()
+        {"name": name, "plw": plw, "rank": i + 1}
+        for i, (name, plw) in enumerate(rows)
     ]
     print(f"  Top {len(racers)} racers by PLW:")
     for r in racers[:5]:
@@ -122,16 +203,21 @@ def scrape_racers() -> list[dict]:
     return racers
 
 
-# ── HTML TEMPLATE ─────────────────────────────────────────────────────────────
-HTML_TEMPLATE = r"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>PS11 Chess Club: The Weekly Sprint</title>
-<link href="https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap" rel="stylesheet">
-<style>
-*{box-sizing:border-box;margin:0;padding:0}
+def racers_from_html(path: str, parser: str = "stream", top: int = TOP_N) -> list[dict]:
+    """Racers from saved roster HTML (e.g. scraper.py --save-html) — no browser."""
+    html = pathlib.Path(path).read_text(encoding="utf-8")
+    rows, headers = extract_top_racers(html, parser, top)
+    if rows is None:
+        print(f"ERROR: no PLW table in {path}. Tables: {headers}")
+        sys.exit(1)
+    return ranked_racers(rows)
+
+
+# ── Static assets ─────────────────────────────────────────────────────────────
+# The page is split into a small HTML shell, content-hashed race.<hash>.css /
+# race.<hash>.js (unchanged between runs, so cacheable forever) and race.json
+# holding the racer data that changes daily.
+RACE_CSS = r"""*{box-sizing:border-box;margin:0;padding:0}
 #tab-nav{
   display:flex;gap:0;background:#0f0720;border-bottom:2px solid #2d1a5e;
   font-family:'Press Start 2P','Courier New',monospace;
@@ -185,13 +271,16 @@ h1{
 .btn:hover{filter:brightness(1.3);transform:translateY(-2px)}
 .btn-red  {background:#e6001a;color:#fff}
 .btn-green{background:#00a651;color:#fff}
+.btn-week {background:#2d1a5e;color:#fff}
+.btn-week[hidden]{display:none}
+canvas[hidden]{display:none}
 #canvas-wrapper{
   width:100%;
   max-width:960px;
   margin:10px auto 0;
   padding:0 8px;
 }
-canvas{
+canvas,.race-video{
   width:100%;
   display:block;
   border:4px solid #f9a11b;
@@ -248,63 +337,103 @@ canvas{
 .podium-slot.p2{border-color:#aaa}
 .podium-slot.p3{border-color:#c87137}
 .podium-pos{font-size:1.6em}
-</style>
-</head>
-<body>
-
-<div id="tab-nav">
-  <a href="__BASE_PATH__/" id="tab-pokechess">PokeChess</a>
-  <span id="tab-race">🏎 Weekly Sprint</span>
-</div>
-<div id="race-header">
-  <h1>PS11 Chess Club: The Weekly Sprint</h1>
-  <div class="subtitle">Data as of __GENERATED_DATE__ &nbsp;|&nbsp; PLW = Points Last Week</div>
-  <div class="controls">
-    <button class="btn btn-green" id="btn-restart">&#9654; Restart Race</button>
-  </div>
-</div>
-
-<div id="canvas-wrapper">
-  <canvas id="track"></canvas>
-</div>
-
-
-<div id="overlay">
-  <h2>&#127942; RACE COMPLETE! &#127942;</h2>
-  <div id="podium"></div>
-  <button class="btn btn-green" id="btn-overlay-restart" style="margin-top:10px">&#9654; Race Again</button>
-</div>
-
-<div id="participants">__PARTICIPANTS_HTML__</div>
+"""
 
-<script>
-// ── Injected data ─────────────────────────────────────────────────────────
-const RACERS = __RACERS_DATA__;
+RACE_JS = r"""// ── Data (race.json, next to this script) ─────────────────────────────────
+const DATA_URL = new URL('race.json', document.currentScript.src);
+let RACERS = [];
+let TIMELINE = null; // decoded data.race — see race_sim.simulate_race()
 
 // ── Constants ─────────────────────────────────────────────────────────────
 const TARGET_LAPS   = 2;
-const MIN_SPEED     = 0.008;   // arc-frac / sec
-const MAX_SPEED     = 0.075;   // arc-frac / sec
-const VARIANCE_MAX  = 0.018;   // ± perturbation
-const VAR_INTERVAL_MIN = 3000; // ms
-const VAR_INTERVAL_RNG = 2000; // ms extra random
 const ARC_SAMPLES   = 1200;
 const KART_W_BASE   = 20;
 const KART_H_BASE   = 13;
-const ARC_GAP       = 0.018;   // stagger between karts at start
 
-const KART_COLORS = [
-  '#e6001a','#007dc5','#00a651','#f9a11b','#9b59b6',
-  '#e67e22','#1abc9c','#e91e8c','#3498db','#c0392b',
-  '#27ae60','#f1c40f','#8e44ad','#16a085','#d35400',
-  '#2c3e50','#a29bfe','#fd79a8','#55efc4','#fdcb6e',
-];
+const LOD_THRESHOLD = 40;      // above this many karts: batched drawing, culled labels
+const LABEL_CELL    = 48;      // px, label collision grid
 
 // ── Canvas setup ──────────────────────────────────────────────────────────
 const canvas  = document.getElementById('track');
 const ctx     = canvas.getContext('2d');
+let viewW, viewH;          // canvas size in CSS px; all drawing uses these units
+let pixelRatio = 1;        // backing-store pixels per CSS px
 let cx, cy, rx, ry, roadWidth, kartW, kartH;
 let arcTable = null; // { lengths[], angles[], totalLen }
+let staticLayer = null; // offscreen canvas, rebuilt lazily after resize
+
+// ── Adaptive quality ──────────────────────────────────────────────────────
+// The time draw() takes (measured around the call, not the rAF interval,
+// which a 30 Hz or battery-saver display stretches however cheap drawing
+// is) is tracked as a moving average over on-screen frames. When it stays
+// over DRAW_BUDGET_MS for QUALITY_HOLD_FRAMES, the next cheaper level is
+// used: no sparkle aura, then no kart shadows, then 1x resolution instead
+// of devicePixelRatio. Levels only go down; a device that could not keep
+// up once gets no retry that would stutter again. Past the last level the
+// page switches to the race video when there is one.
+const QUALITY_LEVELS = [
+  { maxScale: 2, aura: true,  shadows: true  },
+  { maxScale: 2, aura: false, shadows: true  },
+  { maxScale: 2, aura: false, shadows: false },
+  { maxScale: 1, aura: false, shadows: false },
+];
+const DRAW_BUDGET_MS      = 10;  // of a 60 Hz frame's 16.7 ms, leaving room to composite
+const DRAW_EMA_ALPHA      = 0.1;
+const QUALITY_HOLD_FRAMES = 60;
+let qualityLevel = 0;
+let drawEma      = 0;
+let slowFrames   = 0;
+
+function quality() {
+  return QUALITY_LEVELS[qualityLevel];
+}
+
+function trackDrawTime(ms) {
+  drawEma = drawEma ? drawEma + DRAW_EMA_ALPHA * (ms - drawEma) : ms;
+  slowFrames = drawEma > DRAW_BUDGET_MS ? slowFrames + 1 : 0;
+  if (slowFrames < QUALITY_HOLD_FRAMES) return;
+  drawEma = slowFrames = 0;
+  if (qualityLevel === QUALITY_LEVELS.length - 1) {
+    // Still too slow at the cheapest level: play the pre-rendered race
+    lowPower = true;
+    if (currentRace && wantsVideo(currentRace)) showVideo(currentRace.video);
+    return;
+  }
+  const prev = quality();
+  qualityLevel++;
+  if (quality().maxScale !== prev.maxScale) resizeCanvas();
+}
+
+// ── Cached bitmaps ────────────────────────────────────────────────────────
+// Name pills, the finisher list and the lap badge are text rendered once
+// into small canvases at device resolution and blitted every frame. Their
+// font sizes follow the kart size, so resizeCanvas() drops them all.
+const labelSprites = new Map();  // label → sprite
+let finisherRows = [];           // { text, color, w } per finisher, in order
+let finisherRowsW = 0;           // widest row
+let finisherPanel = null;        // sprite, rebuilt when a visible row is added
+let lapBadge = null;             // sprite, rebuilt when the lap changes
+const measureCtx = document.createElement('canvas').getContext('2d');
+
+function clearSprites() {
+  labelSprites.clear();
+  finisherRows = [];
+  finisherRowsW = 0;
+  finisherPanel = lapBadge = null;
+}
+
+// A w×h (CSS px) canvas at the current pixel ratio, painted in CSS px
+function makeSprite(w, h, paint) {
+  const sprite = document.createElement('canvas');
+  sprite.width  = Math.ceil(w * pixelRatio);
+  sprite.height = Math.ceil(h * pixelRatio);
+  sprite.w = sprite.width  / pixelRatio;
+  sprite.h = sprite.height / pixelRatio;
+  const g = sprite.getContext('2d');
+  g.scale(pixelRatio, pixelRatio);
+  paint(g);
+  return sprite;
+}
 
 function buildArcTable(rx, ry) {
   const N = ARC_SAMPLES;
@@ -350,19 +479,34 @@ function thetaToHeading(theta) {
 
 function resizeCanvas() {
   const wrapper = document.getElementById('canvas-wrapper');
-  const w = wrapper.offsetWidth - 16;
-  canvas.width  = w;
-  canvas.height = Math.round(w * 0.56);
-  cx = canvas.width  / 2;
-  cy = canvas.height / 2;
-  rx = canvas.width  * 0.41;
-  ry = canvas.height * 0.37;
-  roadWidth = Math.min(canvas.width, canvas.height) * 0.13;
-  kartW = Math.max(10, canvas.width  * 0.021);
-  kartH = Math.max(7,  canvas.height * 0.040);
+  viewW = wrapper.offsetWidth - 16;
+  viewH = Math.round(viewW * 0.56);
+  pixelRatio = Math.min(window.devicePixelRatio || 1, quality().maxScale);
+  canvas.width  = Math.round(viewW * pixelRatio);
+  canvas.height = Math.round(viewH * pixelRatio);
+  ctx.setTransform(pixelRatio, 0, 0, pixelRatio, 0, 0);  // reset by the size change
+  cx = viewW / 2;
+  cy = viewH / 2;
+  rx = viewW * 0.41;
+  ry = viewH * 0.37;
+  roadWidth = Math.min(viewW, viewH) * 0.13;
+  kartW = Math.max(10, viewW * 0.021);
+  kartH = Math.max(7,  viewH * 0.040);
   arcTable = buildArcTable(rx, ry);
+  staticLayer = null;
+  clearSprites();
 }
-window.addEventListener('resize', resizeCanvas);
+// Rebuilding the canvas and arc table on every resize event stalls drags;
+// wait until the window has settled
+const RESIZE_DEBOUNCE_MS = 150;
+let resizeTimer = null;
+window.addEventListener('resize', () => {
+  clearTimeout(resizeTimer);
+  resizeTimer = setTimeout(() => {
+    resizeCanvas();
+    requestFrame();  // resizing clears the canvas
+  }, RESIZE_DEBOUNCE_MS);
+});
 resizeCanvas();
 
 // ── Grass tile pattern ────────────────────────────────────────────────────
@@ -377,139 +521,181 @@ function makeGrassTile() {
 const grassTile = makeGrassTile();
 
 // ── Racer state ───────────────────────────────────────────────────────────
-const MAX_PLW = Math.max(...RACERS.map(r => r.plw), 1);
 let racerState = [];
-
-function computeBaseSpeed(plw) {
-  return MIN_SPEED + (plw / MAX_PLW) * (MAX_SPEED - MIN_SPEED);
-}
+let drawOrder  = [];   // racerState by arcPos, maintained by sortDrawOrder()
+let finishers  = [];   // racerState in finishing order
 
 function initRacerState() {
   racerState = RACERS.map((r, i) => ({
     name:        r.name,
+    label:       r.name.split(' ')[0],
     plw:         r.plw,
-    arcPos:      -(i * ARC_GAP),
-    baseSpeed:   computeBaseSpeed(r.plw),
-    currentSpeed: computeBaseSpeed(r.plw),
-    variance:    0,
-    nextVarAt:   performance.now() + Math.random() * VAR_INTERVAL_RNG,
+    arcPos:      TIMELINE.count ? TIMELINE.pos[i] : 0,
     laps:        0,
     finished:    false,
     finishOrder: null,
     celebrating: false,
     celebEnd:    0,
-    color:       KART_COLORS[i % KART_COLORS.length],
+    color:       r.color,
   }));
+  drawOrder = [...racerState].sort((a, b) => a.arcPos - b.arcPos);
+  finishers = [];
+  finisherRows = [];
+  finisherRowsW = 0;
+  finisherPanel = null;
   raceOver = false;
+  clearTimeout(overlayTimer);
+  raceClock = 0;
   finishCount = 0;
   document.getElementById('overlay').classList.remove('show');
 }
 
 let raceOver    = false;
+let overlayTimer = null;
+let raceClock   = 0;   // seconds into the precomputed race
 let finishCount = 0;
-initRacerState();
+
+// ── Timeline playback ─────────────────────────────────────────────────────
+// The race is simulated ahead of time in Python; keyframes hold every kart's
+// arc position each `tick` seconds (last keyframe at `end`), delta-encoded.
+function decodeTimeline(race, n) {
+  const count = race.frames.length;
+  const pos = new Float64Array(count * n);
+  for (let f = 0; f < count; f++) {
+    const row = race.frames[f];
+    for (let k = 0; k < n; k++) {
+      pos[f * n + k] = (f ? pos[(f - 1) * n + k] : 0) + row[k] / race.scale;
+    }
+  }
+  return { tick: race.tick, end: race.end, n, count, pos,
+           finish: race.finish, finishTimes: race.finishTimes };
+}
+
+function positionsAt(t) {
+  const { tick, end, n, count, pos } = TIMELINE;
+  if (count < 2) return;
+  const last = count - 1;
+  let i = Math.floor(t / tick), u;
+  if (i >= last - 1) {
+    i = last - 1;
+    const t0 = i * tick;
+    u = end > t0 ? (t - t0) / (end - t0) : 1;
+  } else {
+    u = t / tick - i;
+  }
+  u = Math.min(1, Math.max(0, u));
+  const a = i * n, b = a + n;
+  for (let k = 0; k < n; k++) {
+    racerState[k].arcPos = pos[a + k] + u * (pos[b + k] - pos[a + k]);
+  }
+}
 
 // ── Update logic ──────────────────────────────────────────────────────────
 function updateRacers(dt) {
-  if (raceOver) return;
-  racerState.forEach(r => {
-    if (r.finished) return;
-    r.arcPos += r.currentSpeed * dt;
-    const newLaps = Math.floor(r.arcPos);
-    if (newLaps > r.laps) {
-      r.laps = newLaps;
-      if (r.laps >= TARGET_LAPS) {
-        r.finished    = true;
-        r.celebrating = true;
-        r.celebEnd    = performance.now() + 3500;
-        finishCount++;
-        r.finishOrder = finishCount;
-      }
-    }
-  });
-  if (finishCount >= 8) {
+  if (raceOver || !TIMELINE.count) return;
+  raceClock = Math.min(raceClock + dt, TIMELINE.end);
+  positionsAt(raceClock);
+  racerState.forEach(r => { r.laps = Math.max(0, Math.floor(r.arcPos)); });
+  while (finishCount < TIMELINE.finish.length && TIMELINE.finishTimes[finishCount] <= raceClock) {
+    const r = racerState[TIMELINE.finish[finishCount]];
+    finishCount++;
+    r.finished    = true;
+    r.celebrating = true;
+    r.celebEnd    = performance.now() + 3500;
+    r.finishOrder = finishCount;
+    finishers.push(r);
+  }
+  if (raceClock >= TIMELINE.end) {
     raceOver = true;
-    setTimeout(showOverlay, 2000);
+    overlayTimer = setTimeout(showOverlay, 2000);
   }
 }
 
-function updateVariances(ts) {
-  racerState.forEach(r => {
-    if (r.finished) return;
-    if (ts >= r.nextVarAt) {
-      r.variance     = (Math.random() * 2 - 1) * VARIANCE_MAX;
-      r.currentSpeed = Math.max(MIN_SPEED * 0.5, r.baseSpeed + r.variance);
-      r.nextVarAt    = ts + VAR_INTERVAL_MIN + Math.random() * VAR_INTERVAL_RNG;
-    }
-  });
+// ── Static layer (background, track, start/finish) ────────────────────────
+// Nothing here changes between frames, so it is rendered once into an
+// offscreen canvas (staticLayer) and blitted each frame; resizeCanvas()
+// invalidates it.
+function buildStaticLayer() {
+  const layer = document.createElement('canvas');
+  layer.width  = canvas.width;
+  layer.height = canvas.height;
+  const lctx = layer.getContext('2d');
+  lctx.scale(pixelRatio, pixelRatio);
+  drawBackground(lctx);
+  drawTrack(lctx);
+  drawStartFinish(lctx);
+  return layer;
 }
 
 // ── Draw helpers ──────────────────────────────────────────────────────────
-function drawBackground() {
+function drawBackground(g) {
   // Sky
-  const grad = ctx.createLinearGradient(0, 0, 0, canvas.height);
+  const grad = g.createLinearGradient(0, 0, 0, viewH);
   grad.addColorStop(0, '#1a0a2e');
   grad.addColorStop(1, '#2d0a5e');
-  ctx.fillStyle = grad;
-  ctx.fillRect(0, 0, canvas.width, canvas.height);
+  g.fillStyle = grad;
+  g.fillRect(0, 0, viewW, viewH);
 
-  // Checkerboard border (8-bit style) — 8px squares around edge
+  // Checkerboard border (8-bit style) — two rings of 8px squares, visiting
+  // only the edge cells rather than the whole canvas grid
   const sq = 8;
-  ctx.save();
-  for (let x = 0; x < canvas.width; x += sq) {
-    for (let y = 0; y < canvas.height; y += sq) {
-      const onEdge = x < sq*2 || x >= canvas.width-sq*2 || y < sq*2 || y >= canvas.height-sq*2;
-      if (onEdge) {
-        ctx.fillStyle = ((x/sq + y/sq) % 2 === 0) ? '#fff' : '#111';
-        ctx.fillRect(x, y, sq, sq);
-      }
-    }
+  const cols = Math.ceil(viewW / sq), rows = Math.ceil(viewH / sq);
+  const cell = (i, j) => {
+    g.fillStyle = ((i + j) % 2 === 0) ? '#fff' : '#111';
+    g.fillRect(i * sq, j * sq, sq, sq);
+  };
+  const edgeX = (i) => i < 2 || i * sq >= viewW - sq * 2;
+  const edgeY = (j) => j < 2 || j * sq >= viewH - sq * 2;
+  const edgeRows = [];
+  for (let j = 0; j < rows; j++) if (edgeY(j)) edgeRows.push(j);
+  for (let i = 0; i < cols; i++) {
+    if (edgeX(i)) for (let j = 0; j < rows; j++) cell(i, j);
+    else edgeRows.forEach(j => cell(i, j));
   }
-  ctx.restore();
 }
 
-function drawTrack() {
+function drawTrack(g) {
   // Grass fill inside oval using pattern
-  const pat = ctx.createPattern(grassTile, 'repeat');
-  ctx.save();
-  ctx.beginPath();
-  ctx.ellipse(cx, cy, rx - roadWidth / 2, ry - roadWidth / 2, 0, 0, 2 * Math.PI);
-  ctx.fillStyle = pat;
-  ctx.fill();
-  ctx.restore();
+  const pat = g.createPattern(grassTile, 'repeat');
+  g.save();
+  g.beginPath();
+  g.ellipse(cx, cy, rx - roadWidth / 2, ry - roadWidth / 2, 0, 0, 2 * Math.PI);
+  g.fillStyle = pat;
+  g.fill();
+  g.restore();
 
   // Road ring (thick ellipse stroke)
-  ctx.beginPath();
-  ctx.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
-  ctx.strokeStyle = '#2e2e2e';
-  ctx.lineWidth   = roadWidth;
-  ctx.stroke();
+  g.beginPath();
+  g.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#2e2e2e';
+  g.lineWidth   = roadWidth;
+  g.stroke();
 
   // Road edge (outer white line)
-  ctx.beginPath();
-  ctx.ellipse(cx, cy, rx + roadWidth / 2 - 2, ry + roadWidth / 2 - 2, 0, 0, 2 * Math.PI);
-  ctx.strokeStyle = '#ffffff';
-  ctx.lineWidth   = 3;
-  ctx.stroke();
+  g.beginPath();
+  g.ellipse(cx, cy, rx + roadWidth / 2 - 2, ry + roadWidth / 2 - 2, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffffff';
+  g.lineWidth   = 3;
+  g.stroke();
 
   // Road edge (inner white line)
-  ctx.beginPath();
-  ctx.ellipse(cx, cy, rx - roadWidth / 2 + 2, ry - roadWidth / 2 + 2, 0, 0, 2 * Math.PI);
-  ctx.strokeStyle = '#ffffff';
-  ctx.lineWidth   = 3;
-  ctx.stroke();
+  g.beginPath();
+  g.ellipse(cx, cy, rx - roadWidth / 2 + 2, ry - roadWidth / 2 + 2, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffffff';
+  g.lineWidth   = 3;
+  g.stroke();
 
   // Center dashed line
-  ctx.beginPath();
-  ctx.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
-  ctx.strokeStyle = '#ffff00';
-  ctx.lineWidth   = 2;
-  ctx.setLineDash([14, 18]);
-  ctx.stroke();
-  ctx.setLineDash([]);
+  g.beginPath();
+  g.ellipse(cx, cy, rx, ry, 0, 0, 2 * Math.PI);
+  g.strokeStyle = '#ffff00';
+  g.lineWidth   = 2;
+  g.setLineDash([14, 18]);
+  g.stroke();
+  g.setLineDash([]);
 }
 
-function drawStartFinish() {
+function drawStartFinish(g) {
   // Start/finish stripe at theta = 0 (right side)
   const theta = 0;
   const pos   = thetaToXY(theta);
@@ -522,8 +708,8 @@ function drawStartFinish() {
     const ox = pos.x + Math.cos(perp) * i * sq;
     const oy = pos.y + Math.sin(perp) * i * sq;
     for (let j = -2; j <= 2; j++) {
-      ctx.fillStyle = ((i + j) % 2 === 0) ? '#fff' : '#111';
-      ctx.fillRect(
+      g.fillStyle = ((i + j) % 2 === 0) ? '#fff' : '#111';
+      g.fillRect(
         ox + Math.cos(hdg) * j * sq,
         oy + Math.sin(hdg) * j * sq,
         sq, sq
@@ -532,34 +718,43 @@ function drawStartFinish() {
   }
 
   // "S/F" label
-  ctx.save();
-  ctx.font      = `bold ${Math.max(7, kartH * 0.8)}px 'Press Start 2P', monospace`;
-  ctx.fillStyle = '#f9a11b';
-  ctx.strokeStyle = '#000';
-  ctx.lineWidth   = 3;
-  ctx.textAlign   = 'center';
-  ctx.textBaseline = 'middle';
+  g.save();
+  g.font      = `bold ${Math.max(7, kartH * 0.8)}px 'Press Start 2P', monospace`;
+  g.fillStyle = '#f9a11b';
+  g.strokeStyle = '#000';
+  g.lineWidth   = 3;
+  g.textAlign   = 'center';
+  g.textBaseline = 'middle';
   const labelPos = thetaToXY(theta);
-  ctx.strokeText('S/F', labelPos.x, labelPos.y - ry * 0.18);
-  ctx.fillText('S/F', labelPos.x, labelPos.y - ry * 0.18);
-  ctx.restore();
+  g.strokeText('S/F', labelPos.x, labelPos.y - ry * 0.18);
+  g.fillText('S/F', labelPos.x, labelPos.y - ry * 0.18);
+  g.restore();
+}
+
+// Position and heading of every kart, computed once per frame
+function layoutKart(r) {
+  const theta = arcFracToTheta(r.arcPos);
+  r.x       = cx + rx * Math.cos(theta);
+  r.y       = cy + ry * Math.sin(theta);
+  r.heading = thetaToHeading(theta);
+  r.cos     = Math.cos(r.heading);
+  r.sin     = Math.sin(r.heading);
 }
 
 function drawKart(r, ts) {
-  const theta   = arcFracToTheta(r.arcPos);
-  const pos     = thetaToXY(theta);
-  const heading = thetaToHeading(theta);
   const W = kartW, H = kartH;
 
   ctx.save();
-  ctx.translate(pos.x, pos.y);
-  ctx.rotate(heading);
+  ctx.translate(r.x, r.y);
+  ctx.rotate(r.heading);
 
   // Shadow
-  ctx.fillStyle = 'rgba(0,0,0,0.35)';
-  ctx.beginPath();
-  ctx.ellipse(2, 3, W * 0.55, H * 0.35, 0, 0, 2 * Math.PI);
-  ctx.fill();
+  if (quality().shadows) {
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.beginPath();
+    ctx.ellipse(2, 3, W * 0.55, H * 0.35, 0, 0, 2 * Math.PI);
+    ctx.fill();
+  }
 
   // Body
   ctx.fillStyle = r.color;
@@ -585,7 +780,7 @@ function drawKart(r, ts) {
   });
 
   // Celebration sparkle aura
-  if (r.celebrating && performance.now() < r.celebEnd) {
+  if (quality().aura && r.celebrating && performance.now() < r.celebEnd) {
     ctx.globalAlpha = 0.5 + 0.3 * Math.sin(ts * 0.015);
     ctx.strokeStyle = '#f9a11b';
     ctx.lineWidth   = 2;
@@ -596,33 +791,180 @@ function drawKart(r, ts) {
   }
 
   ctx.restore();
+}
 
-  // Name label (always upright, above kart)
-  const firstName = r.name.split(' ')[0];
-  const fontSize  = Math.max(6, Math.min(10, kartW * 0.55));
-  ctx.save();
-  ctx.font        = `bold ${fontSize}px 'Press Start 2P', monospace`;
-  ctx.textAlign   = 'center';
-  ctx.textBaseline = 'bottom';
-  const labelY = pos.y - H * 0.9 - 4;
-
-  // Background pill
-  const tw = ctx.measureText(firstName).width;
-  ctx.fillStyle = 'rgba(0,0,0,0.65)';
-  ctx.beginPath();
-  if (ctx.roundRect) {
-    ctx.roundRect(pos.x - tw/2 - 3, labelY - fontSize - 1, tw + 6, fontSize + 4, 3);
-  } else {
-    ctx.rect(pos.x - tw/2 - 3, labelY - fontSize - 1, tw + 6, fontSize + 4);
+// ── Batched karts (large fields) ──────────────────────────────────────────
+// One path and fill per shared layer (shadows, windshields, wheels) instead
+// of a save/rotate/restore and five fills per kart. Bodies still take a fill
+// each: every kart has its own colour (kart_palette), which the participant
+// list matches.
+function kartPoint(r, px, py) {
+  return [r.x + px * r.cos - py * r.sin, r.y + px * r.sin + py * r.cos];
+}
+
+function pathRotatedRect(r, x, y, w, h) {
+  const p = [kartPoint(r, x, y), kartPoint(r, x + w, y), kartPoint(r, x + w, y + h), kartPoint(r, x, y + h)];
+  ctx.moveTo(p[0][0], p[0][1]);
+  for (let i = 1; i < 4; i++) ctx.lineTo(p[i][0], p[i][1]);
+  ctx.closePath();
+}
+
+function pathRotatedEllipse(r, ex, ey, erx, ery) {
+  const [x, y] = kartPoint(r, ex, ey);
+  ctx.moveTo(x + erx * r.cos, y + erx * r.sin);
+  ctx.ellipse(x, y, erx, ery, r.heading, 0, 2 * Math.PI);
+}
+
+function drawKartsBatched(ts) {
+  const W = kartW, H = kartH;
+  const q = quality();
+
+  if (q.shadows) {
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.beginPath();
+    drawOrder.forEach(r => pathRotatedEllipse(r, 2, 3, W * 0.55, H * 0.35));
+    ctx.fill();
   }
+
+  drawOrder.forEach(r => {
+    ctx.fillStyle = r.color;
+    ctx.beginPath();
+    pathRotatedRect(r, -W/2, -H/2, W, H);
+    ctx.fill();
+  });
+
+  ctx.fillStyle = 'rgba(180,230,255,0.85)';
+  ctx.beginPath();
+  drawOrder.forEach(r => pathRotatedRect(r, -W * 0.15, -H * 0.38, W * 0.3, H * 0.55));
   ctx.fill();
 
-  ctx.strokeStyle = '#000';
-  ctx.lineWidth   = 2.5;
-  ctx.strokeText(firstName, pos.x, labelY);
-  ctx.fillStyle   = '#fff';
-  ctx.fillText(firstName,   pos.x, labelY);
-  ctx.restore();
+  ctx.fillStyle = '#111';
+  ctx.beginPath();
+  const wx = W * 0.36, wy = H * 0.42;
+  drawOrder.forEach(r => {
+    pathRotatedEllipse(r, -wx, -wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r,  wx, -wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r, -wx,  wy, W * 0.12, H * 0.18);
+    pathRotatedEllipse(r,  wx,  wy, W * 0.12, H * 0.18);
+  });
+  ctx.fill();
+
+  if (!q.aura) return;
+  const now = performance.now();
+  drawOrder.forEach(r => {
+    if (!r.celebrating || now >= r.celebEnd) return;
+    ctx.globalAlpha = 0.5 + 0.3 * Math.sin(ts * 0.015);
+    ctx.strokeStyle = '#f9a11b';
+    ctx.lineWidth   = 2;
+    ctx.beginPath();
+    ctx.ellipse(r.x, r.y, W * 0.75, H * 0.75, r.heading + ts * 0.003, 0, 2 * Math.PI);
+    ctx.stroke();
+    ctx.globalAlpha = 1;
+  });
+}
+
+// ── Name labels ───────────────────────────────────────────────────────────
+function labelFontSize() {
+  return Math.max(6, Math.min(10, kartW * 0.55));
+}
+
+function labelSprite(label, fontSize) {
+  let sprite = labelSprites.get(label);
+  if (sprite) return sprite;
+  const font = `bold ${fontSize}px 'Press Start 2P', monospace`;
+  measureCtx.font = font;
+  const tw = measureCtx.measureText(label).width;
+  // Pill plus a 1px margin; the text baseline sits 3px above the pill bottom
+  sprite = makeSprite(tw + 8, fontSize + 6, g => {
+    g.fillStyle = 'rgba(0,0,0,0.65)';
+    g.beginPath();
+    if (g.roundRect) {
+      g.roundRect(1, 1, tw + 6, fontSize + 4, 3);
+    } else {
+      g.rect(1, 1, tw + 6, fontSize + 4);
+    }
+    g.fill();
+
+    g.font         = font;
+    g.textAlign    = 'center';
+    g.textBaseline = 'bottom';
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2.5;
+    g.strokeText(label, tw / 2 + 4, fontSize + 2);
+    g.fillStyle    = '#fff';
+    g.fillText(label,   tw / 2 + 4, fontSize + 2);
+  });
+  labelSprites.set(label, sprite);
+  return sprite;
+}
+
+function drawKartLabel(r, sprite, fontSize) {
+  // Name label (always upright, above kart)
+  const labelY = r.y - kartH * 0.9 - 4;
+  ctx.drawImage(sprite, r.x - sprite.w / 2, labelY - fontSize - 2, sprite.w, sprite.h);
+}
+
+// Level of detail: leaders first, skip any label whose pill would overlap
+// one already placed (uniform grid of LABEL_CELL px buckets).
+function drawLabelsCulled() {
+  const fontSize = labelFontSize();
+  const grid = new Map();
+  const h = fontSize + 4;
+  for (let i = drawOrder.length - 1; i >= 0; i--) {
+    const r = drawOrder[i];
+    const sprite = labelSprite(r.label, fontSize);
+    const x0 = r.x - sprite.w / 2 + 1, x1 = x0 + sprite.w - 2;
+    const y0 = r.y - kartH * 0.9 - 4 - fontSize - 1, y1 = y0 + h;
+    const gx0 = Math.floor(x0 / LABEL_CELL), gx1 = Math.floor(x1 / LABEL_CELL);
+    const gy0 = Math.floor(y0 / LABEL_CELL), gy1 = Math.floor(y1 / LABEL_CELL);
+    let hit = false;
+    for (let gx = gx0; gx <= gx1 && !hit; gx++) {
+      for (let gy = gy0; gy <= gy1 && !hit; gy++) {
+        const bucket = grid.get(gx * 65536 + gy);
+        if (bucket) hit = bucket.some(b => x0 < b[2] && x1 > b[0] && y0 < b[3] && y1 > b[1]);
+      }
+    }
+    if (hit) continue;
+    const box = [x0, y0, x1, y1];
+    for (let gx = gx0; gx <= gx1; gx++) {
+      for (let gy = gy0; gy <= gy1; gy++) {
+        const key = gx * 65536 + gy;
+        if (!grid.has(key)) grid.set(key, []);
+        grid.get(key).push(box);
+      }
+    }
+    drawKartLabel(r, sprite, fontSize);
+  }
+}
+
+function drawKarts(ts) {
+  sortDrawOrder();
+  drawOrder.forEach(layoutKart);
+  if (drawOrder.length > LOD_THRESHOLD) {
+    drawKartsBatched(ts);
+    drawLabelsCulled();
+    return;
+  }
+  // Small field: full detail, every label, leader on top
+  const fontSize = labelFontSize();
+  drawOrder.forEach(r => {
+    drawKart(r, ts);
+    drawKartLabel(r, labelSprite(r.label, fontSize), fontSize);
+  });
+}
+
+// Karts drawn in arcPos order (leader on top). Positions change a little per
+// frame, so an insertion sort over last frame's order is ~O(n).
+function sortDrawOrder() {
+  for (let i = 1; i < drawOrder.length; i++) {
+    const r = drawOrder[i];
+    let j = i - 1;
+    while (j >= 0 && drawOrder[j].arcPos > r.arcPos) {
+      drawOrder[j + 1] = drawOrder[j];
+      j--;
+    }
+    drawOrder[j + 1] = r;
+  }
 }
 
 function drawCelebration(r, ts) {
@@ -630,9 +972,7 @@ function drawCelebration(r, ts) {
     r.celebrating = false;
     return;
   }
-  const theta = arcFracToTheta(r.arcPos);
-  const pos   = thetaToXY(theta);
-  const age   = performance.now() - (r.celebEnd - 3500);
+  const pos   = { x: r.x, y: r.y };
   const rays  = 8;
   const len   = 20 + 8 * Math.sin(ts * 0.01);
 
@@ -667,73 +1007,96 @@ function drawCelebration(r, ts) {
   }
 }
 
+function lapBadgeSprite(lap) {
+  if (lapBadge && lapBadge.lap === lap) return lapBadge;
+  const font = `bold ${Math.max(8, kartW * 0.7)}px 'Press Start 2P', monospace`;
+  const lapTxt = `LAP ${lap} / ${TARGET_LAPS}`;
+  const boxH = Math.max(14, kartW * 0.8) + 6;
+  measureCtx.font = font;
+  const w = Math.max(140, measureCtx.measureText(lapTxt).width + 4);
+  lapBadge = makeSprite(w, boxH, g => {
+    g.font = font;
+    g.textAlign    = 'center';
+    g.textBaseline = 'top';
+    g.fillStyle    = 'rgba(0,0,0,0.55)';
+    g.fillRect(w / 2 - 70, 0, 140, boxH);
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2;
+    g.strokeText(lapTxt, w / 2, 4);
+    g.fillStyle    = '#f9a11b';
+    g.fillText(lapTxt, w / 2, 4);
+  });
+  lapBadge.lap = lap;
+  return lapBadge;
+}
+
+// Finisher rows are measured once each; the panel bitmap is repainted only
+// when another row becomes visible, so a long race stops repainting once
+// the panel reaches the bottom of the canvas.
+function finisherPanelSprite(fontSize, lineH, padY) {
+  const medals = ['🥇','🥈','🥉'];
+  const font   = `bold ${fontSize}px 'Press Start 2P', monospace`;
+  const rows   = Math.min(finishers.length, Math.max(1, Math.floor((viewH - padY * 3) / lineH)));
+  if (finisherPanel && finisherPanel.rows === rows) return finisherPanel;
+  measureCtx.font = font;
+  for (let i = finisherRows.length; i < rows; i++) {
+    const r = finishers[i];
+    const prefix = r.finishOrder <= 3 ? medals[r.finishOrder-1] + ' ' : `${r.finishOrder}. `;
+    const text = prefix + r.label;
+    const w = measureCtx.measureText(text).width;
+    finisherRows.push({ text, color: r.color, w });
+    finisherRowsW = Math.max(finisherRowsW, w);
+  }
+  const panelW = finisherRowsW + 10 * 2 + 4;
+  const panelH = rows * lineH + padY * 2;
+  finisherPanel = makeSprite(panelW + 2, panelH + 2, g => {
+    g.fillStyle = 'rgba(0,0,0,0.62)';
+    g.beginPath();
+    if (g.roundRect) g.roundRect(1, 1, panelW, panelH, 4);
+    else g.rect(1, 1, panelW, panelH);
+    g.fill();
+    g.font = font;
+    g.textAlign    = 'left';
+    g.textBaseline = 'top';
+    g.strokeStyle  = '#000';
+    g.lineWidth    = 2.5;
+    for (let i = 0; i < rows; i++) {
+      const row = finisherRows[i];
+      const y   = 1 + padY * 0.5 + i * lineH;
+      g.strokeText(row.text, 7, y);
+      g.fillStyle = row.color;
+      g.fillText(row.text, 7, y);
+    }
+  });
+  finisherPanel.rows = rows;
+  return finisherPanel;
+}
+
 function drawHUD() {
   // Lap counter - top center
-  ctx.save();
-  ctx.font = `bold ${Math.max(8, kartW * 0.7)}px 'Press Start 2P', monospace`;
-  ctx.textAlign   = 'center';
-  ctx.textBaseline = 'top';
-  ctx.fillStyle   = 'rgba(0,0,0,0.55)';
-  ctx.fillRect(canvas.width/2 - 70, 6, 140, Math.max(14, kartW * 0.8) + 6);
-  ctx.strokeStyle = '#000';
-  ctx.lineWidth   = 2;
-  const lapTxt = `LAP ${Math.min(TARGET_LAPS, Math.max(1, Math.floor(racerState[0]?.arcPos ?? 0) + 1))} / ${TARGET_LAPS}`;
-  ctx.strokeText(lapTxt, canvas.width / 2, 10);
-  ctx.fillStyle = '#f9a11b';
-  ctx.fillText(lapTxt, canvas.width / 2, 10);
-  ctx.restore();
+  const lap = Math.min(TARGET_LAPS, Math.max(1, Math.floor(racerState[0]?.arcPos ?? 0) + 1));
+  const badge = lapBadgeSprite(lap);
+  ctx.drawImage(badge, viewW / 2 - badge.w / 2, 6, badge.w, badge.h);
 
   // Finishers list (top-left) — grows as players cross the line
-  const finishers = [...racerState]
-    .filter(r => r.finishOrder !== null)
-    .sort((a, b) => a.finishOrder - b.finishOrder);
   if (finishers.length > 0) {
     const fontSize = Math.max(6, kartW * 0.52);
-    const lineH    = fontSize + 5;
-    const padX     = 10, padY = 6;
-    const medals   = ['🥇','🥈','🥉'];
-    ctx.save();
-    ctx.font = `bold ${fontSize}px 'Press Start 2P', monospace`;
-    ctx.textAlign    = 'left';
-    ctx.textBaseline = 'top';
-    // Background panel
-    const panelW = finishers.reduce((mx, r) => {
-      const lbl = `${r.finishOrder <= 3 ? medals[r.finishOrder-1]+' ' : r.finishOrder+'. '}${r.name.split(' ')[0]}`;
-      return Math.max(mx, ctx.measureText(lbl).width);
-    }, 0) + padX * 2 + 4;
-    const panelH = finishers.length * lineH + padY * 2;
-    ctx.fillStyle = 'rgba(0,0,0,0.62)';
-    ctx.beginPath();
-    if (ctx.roundRect) ctx.roundRect(padX, padY, panelW, panelH, 4);
-    else ctx.rect(padX, padY, panelW, panelH);
-    ctx.fill();
-    // Rows
-    finishers.forEach((r, i) => {
-      const prefix = r.finishOrder <= 3 ? medals[r.finishOrder-1] + ' ' : `${r.finishOrder}. `;
-      const label  = prefix + r.name.split(' ')[0];
-      const y      = padY + padY * 0.5 + i * lineH;
-      ctx.strokeStyle = '#000'; ctx.lineWidth = 2.5;
-      ctx.strokeText(label, padX + 6, y);
-      ctx.fillStyle = r.color;
-      ctx.fillText(label, padX + 6, y);
-    });
-    ctx.restore();
+    const padX = 10, padY = 6;
+    const panel = finisherPanelSprite(fontSize, fontSize + 5, padY);
+    ctx.drawImage(panel, padX - 1, padY - 1, panel.w, panel.h);
   }
 }
 
 function draw(ts) {
-  ctx.clearRect(0, 0, canvas.width, canvas.height);
-  drawBackground();
-  drawTrack();
-  drawStartFinish();
+  if (!staticLayer) staticLayer = buildStaticLayer();
+  ctx.clearRect(0, 0, viewW, viewH);
+  ctx.drawImage(staticLayer, 0, 0, viewW, viewH);
   drawHUD();
 
-  // Draw karts in reverse arcPos order (leader on top)
-  const order = [...racerState].sort((a, b) => a.arcPos - b.arcPos);
-  order.forEach(r => drawKart(r, ts));
+  drawKarts(ts);
 
   // Celebrations on top
-  racerState.forEach(r => {
+  finishers.forEach(r => {
     if (r.celebrating) drawCelebration(r, ts);
   });
 }
@@ -757,33 +1120,408 @@ function showOverlay() {
 }
 
 // ── Game loop ─────────────────────────────────────────────────────────────
+// Frames are only scheduled while something moves: the race itself and the
+// finish celebrations. Once settled the last frame stays on the canvas and
+// nothing runs until a restart, week switch, resize or the page coming back
+// into view calls requestFrame(). Hidden tabs get no frames at all; while
+// the canvas is scrolled off-screen the race keeps time on a slow timer
+// without drawing.
+const OFFSCREEN_FPS = 4;
 let lastTs = null;
+let rafId = 0;
+let throttleTimer = 0;
+let offscreen = false;
+
+function isAnimating() {
+  if (!TIMELINE || !TIMELINE.count) return false;
+  if (!raceOver) return true;
+  const now = performance.now();
+  return finishers.some(r => r.celebrating && now < r.celebEnd);
+}
+
+function requestFrame() {
+  if (rafId || throttleTimer || document.hidden || videoEl) return;
+  if (offscreen) {
+    throttleTimer = setTimeout(() => {
+      throttleTimer = 0;
+      tick(performance.now());
+    }, 1000 / OFFSCREEN_FPS);
+  } else {
+    rafId = requestAnimationFrame(tick);
+  }
+}
+
+function cancelFrame() {
+  cancelAnimationFrame(rafId);
+  clearTimeout(throttleTimer);
+  rafId = throttleTimer = 0;
+  lastTs = null;  // don't count the pause as race time
+}
+
 function tick(ts) {
+  rafId = 0;
   if (!lastTs) lastTs = ts;
-  const dt = Math.min((ts - lastTs) / 1000, 0.05);
+  const maxDt = offscreen ? 1 / OFFSCREEN_FPS : 0.05;
+  const dt = Math.min((ts - lastTs) / 1000, maxDt);
   lastTs = ts;
 
-  updateVariances(ts);
   updateRacers(dt);
-  draw(ts);
+  if (!offscreen) {
+    const start = performance.now();
+    draw(ts);
+    trackDrawTime(performance.now() - start);
+  }
 
-  requestAnimationFrame(tick);
+  if (isAnimating()) requestFrame();
+  else lastTs = null;
 }
-requestAnimationFrame(tick);
 
-// ── Controls ───────────────────────────────────────────────────────────────
-document.getElementById('btn-restart').addEventListener('click', () => {
+document.addEventListener('visibilitychange', () => {
+  if (document.hidden) cancelFrame();
+  else requestFrame();
+});
+
+if ('IntersectionObserver' in window) {
+  new IntersectionObserver(entries => {
+    const wasOffscreen = offscreen;
+    offscreen = !entries[entries.length - 1].isIntersecting;
+    if (offscreen === wasOffscreen) return;
+    // Switch between rAF and the slow timer; coming back always redraws
+    const pending = rafId || throttleTimer;
+    cancelFrame();
+    if (pending || !offscreen) requestFrame();
+  }).observe(canvas);
+}
+
+// ── Participants list ─────────────────────────────────────────────────────
+function renderParticipants() {
+  const list = document.getElementById('participants');
+  list.replaceChildren(...RACERS.map((r, i) => {
+    const row = document.createElement('div');
+    row.className = 'p-row';
+    row.style.setProperty('--kc', r.color);
+    [['p-rank', `#${r.rank}`], ['p-name', r.name], ['p-plw', `PLW ${r.plw}`]].forEach(([cls, text]) => {
+      const span = document.createElement('span');
+      span.className = cls;
+      span.textContent = text;
+      row.appendChild(span);
+    });
+    return row;
+  }));
+}
+
+// ── Video fallback ────────────────────────────────────────────────────────
+// race.json may carry a pre-rendered video of the same race (--export-video).
+// Low-power clients play it instead of the canvas: few cores or little
+// memory up front, or frame time still over budget at the cheapest quality
+// level. ?video forces the video and ?live the canvas. Week files have no
+// video and always race live.
+const VIDEO_PARAMS = new URLSearchParams(location.search);
+let lowPower = (navigator.hardwareConcurrency || 8) <= 2 || (navigator.deviceMemory || 8) <= 1;
+let currentRace = null;
+let videoEl = null;
+
+function wantsVideo(data) {
+  if (!data.video || VIDEO_PARAMS.has('live')) return false;
+  return lowPower || VIDEO_PARAMS.has('video');
+}
+
+function showVideo(video) {
+  cancelFrame();
+  hideVideo();
+  const url = name => new URL(name, DATA_URL).href;
+  if (video.mp4) {
+    videoEl = document.createElement('video');
+    Object.assign(videoEl, { muted: true, defaultMuted: true, autoplay: true, loop: true, playsInline: true,
+                             poster: url(video.poster), src: url(video.mp4) });
+  } else {
+    videoEl = document.createElement('img');
+    videoEl.src = url(video.webp);
+    videoEl.alt = 'Weekly Sprint race';
+  }
+  videoEl.className = 'race-video';
+  videoEl.width  = video.width;
+  videoEl.height = video.height;
+  canvas.hidden = true;
+  canvas.after(videoEl);
+}
+
+function hideVideo() {
+  if (!videoEl) return;
+  videoEl.remove();
+  videoEl = null;
+  canvas.hidden = false;
+}
+
+function restartRace() {
   initRacerState();
   lastTs = null;
-});
-document.getElementById('btn-overlay-restart').addEventListener('click', () => {
+  if (videoEl && videoEl.play) {
+    videoEl.currentTime = 0;
+    videoEl.play();
+  }
+  requestFrame();
+}
+
+// ── Race loading ──────────────────────────────────────────────────────────
+function loadRace(data) {
+  currentRace = data;
+  if (wantsVideo(data)) showVideo(data.video);
+  else hideVideo();
+  RACERS   = data.racers;
+  TIMELINE = decodeTimeline(data.race, RACERS.length);
+  document.getElementById('generated-date').textContent = data.generated;
+  renderParticipants();
   initRacerState();
   lastTs = null;
-});
-</script>
+  requestFrame();
+}
+
+// ── Season mode: week selector, week files fetched on demand ──────────────
+const weekCache = new Map();
+
+function fetchJSON(url, opts) {
+  return fetch(url, opts).then(res => {
+    if (!res.ok) throw new Error(`${res.status} ${url}`);
+    return res.json();
+  });
+}
+
+function setupSeason(current, indexPath) {
+  const select  = document.getElementById('week-select');
+  const indexUrl = new URL(indexPath, DATA_URL);
+  fetchJSON(indexUrl, { cache: 'no-cache' }).then(weeks => {
+    const opts = [['', 'This week']].concat(weeks.map(d => [d, `Week of ${d}`]));
+    select.replaceChildren(...opts.map(([value, text]) => {
+      const o = document.createElement('option');
+      o.value = value;
+      o.textContent = text;
+      return o;
+    }));
+    select.hidden = false;
+  });
+  select.addEventListener('change', () => {
+    const date = select.value;
+    if (!date) { loadRace(current); return; }
+    if (!weekCache.has(date)) {
+      weekCache.set(date, fetchJSON(new URL(`${date}.json`, indexUrl)));
+    }
+    weekCache.get(date).then(data => {
+      if (select.value === date) loadRace(data);
+    }).catch(() => weekCache.delete(date));
+  });
+}
+
+// ── Startup ───────────────────────────────────────────────────────────────
+// Canvas text doesn't trigger a font load, and labels measured in the
+// fallback font would jump, so the first frame waits for the race font
+// (capped, in case it never arrives)
+const FONT_WAIT_MS = 3000;
+function raceFontReady() {
+  if (!document.fonts) return Promise.resolve();
+  return Promise.race([
+    document.fonts.load("bold 12px 'Press Start 2P'").catch(() => {}),
+    new Promise(resolve => setTimeout(resolve, FONT_WAIT_MS)),
+  ]);
+}
+
+// A font arriving after the wait would otherwise never reach the bitmaps
+// already rendered with the fallback
+if (document.fonts) {
+  document.fonts.addEventListener('loadingdone', () => {
+    staticLayer = null;
+    clearSprites();
+    requestFrame();
+  });
+}
+
+Promise.all([fetchJSON(DATA_URL, { cache: 'no-cache' }), raceFontReady()])
+  .then(([data]) => {
+    loadRace(data);
+    if (data.season) setupSeason(data, data.season);
+  });
+
+// ── Controls ───────────────────────────────────────────────────────────────
+document.getElementById('btn-restart').addEventListener('click', restartRace);
+document.getElementById('btn-overlay-restart').addEventListener('click', restartRace);
+"""
+
+HTML_SHELL = string.Template(r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>PS11 Chess Club: The Weekly Sprint</title>
+$font_head
+<link href="$css_href" rel="stylesheet">
+<script src="$js_src" defer></script>
+</head>
+<body>
+
+<div id="tab-nav">
+  <a href="$base_path/" id="tab-pokechess">PokeChess</a>
+  <span id="tab-race">🏎 Weekly Sprint</span>
+</div>
+<div id="race-header">
+  <h1>PS11 Chess Club: The Weekly Sprint</h1>
+  <div class="subtitle">Data as of <span id="generated-date"></span> &nbsp;|&nbsp; PLW = Points Last Week</div>
+  <div class="controls">
+    <button class="btn btn-green" id="btn-restart">&#9654; Restart Race</button>
+    <select class="btn btn-week" id="week-select" aria-label="Race week" hidden></select>
+  </div>
+</div>
+
+<div id="canvas-wrapper">
+  <canvas id="track"></canvas>
+</div>
+
+
+<div id="overlay">
+  <h2>&#127942; RACE COMPLETE! &#127942;</h2>
+  <div id="podium"></div>
+  <button class="btn btn-green" id="btn-overlay-restart" style="margin-top:10px">&#9654; Race Again</button>
+</div>
+
+<div id="participants"></div>
+
 </body>
 </html>
-"""
+""")
+
+
+def build_race_data(racers: list[dict], generated: str, seed: int | None = None) -> dict:
+    """race.json payload: racers with kart colours plus the simulated timeline."""
+    racers = [dict(r, color=c) for r, c in zip(racers, kart_palette(len(racers)))]
+    return {"generated": generated, "racers": racers, "race": simulate_race(racers, seed)}
+
+
+def write_json(path: pathlib.Path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+# ── Season mode ───────────────────────────────────────────────────────────────
+# Each weekly snapshot in public/collections/ becomes its own compact
+# weeks/<date>.json (same shape as race.json). The page only fetches
+# weeks/index.json up front and loads a week when it is selected, so the
+# initial page weight doesn't grow with the season.
+WEEKS_DIR = "weeks"
+
+
+def racers_from_snapshot(snapshot: dict, top: int = TOP_N) -> list[dict]:
+    """Top racers by PLW from a saved collection ({date, players: [...]})."""
+    rows = top_by_plw(((p["name"], int(p.get("plw", 0))) for p in snapshot.get("players", [])), top)
+    return [{"name": name, "plw": plw, "rank": i + 1} for i, (name, plw) in enumerate(rows)]
+
+
+def write_season(out_dir: pathlib.Path, collections_dir: pathlib.Path, top: int = TOP_N,
+                 rebuild: bool = False) -> list[str]:
+    """Write weeks/<date>.json for every snapshot and weeks/index.json.
+
+    Week files record a hash of their source snapshot and are only rebuilt
+    when it changes (or with rebuild=True).
+    """
+    weeks_dir = out_dir / WEEKS_DIR
+    weeks_dir.mkdir(parents=True, exist_ok=True)
+    index_path = collections_dir / "index.json"
+    dates = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else []
+
+    built = 0
+    for date in dates:
+        src = collections_dir / f"{date}.json"
+        dst = weeks_dir / f"{date}.json"
+        if not src.exists():
+            continue
+        raw = src.read_bytes()
+        source = hashlib.sha256(raw).hexdigest()[:12]
+        if not rebuild and dst.exists() and json.loads(dst.read_text(encoding="utf-8")).get("source") == source:
+            continue
+        data = build_race_data(racers_from_snapshot(json.loads(raw), top), date)
+        data["source"] = source
+        write_json(dst, data)
+        built += 1
+
+    weeks = sorted((d for d in dates if (weeks_dir / f"{d}.json").exists()), reverse=True)
+    write_json(weeks_dir / "index.json", weeks)
+    print(f"  Season: {len(weeks)} weeks ({built} rebuilt) → {weeks_dir}")
+    return weeks
+
+
+# ── Font ──────────────────────────────────────────────────────────────────────
+# By default the page pulls Press Start 2P from Google Fonts. With --font the
+# given font file is subset to the characters the page can draw (HUD/ASCII
+# text plus every racer name) and inlined as a WOFF2 data: URL, so the page
+# makes no external requests.
+FONT_FAMILY = "Press Start 2P"
+GOOGLE_FONTS_LINK = ('<link href="https://fonts.googleapis.com/css2?family=Press+Start+2P'
+                     '&display=swap" rel="stylesheet">')
+HUD_CHARS = "".join(chr(c) for c in range(0x20, 0x7F)) + "…—"
+
+
+def subset_font_face(font_path: str, names) -> str:
+    """<style> with an inline @font-face holding only the glyphs for HUD_CHARS + names."""
+    text = HUD_CHARS + "".join(sorted(set("".join(names))))
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    options.hinting = False  # pixel font: nothing for hinting to do
+    font = font_subset.load_font(font_path, options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    font_subset.save_font(font, buf, options)
+    woff2 = buf.getvalue()
+    print(f"  Font: {pathlib.Path(font_path).name} subset to {len(font.getGlyphOrder())} glyphs, "
+          f"{len(woff2) / 1024:.1f} KB WOFF2 inlined")
+    b64 = base64.b64encode(woff2).decode("ascii")
+    return (f"<style>@font-face{{font-family:'{FONT_FAMILY}';font-style:normal;font-weight:400;"
+            f"font-display:block;src:url(data:font/woff2;base64,{b64}) format('woff2')}}</style>")
+
+
+def season_names(out_dir: pathlib.Path, weeks: list[str]) -> set[str]:
+    """Racer names across all season week files (their labels use the same font)."""
+    names = set()
+    for date in weeks:
+        data = json.loads((out_dir / WEEKS_DIR / f"{date}.json").read_text(encoding="utf-8"))
+        names.update(r["name"] for r in data["racers"])
+    return names
+
+
+def previous_assets(out: pathlib.Path) -> set[str]:
+    """race.<hash>.css/js names the current page links; kept one more round
+    for visitors still holding that page."""
+    if not out.exists():
+        return set()
+    return set(re.findall(rf"race\.[0-9a-f]{{{HASH_LEN}}}\.(?:css|js)", out.read_text(encoding="utf-8")))
+
+
+def write_race_page(out: pathlib.Path, racers: list[dict], generated: str, base_path: str,
+                    seed: int | None = None, season: bool = False, font_head: str = GOOGLE_FONTS_LINK,
+                    video: dict | None = None):
+    """Write the HTML shell, hashed CSS/JS and race.json into out's directory.
+
+    With `video` (race_video.export_video keyword arguments) the race is also
+    pre-rendered and race.json points the page at it.
+    """
+    out_dir = out.parent
+    keep = previous_assets(out)
+    css_name = write_hashed(out_dir, "race", "css", RACE_CSS, keep)
+    js_name  = write_hashed(out_dir, "race", "js", RACE_JS, keep)
+
+    with phase("simulate"):
+        data = build_race_data(racers, generated, seed)
+    print(f"  Simulated race (seed {data['race']['seed']}): "
+          + ", ".join(data["racers"][i]["name"] for i in data["race"]["finish"][:3]) + " …")
+    if season:
+        data["season"] = f"{WEEKS_DIR}/index.json"
+    if video is not None:
+        with phase("video"):
+            data["video"] = race_video.export_video(out_dir, data, **video)
+    write_json(out_dir / "race.json", data)
+    out.write_text(
+        HTML_SHELL.substitute(base_path=base_path, css_href=css_name, js_src=js_name,
+                              font_head=font_head),
+        encoding="utf-8",
+    )
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -796,36 +1534,73 @@ def main():
                         help="Site base path for tab nav link back to PokeChess")
     parser.add_argument("--no-open", action="store_true",
                         help="Don't auto-open in browser")
+    parser.add_argument("--parser", choices=["stream", "pandas"], default="stream",
+                        help="Table extraction backend (pandas is optional)")
+    parser.add_argument("--html", default=None,
+                        help="Read racers from saved roster HTML instead of scraping")
+    parser.add_argument("--url", default=None,
+                        help="Scrape only this roster URL (e.g. a scripts/roster_fixtures.py server)")
+    parser.add_argument("--top", type=int, default=TOP_N,
+                        help="Number of racers by PLW (0 = full roster)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Race simulation seed (default: derived from the racer data)")
+    parser.add_argument("--season", action="store_true",
+                        help="Also build per-week races from saved collections and a week selector")
+    parser.add_argument("--collections", default=str(COLLECTIONS_DIR),
+                        help="Weekly collections directory for --season")
+    parser.add_argument("--font", default=None,
+                        help="Local Press Start 2P font file to subset and inline (needs fonttools, brotli)")
+    parser.add_argument("--rebuild-season", action="store_true",
+                        help="Regenerate every week file, not just new or changed ones")
+    parser.add_argument("--export-video", action="store_true",
+                        help="Also pre-render the race to race.<hash>.mp4 (.webp without ffmpeg) for "
+                             "clients that can't run the canvas (needs Pillow). CI renders it at "
+                             "deploy time with scripts/race_video.py instead")
+    parser.add_argument("--video-width", type=int, default=480,
+                        help="Width of the exported video in px")
+    parser.add_argument("--video-fps", type=int, default=10,
+                        help="Frame rate of the exported video")
+    parser.add_argument("--video-speed", type=float, default=2.0,
+                        help="Minimum playback speed of the exported video relative to the live race")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
+    if args.font and font_subset is None:
+        print("ERROR: --font requires fontTools (pip install fonttools brotli)")
+        sys.exit(1)
+    if args.export_video and race_video is None:
+        print("ERROR: --export-video requires Pillow (pip install pillow)")
+        sys.exit(1)
+
     out = pathlib.Path(args.output)
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    racers = scrape_racers()
-
-    generated_date = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    kart_colors = [
-        '#e6001a','#007dc5','#00a651','#f9a11b','#9b59b6',
-        '#e67e22','#1abc9c','#e91e8c','#3498db','#c0392b',
-        '#27ae60','#f1c40f','#8e44ad','#16a085','#d35400',
-        '#2c3e50','#a29bfe','#fd79a8','#55efc4','#fdcb6e',
-    ]
-    participants_html = "\n".join(
-        f'<div class="p-row" style="--kc:{kart_colors[i % len(kart_colors)]}">'
-        f'<span class="p-rank">#{r["rank"]}</span>'
-        f'<span class="p-name">{r["name"]}</span>'
-        f'<span class="p-plw">PLW {r["plw"]}</span>'
-        f'</div>'
-        for i, r in enumerate(racers)
-    )
-
-    html = HTML_TEMPLATE.replace("__RACERS_DATA__", json.dumps(racers, ensure_ascii=False))
-    html = html.replace("__PARTICIPANTS_HTML__", participants_html)
-    html = html.replace("__GENERATED_DATE__", generated_date)
-    html = html.replace("__BASE_PATH__", args.base_path)
-
-    out.write_text(html, encoding="utf-8")
+    with profiled(args, out):
+        if args.html:
+            with phase("read html"):
+                racers = racers_from_html(args.html, args.parser, args.top)
+        else:
+            sources = [(args.url, *SOURCES[0][1:])] if args.url else SOURCES
+            with phase("scrape"):
+                racers = scrape_racers(args.parser, args.top, sources)
+
+        generated_date = datetime.now().strftime("%Y-%m-%d %H:%M")
+        weeks = []
+        if args.season:
+            with phase("season"):
+                weeks = write_season(out.parent, pathlib.Path(args.collections), args.top, args.rebuild_season)
+        font_head = GOOGLE_FONTS_LINK
+        if args.font:
+            with phase("font"):
+                names = {r["name"] for r in racers} | season_names(out.parent, weeks)
+                font_head = subset_font_face(args.font, names)
+        video = None
+        if args.export_video:
+            video = dict(width=args.video_width, fps=args.video_fps, speed=args.video_speed,
+                         font_path=args.font)
+        with phase("race page"):
+            write_race_page(out, racers, generated_date, args.base_path, args.seed, args.season,
+                            font_head, video)
     print(f"\nSaved → {out}")
     if not args.no_open:
         subprocess.Popen(["open", str(out)])
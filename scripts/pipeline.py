@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Make-style incremental runner for the PokeChess data pipeline.
+
+Each stage declares the files it reads and writes. A stage is skipped when
+its outputs exist and the fingerprint of its command and inputs matches the
+previous successful run (stored in .pipeline/state.json). Stages whose
+inputs are produced by no pending stage run in parallel.
+
+    pokemon-data   generate-pokemon-data.py    → pokemon-data.json       (on request)
+    roster         scraper.py --fetch-only     → .pipeline/roster.html   (always runs)
+    players        scraper.py --html           → public/players.json, public/groups/
+    race           mario_kart_leaderboard.py   → public/race/
+    snapshot       save_collection.py          → public/collections/     (weekly, on request)
+
+With an unchanged roster only the fetch runs: roster.html comes back
+byte-identical, so players and race are skipped. pokemon-data.json is
+committed and only changes with new Pokemon, so its PokeAPI crawl runs
+only when asked for.
+
+The daily workflow (scrape.yml) runs `players race` through here, so one
+live fetch feeds both, and keeps .pipeline/state.json between runs with
+actions/cache; without it every run would start with no state and rebuild
+every stage. The roster stage exits non-zero on a fetch error or an empty
+harvest, so the stages reading roster.html are skipped. A race font dropped at .pipeline/PressStart2P.ttf is
+subset into the race page (--font).
+
+Usage:
+    python scripts/pipeline.py                 # daily stages
+    python scripts/pipeline.py snapshot        # a stage plus whatever it needs
+    python scripts/pipeline.py --force race    # rerun even if up to date
+    python scripts/pipeline.py --profile-dir profile players
+"""
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+STATE_DIR = REPO_ROOT / ".pipeline"
+STATE_PATH = STATE_DIR / "state.json"
+ROSTER_HTML = ".pipeline/roster.html"
+RACE_FONT = ".pipeline/PressStart2P.ttf"
+PY = sys.executable
+
+
+class Stage:
+    """A command with declared inputs/outputs (paths relative to the repo root).
+
+    inputs lists every module the command imports from the repo, so editing
+    any of them invalidates the stage.
+    """
+
+    def __init__(self, name, cmd, inputs=(), outputs=(), always=False, default=True,
+                 profiled=False):
+        self.name = name
+        self.cmd = list(cmd)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.always = always      # input lives outside the repo (the live roster)
+        self.default = default    # part of a plain `pipeline.py` run
+        self.profiled = profiled  # takes --profile/--profile-dir (not part of the fingerprint)
+
+    def __repr__(self):
+        return f"Stage({self.name})"
+
+
+STAGES = [
+    Stage("pokemon-data",
+          [PY, "generate-pokemon-data.py"],
+          inputs=["generate-pokemon-data.py"],
+          outputs=["pokemon-data.json"],
+          default=False),
+    Stage("roster",
+          [PY, "scraper.py", "--fetch-only", "--save-html", ROSTER_HTML],
+          inputs=["scraper.py", "scripts/lean_browser.py", "scripts/roster_harvest.py"],
+          outputs=[ROSTER_HTML],
+          always=True, profiled=True),
+    Stage("players",
+          [PY, "scraper.py", "--html", ROSTER_HTML],
+          inputs=[ROSTER_HTML, "scraper.py", "scripts/roster_tables.py", "scripts/hashed_output.py",
+                  "scripts/roster_events.py", "scripts/player_groups.py", "scripts/search_index.py",
+                  "scripts/power_map.py", "scripts/lean_browser.py", "scripts/profiling.py",
+                  "scripts/roster_harvest.py", "pokemon-data.json", "player-pokemon.json"],
+          outputs=["public/players.json", "player-pokemon.json", "public/groups/index.json"],
+          profiled=True),
+    Stage("race",
+          [PY, "scripts/mario_kart_leaderboard.py", "--html", ROSTER_HTML,
+           "--output", "public/race/index.html", "--base-path", "/pokechess",
+           "--season", "--no-open",
+           *(["--font", RACE_FONT] if (REPO_ROOT / RACE_FONT).exists() else [])],
+          inputs=[ROSTER_HTML, "scripts/mario_kart_leaderboard.py", "scripts/race_sim.py",
+                  "scripts/race_video.py", "scripts/roster_tables.py", "scripts/hashed_output.py",
+                  "scripts/lean_browser.py", "scripts/profiling.py", "scripts/roster_harvest.py",
+                  "public/collections/index.json", RACE_FONT],
+          outputs=["public/race/index.html"],
+          profiled=True),
+    Stage("snapshot",
+          [PY, "scripts/save_collection.py"],
+          inputs=["public/players.json", "scripts/save_collection.py",
+                  "scripts/collection_aggregates.py", "scripts/player_shards.py",
+                  "scripts/hashed_output.py"],
+          outputs=["public/collections/index.json", "public/collections/aggregates.json"],
+          default=False),
+]
+STAGES_BY_NAME = {s.name: s for s in STAGES}
+
+
+# ── Fingerprints ──────────────────────────────────────────────────────────────
+def _hash_path(h, path: pathlib.Path):
+    if path.is_dir():
+        for child in sorted(path.rglob("*")):
+            if child.is_file():
+                _hash_path(h, child)
+        return
+    h.update(str(path.relative_to(REPO_ROOT)).encode())
+    if path.exists():
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                h.update(block)
+    else:
+        h.update(b"\0missing")
+
+
+def fingerprint(stage: Stage) -> str:
+    """Hash of the stage command plus the content of every input."""
+    h = hashlib.sha256(json.dumps(stage.cmd[1:]).encode())
+    for rel in stage.inputs:
+        _hash_path(h, REPO_ROOT / rel)
+    return h.hexdigest()
+
+
+def load_state() -> dict:
+    if STATE_PATH.exists():
+        return json.loads(STATE_PATH.read_text())
+    return {}
+
+
+def save_state(state: dict):
+    STATE_DIR.mkdir(exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp, STATE_PATH)
+
+
+# ── Scheduling ────────────────────────────────────────────────────────────────
+def dependencies(stage: Stage, stages: list[Stage]) -> set[str]:
+    """Stages (among `stages`) that write one of this stage's inputs."""
+    return {
+        other.name for other in stages
+        if other is not stage and set(other.outputs) & set(stage.inputs)
+    }
+
+
+def select_stages(names: list[str]) -> list[Stage]:
+    """Requested stages plus the upstream daily stages they depend on.
+
+    Non-default stages (snapshot) are never pulled in implicitly; when they
+    are requested too, their outputs still order the stages that read them.
+    """
+    wanted = [STAGES_BY_NAME[n] for n in names] if names else [s for s in STAGES if s.default]
+    selected = {s.name for s in wanted}
+    frontier = list(wanted)
+    while frontier:
+        stage = frontier.pop()
+        for dep in dependencies(stage, STAGES):
+            if dep not in selected and STAGES_BY_NAME[dep].default:
+                selected.add(dep)
+                frontier.append(STAGES_BY_NAME[dep])
+    return [s for s in STAGES if s.name in selected]
+
+
+def is_fresh(stage: Stage, state: dict) -> bool:
+    if stage.always:
+        return False
+    if any(not (REPO_ROOT / out).exists() for out in stage.outputs):
+        return False
+    return state.get(stage.name) == fingerprint(stage)
+
+
+def run_stage(stage: Stage, profile_dir: str | None = None) -> tuple[bool, float]:
+    start = time.perf_counter()
+    cmd = stage.cmd
+    if profile_dir and stage.profiled:
+        cmd = cmd + ["--profile", "--profile-dir", profile_dir]
+    print(f"▶ {stage.name}: {' '.join(cmd[1:])}", flush=True)
+    proc = subprocess.run(cmd, cwd=REPO_ROOT)
+    ok = proc.returncode == 0 and all((REPO_ROOT / out).exists() for out in stage.outputs)
+    return ok, time.perf_counter() - start
+
+
+def run(names: list[str], force: set[str] = frozenset(), jobs: int = 4, dry_run: bool = False,
+        profile_dir: str | None = None) -> bool:
+    stages = select_stages(names)
+    deps = {s.name: dependencies(s, stages) for s in stages}
+    state = load_state()
+    done, failed = set(), set()
+    pending = {s.name: s for s in stages}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            progress = True
+            while progress:
+                progress = False
+                for name, stage in list(pending.items()):
+                    if deps[name] & failed:
+                        print(f"✗ {name}: skipped, upstream failed")
+                        failed.add(name)
+                    elif not deps[name] <= done:
+                        continue
+                    # Fingerprint only once upstream stages have written our inputs
+                    elif name not in force and is_fresh(stage, state):
+                        print(f"✓ {name}: up to date")
+                        done.add(name)
+                    elif dry_run:
+                        print(f"… {name}: would run")
+                        done.add(name)
+                    else:
+                        running[pool.submit(run_stage, stage, profile_dir)] = stage
+                    del pending[name]
+                    progress = True
+            if not running:
+                if pending:
+                    # nothing runnable and nothing in flight: dependency cycle
+                    print(f"✗ cannot schedule: {sorted(pending)}")
+                    return False
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                ok, secs = future.result()
+                if ok:
+                    print(f"✓ {stage.name}: done in {secs:.1f}s")
+                    # Inputs are fingerprinted after the run, so files a stage
+                    # updates in place (player-pokemon.json) don't retrigger it
+                    state[stage.name] = fingerprint(stage)
+                    save_state(state)
+                    done.add(stage.name)
+                else:
+                    print(f"✗ {stage.name}: failed after {secs:.1f}s")
+                    failed.add(stage.name)
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the PokeChess data pipeline incrementally")
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help="Stages to bring up to date (default: all daily stages)")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="Rerun this stage even if its inputs are unchanged")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Parallel stages")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Show what would run")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Profile the scraper and race stages into this directory")
+    args = parser.parse_args()
+    unknown = sorted(set(args.stages + args.force) - set(STAGES_BY_NAME))
+    if unknown:
+        parser.error(f"unknown stage(s) {', '.join(unknown)}; choose from {', '.join(STAGES_BY_NAME)}")
+
+    start = time.perf_counter()
+    ok = run(args.stages, set(args.force), args.jobs, args.dry_run, args.profile_dir)
+    print(f"Pipeline {'finished' if ok else 'FAILED'} in {time.perf_counter() - start:.1f}s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
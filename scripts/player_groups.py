@@ -0,0 +1,165 @@
+"""
+Per-group leaderboards under public/groups/.
+
+Every roster row carries a group ("King 22"). The scraper adds each player
+to a GroupIndex in the same pass that builds players.json, then writes:
+
+    groups/<slug>.<hash>.json   the group's board: its players.json entries
+                                (PLW >= 20), highest PLW first
+    groups/index.json           {slug: {"group", "file", "roster", "players",
+                                 "plwTotal", "tiers": {tier: count},
+                                 "top": {tier: {"id", "name", "plw"}}}}
+
+"roster" counts every student in the group; the other figures cover the
+players on the board. Boards are content-hashed (hashed_output.write_hashed)
+and named by "file", so only the small index has to be revalidated. The
+boards the previous index named are kept one more round; any other board,
+e.g. of a group no longer on the roster, is removed.
+"""
+import hashlib
+import json
+import pathlib
+import re
+import tempfile
+
+from hashed_output import write_hashed
+
+GROUPS_DIR = "groups"
+INDEX_FILE = "index.json"
+UNGROUPED = "ungrouped"
+MAX_OPEN_FILES = 64  # spool files kept open at once; others are reopened to append
+
+
+def group_slug(group: str) -> str:
+    """'King 22' → 'king-22'; blank groups → 'ungrouped', unsluggable ones are hashed."""
+    if not group.strip():
+        return UNGROUPED
+    slug = re.sub(r"[^a-z0-9]+", "-", group.lower()).strip("-")
+    if slug and slug != "index":
+        return slug
+    return f"_{hashlib.sha1(group.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _dump(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _write_if_changed(path: pathlib.Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+class GroupIndex:
+    """Players bucketed by group as the roster is read.
+
+    Board players are spooled to a temporary NDJSON file per group; only the
+    figures of the index stay in memory. close() removes the spool.
+    """
+
+    def __init__(self):
+        self.groups = {}   # group name → {"slug", "roster", "players", "plwTotal", "tiers", "top"}
+        self._slugs = {}   # slug → group name
+        self._spool = tempfile.TemporaryDirectory(prefix="groups-")
+        self._open = {}    # slug → spool file, least recently used first
+
+    def _entry(self, group):
+        entry = self.groups.get(group)
+        if entry is None:
+            slug = group_slug(group)
+            if slug in self._slugs:
+                # "King 22" and "King-22" would share a file
+                slug = f"{slug}-{hashlib.sha1(group.encode('utf-8')).hexdigest()[:6]}"
+            self._slugs[slug] = group
+            entry = self.groups[group] = {"slug": slug, "roster": 0, "players": 0,
+                                          "plwTotal": 0, "tiers": {}, "top": {}}
+        return entry
+
+    def _spool_path(self, slug) -> pathlib.Path:
+        return pathlib.Path(self._spool.name) / f"{slug}.ndjson"
+
+    def _spool_file(self, slug):
+        f = self._open.pop(slug, None)
+        if f is None:
+            if len(self._open) >= MAX_OPEN_FILES:
+                self._open.pop(next(iter(self._open))).close()
+            f = open(self._spool_path(slug), "a", encoding="utf-8")
+        self._open[slug] = f
+        return f
+
+    def add(self, player: dict, on_board: bool):
+        """Count a roster player; on_board players also go on the group's leaderboard."""
+        entry = self._entry(player.get("group", "").strip())
+        entry["roster"] += 1
+        if not on_board:
+            return
+        entry["players"] += 1
+        entry["plwTotal"] += player["plw"]
+        tier = player["tier"]
+        entry["tiers"][tier] = entry["tiers"].get(tier, 0) + 1
+        best = entry["top"].get(tier)
+        if best is None or player["plw"] > best["plw"]:
+            entry["top"][tier] = {"id": player["id"], "name": player["name"], "plw": player["plw"]}
+        self._spool_file(entry["slug"]).write(_dump(player) + "\n")
+
+    def summary(self, group: str) -> dict:
+        entry = self.groups[group]
+        return {
+            "group": group,
+            "roster": entry["roster"],
+            "players": entry["players"],
+            "plwTotal": entry["plwTotal"],
+            "tiers": entry["tiers"],
+            "top": entry["top"],
+        }
+
+    def board(self, group: str) -> list[dict]:
+        """The group's board, highest PLW first; board order breaks PLW ties, as on the dashboard."""
+        slug = self.groups[group]["slug"]
+        f = self._open.pop(slug, None)
+        if f is not None:
+            f.close()
+        path = self._spool_path(slug)
+        if not path.exists():
+            return []
+        with open(path, encoding="utf-8") as f:
+            players = [json.loads(line) for line in f]
+        return sorted(players, key=lambda p: -p["plw"])
+
+    def close(self):
+        for f in self._open.values():
+            f.close()
+        self._open.clear()
+        self._spool.cleanup()
+
+
+def _previous_files(groups_dir: pathlib.Path) -> set[str]:
+    """Board files the current groups/index.json names."""
+    path = groups_dir / INDEX_FILE
+    if not path.exists():
+        return set()
+    return {s["file"].split("?")[0] for s in json.loads(path.read_text(encoding="utf-8")).values()}
+
+
+def write_groups(public_dir: pathlib.Path, index: GroupIndex) -> int:
+    """Write every group's board plus groups/index.json. Returns files written."""
+    groups_dir = public_dir / GROUPS_DIR
+    groups_dir.mkdir(parents=True, exist_ok=True)
+    before = {p.name for p in groups_dir.glob("*.json")}
+    previous = _previous_files(groups_dir)
+
+    summaries = {}
+    for group in sorted(index.groups, key=lambda g: index.groups[g]["slug"]):
+        entry = index.groups[group]
+        name = write_hashed(groups_dir, entry["slug"], "json", _dump(index.board(group)), previous)
+        summaries[entry["slug"]] = {**index.summary(group), "file": name}
+
+    keep = {s["file"] for s in summaries.values()} | previous | {INDEX_FILE}
+    for old in groups_dir.glob("*.json"):
+        if old.name not in keep:
+            old.unlink()
+
+    written = len({s["file"] for s in summaries.values()} - before)
+    written += _write_if_changed(groups_dir / INDEX_FILE, _dump(summaries))
+    return written
@@ -0,0 +1,140 @@
+"""
+Per-player history shards under public/collections/players/.
+
+Each player gets <id>.json holding their weekly series in column form,
+sorted by date:
+
+    {"id": ..., "name": ..., "dates": [...], "plw": [...], "tier": [...],
+     "pokemonId": [...], "puzzles": [...]}
+
+players/index.json maps every id to {name, file, weeks, first, last} so the
+dashboard can list players without opening shards. A snapshot only touches
+the shards of the players in it, re-saving a date replaces that week (and
+drops it from players no longer in it), and files whose content is
+unchanged aren't rewritten (no git churn on re-runs).
+"""
+import bisect
+import hashlib
+import json
+import pathlib
+import re
+
+SHARDS_DIR = "players"
+INDEX_FILE = "index.json"
+COLUMNS = ("plw", "tier", "pokemonId", "puzzles")
+SAFE_ID = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+
+def shard_file(pid: str) -> str:
+    """File name for a player id; ids that aren't filename-safe are hashed."""
+    if SAFE_ID.match(pid) and pid != "index":
+        return f"{pid}.json"
+    return f"_{hashlib.sha1(pid.encode('utf-8')).hexdigest()[:12]}.json"
+
+
+def _dump(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def _write_if_changed(path: pathlib.Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def _add_week(shard: dict, date: str, player: dict):
+    """Insert (or replace) one week in a shard, keeping dates sorted."""
+    dates = shard["dates"]
+    i = bisect.bisect_left(dates, date)
+    values = {
+        "plw": int(player.get("plw", 0)),
+        "tier": player.get("tier", ""),
+        "pokemonId": player.get("pokemonId"),
+        "puzzles": int(player.get("puzzles", 0)),
+    }
+    if i < len(dates) and dates[i] == date:
+        for col in COLUMNS:
+            shard[col][i] = values[col]
+    else:
+        dates.insert(i, date)
+        for col in COLUMNS:
+            shard[col].insert(i, values[col])
+
+
+def _remove_week(shard: dict, date: str) -> bool:
+    """Drop one week from a shard; False if it wasn't there."""
+    dates = shard["dates"]
+    i = bisect.bisect_left(dates, date)
+    if i == len(dates) or dates[i] != date:
+        return False
+    del dates[i]
+    for col in COLUMNS:
+        del shard[col][i]
+    return True
+
+
+def _index_entry(shard: dict, path: pathlib.Path) -> dict:
+    return {
+        "name": shard["name"],
+        "file": path.name,
+        "weeks": len(shard["dates"]),
+        "first": shard["dates"][0],
+        "last": shard["dates"][-1],
+    }
+
+
+def update_shards(collections_dir: pathlib.Path, snapshot: dict) -> int:
+    """Fold one snapshot into the shards of its players. Returns files written."""
+    shards_dir = collections_dir / SHARDS_DIR
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    index_path = shards_dir / INDEX_FILE
+    index = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {}
+    date = snapshot["date"]
+    ids = {player["id"] for player in snapshot.get("players", [])}
+
+    written = 0
+    # A re-saved date: players who dropped off that board lose the week.
+    # Only shards spanning the date can hold it, none for a new latest week.
+    for pid, entry in list(index.items()):
+        if pid in ids or not entry["first"] <= date <= entry["last"]:
+            continue
+        path = shards_dir / entry["file"]
+        shard = json.loads(path.read_text(encoding="utf-8"))
+        if not _remove_week(shard, date):
+            continue
+        if shard["dates"]:
+            written += _write_if_changed(path, _dump(shard))
+            index[pid] = _index_entry(shard, path)
+        else:
+            path.unlink()
+            del index[pid]
+            written += 1
+
+    for player in snapshot.get("players", []):
+        pid = player["id"]
+        path = shards_dir / shard_file(pid)
+        if path.exists():
+            shard = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            shard = {"id": pid, "dates": [], **{col: [] for col in COLUMNS}}
+        # The newest snapshot decides the display name
+        if not shard["dates"] or date >= shard["dates"][-1]:
+            shard["name"] = player["name"]
+        _add_week(shard, date, player)
+        written += _write_if_changed(path, _dump(shard))
+        index[pid] = _index_entry(shard, path)
+
+    written += _write_if_changed(index_path, _dump(index))
+    return written
+
+
+def rebuild_shards(collections_dir: pathlib.Path) -> int:
+    """Regenerate every shard and the index from all dated snapshots."""
+    shards_dir = collections_dir / SHARDS_DIR
+    if shards_dir.exists():
+        for path in shards_dir.glob("*.json"):
+            path.unlink()
+    for path in sorted(collections_dir.glob("20*.json")):
+        update_shards(collections_dir, json.loads(path.read_text(encoding="utf-8")))
+    return len(list(shards_dir.glob("*.json"))) - 1 if shards_dir.exists() else 0
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of PokeAPI that generate-pokemon-data.py reads.
+
+    /api/v2/pokemon-species?limit=N        species list
+    /api/v2/pokemon-species/<id>/          names, is_legendary, is_mythical, evolution_chain
+    /api/v2/evolution-chain?limit=N        chain count
+    /api/v2/evolution-chain/<id>/          chain tree (species + evolves_to)
+
+Responses come from fixtures: a file recorded from the real API with
+--record, or (by default) fixtures rebuilt from pokemon-data.json. The
+rebuilt set reproduces pokemon-data.json when the generator runs
+against it. Chain ids have gaps as the real ones do (the generator probes
+50 ids past the count); those ids and any --missing-species 404.
+
+Faults are injected per request and seeded, so runs are reproducible:
+
+    --latency / --jitter   seconds added to every response
+    --rate-429             chance of a 429 (with Retry-After) instead of the body
+    --max-rps              429 whenever more than this many requests arrive in a second
+
+serve() runs it on a background thread; server.stats counts requests,
+429s and 404s for a benchmark (scripts/bench_generator.py) to report.
+
+Usage:
+    python scripts/pokeapi_stub.py [--port 8012] [--latency 0.02] [--rate-429 0.01]
+    python generate-pokemon-data.py --base-url http://127.0.0.1:8012/api/v2 --delay 0
+    python scripts/pokeapi_stub.py --record pokeapi-fixtures.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PORT = 8012
+API_PATH = "/api/v2"
+REAL_BASE_URL = "https://pokeapi.co/api/v2"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POKEMON_DATA_PATH = os.path.join(REPO_ROOT, "pokemon-data.json")
+CHAIN_GAPS = 8  # unused chain ids in rebuilt fixtures
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+def species_slug(name):
+    """'Mr. Mime' → 'mr-mime', 'Nidoran♀' → 'nidoran-f', as PokeAPI names species."""
+    name = name.replace("♀", "-f").replace("♂", "-m")
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", name.lower().replace("'", "").replace(".", "")).strip("-")
+
+
+def _species_ref(pid, names):
+    return {"name": species_slug(names[pid]), "url": f"{REAL_BASE_URL}/pokemon-species/{pid}/"}
+
+
+def fixtures_from_data(data, gaps=CHAIN_GAPS, seed=0):
+    """{"species": {id: json}, "chains": {id: json}} that the generator turns back into `data`.
+
+    Each evolution tree is rebuilt from its padded 3-stage paths, in the
+    order the generator emitted them; chains get ids 1.. with `gaps` ids
+    left unused.
+    """
+    names = {int(k): v for k, v in data["pokemon_names"].items()}
+    legendary, mythical = set(data["legendaries"]), set(data["mythicals"])
+
+    trees = {}  # base id → nested {child id: {...}}, insertion-ordered
+    for path in data["evolution_chains"]:
+        stages = list(path)
+        while len(stages) > 1 and stages[-1] == stages[-2]:
+            stages.pop()  # padding
+        node = trees.setdefault(stages[0], {})
+        for pid in stages[1:]:
+            node = node.setdefault(pid, {})
+
+    rng = random.Random(seed)
+    ids = sorted(rng.sample(range(2, len(trees) + gaps), gaps)) if gaps else []
+    chain_ids = [i for i in range(1, len(trees) + gaps + 1) if i not in ids][:len(trees)]
+
+    def link(pid, children):
+        return {"species": _species_ref(pid, names),
+                "evolves_to": [link(c, grand) for c, grand in children.items()]}
+
+    species, chains = {}, {}
+    for chain_id, (base, children) in zip(chain_ids, trees.items()):
+        chains[chain_id] = {"id": chain_id, "chain": link(base, children)}
+        stack = [(base, children)]
+        while stack:
+            pid, kids = stack.pop()
+            species.setdefault(pid, chain_id)
+            stack.extend(kids.items())
+
+    species_json = {}
+    for pid, name in sorted(names.items()):
+        entry = {
+            "id": pid,
+            "name": species_slug(name),
+            "names": [{"language": {"name": "en"}, "name": name}],
+            "is_legendary": pid in legendary,
+            "is_mythical": pid in mythical,
+        }
+        if pid in species:
+            entry["evolution_chain"] = {"url": f"{REAL_BASE_URL}/evolution-chain/{species[pid]}/"}
+        species_json[pid] = entry
+    return {"species": species_json, "chains": chains}
+
+
+def load_fixtures(path=None, gaps=CHAIN_GAPS, seed=0):
+    """Recorded fixtures from `path`, or fixtures rebuilt from pokemon-data.json."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        return {kind: {int(k): v for k, v in raw[kind].items()} for kind in ("species", "chains")}
+    with open(POKEMON_DATA_PATH, encoding="utf-8") as f:
+        return fixtures_from_data(json.load(f), gaps, seed)
+
+
+def _prune_chain(node):
+    return {"species": node["species"], "evolves_to": [_prune_chain(n) for n in node["evolves_to"]]}
+
+
+def record(path, base_url=REAL_BASE_URL, delay=0.05):
+    """Save the species and chains the generator reads from the real API (fields it uses only)."""
+    def get(url):
+        req = urllib.request.Request(url, headers={"User-Agent": "pokechess-fixtures"})
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return json.load(resp)
+
+    species, chains = {}, {}
+    listing = get(f"{base_url}/pokemon-species?limit=2000")["results"]
+    for i, ref in enumerate(listing):
+        if i % 100 == 0:
+            print(f"  species {i}/{len(listing)}")
+        s = get(ref["url"])
+        species[s["id"]] = {k: s.get(k) for k in ("id", "name", "names", "is_legendary",
+                                                   "is_mythical", "evolution_chain")}
+        chain_url = (s.get("evolution_chain") or {}).get("url")
+        if chain_url:
+            chain_id = int(chain_url.rstrip("/").split("/")[-1])
+            if chain_id not in chains:
+                c = get(chain_url)
+                chains[chain_id] = {"id": c["id"], "chain": _prune_chain(c["chain"])}
+        time.sleep(delay)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"species": species, "chains": chains}, f, ensure_ascii=False)
+    print(f"Recorded {len(species)} species, {len(chains)} chains → {path}")
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the fixtures, fault settings and request counts."""
+
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency=0.0, jitter=0.0, rate_429=0.0, max_rps=0,
+                 retry_after=1, missing_species=(), seed=0):
+        super().__init__(address, StubHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.missing_species = set(missing_species)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()  # arrival times within the last second, for max_rps
+        self.base_url = f"http://{self.server_address[0]}:{self.server_address[1]}{API_PATH}"
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "not_found": 0}
+
+    def admit(self):
+        """Count a request; (delay seconds, rate limited?) for it."""
+        now = time.monotonic()
+        with self.lock:
+            self.stats["requests"] += 1
+            self.recent.append(now)
+            while self.recent and self.recent[0] <= now - 1:
+                self.recent.popleft()
+            limited = (self.max_rps and len(self.recent) > self.max_rps) or \
+                self.rng.random() < self.rate_429
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        return delay, limited
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def listing(self, kind, ids, query):
+        limit = int(query.get("limit", 20))
+        offset = int(query.get("offset", 0))
+        page = ids[offset:offset + limit]
+        path = f"{REAL_BASE_URL}/{kind}"
+        more = offset + limit < len(ids)
+        return {
+            "count": len(ids),
+            "next": f"{path}?offset={offset + limit}&limit={limit}" if more else None,
+            "previous": f"{path}?offset={max(0, offset - limit)}&limit={limit}" if offset else None,
+            "results": [self._ref(kind, i) for i in page],
+        }
+
+    def _ref(self, kind, i):
+        if kind == "pokemon-species":
+            return {"name": self.fixtures["species"][i]["name"], "url": f"{REAL_BASE_URL}/{kind}/{i}/"}
+        return {"url": f"{REAL_BASE_URL}/{kind}/{i}/"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse connections
+
+    def do_GET(self):
+        server = self.server
+        delay, limited = server.admit()
+        if delay:
+            time.sleep(delay)
+        if limited:
+            server.count("rate_limited")
+            self._send(429, {"detail": "Too many requests"}, {"Retry-After": str(server.retry_after)})
+            return
+
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = url.path[len(API_PATH):].strip("/").split("/") if url.path.startswith(API_PATH) else []
+        body = None
+        try:
+            if len(parts) == 1 and parts[0] == "pokemon-species":
+                ids = sorted(i for i in server.fixtures["species"] if i not in server.missing_species)
+                body = server.listing("pokemon-species", ids, query)
+            elif len(parts) == 1 and parts[0] == "evolution-chain":
+                body = server.listing("evolution-chain", sorted(server.fixtures["chains"]), query)
+            elif len(parts) == 2 and parts[0] == "pokemon-species":
+                pid = int(parts[1])
+                if pid not in server.missing_species:
+                    body = server.fixtures["species"].get(pid)
+            elif len(parts) == 2 and parts[0] == "evolution-chain":
+                body = server.fixtures["chains"].get(int(parts[1]))
+        except ValueError:
+            body = None
+        if body is None:
+            server.count("not_found")
+            self._send(404, {"detail": "Not found."})
+            return
+        server.count("ok")
+        self._send(200, body)
+
+    def _send(self, status, body, headers=None):
+        text = json.dumps(body, ensure_ascii=False).replace(REAL_BASE_URL, self.server.base_url)
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(fixtures=None, host="127.0.0.1", port=DEFAULT_PORT, **faults):
+    """Start the stub on a background thread. Returns (server, base URL for --base-url).
+
+    port=0 picks a free port; faults are StubServer's keyword arguments.
+    Call server.shutdown() when done.
+    """
+    server = StubServer((host, port), fixtures or load_fixtures(), **faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.base_url
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, at random")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Chance of a 429 per request")
+    parser.add_argument("--max-rps", type=int, default=0, help="429 above this many requests/s (0: no limit)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--missing-species", default="", help="Comma-separated species ids that 404")
+    parser.add_argument("--gaps", type=int, default=CHAIN_GAPS,
+                        help="Unused evolution-chain ids in rebuilt fixtures (the generator probes 50 past the count)")
+    parser.add_argument("--fixtures", help="Recorded fixtures (default: rebuilt from pokemon-data.json)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for gaps and injected faults")
+
+
+def fault_options(args):
+    """StubServer keyword arguments from add_fault_arguments() options."""
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "rate_429": args.rate_429,
+        "max_rps": args.max_rps,
+        "retry_after": args.retry_after,
+        "missing_species": [int(i) for i in args.missing_species.split(",") if i],
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local PokeAPI stand-in for generate-pokemon-data.py")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--record", metavar="PATH", help="Record fixtures from the real PokeAPI instead")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    fixtures = load_fixtures(args.fixtures, args.gaps, args.seed)
+    server, url = serve(fixtures, port=args.port, **fault_options(args))
+    print(f"PokeAPI stub: {len(fixtures['species'])} species, {len(fixtures['chains'])} chains at {url}")
+    print("Ctrl-C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.stats))
+
+
+if __name__ == "__main__":
+    main()
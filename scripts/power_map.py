@@ -0,0 +1,187 @@
+"""
+PowerMap layout: where each player's dot goes on the dashboard's USCF × PLW map.
+
+The scraper writes power-map.<hash>.json next to players.json (manifest.json
+"powerMap" points at it), so the dashboard places dots without computing
+anything:
+
+    {"v": 1,
+     "size": [900, 500],        nominal plot size in px the layout was solved for
+     "dot": 24,                 dot diameter in px
+     "xAxis": {"field": "uscf", "min": 0, "max": 1500, "ticks": [0, 500, ...]},
+     "yAxis": {"field": "plw", ...},
+     "ids": [...], "x": [...], "y": [...],    dot centres, 0–10000 of the plot
+     "outliers": {id: ["plw"], ...}}          beyond the axes, pinned to the edge
+
+Axes come from the data: Tukey fences (1.5 × IQR past the quartiles) mark
+outliers, and the remaining values are rounded out to nice tick steps.
+Unrated players (USCF 0) are left out of the USCF statistics, and they
+keep the axis starting at 0. The dot size shrinks with the number of
+players. Overlapping dots are pushed apart over a few relaxation passes.
+Each pass finds neighbours through a spatial grid of dot-sized cells with
+numpy; a spring pulls every dot back toward its true position, and no dot
+moves more than a few diameters from it, so a dense clump stays a clump
+(thinned out) rather than smearing across the plot.
+"""
+import json
+import math
+
+import numpy as np
+
+VERSION = 1
+PLOT_WIDTH, PLOT_HEIGHT = 900, 500
+MAX_DOT, MIN_DOT = 40, 8
+FILL = 0.35          # share of the plot the dots may cover before they shrink
+PASSES = 8
+SPRING = 0.15        # pull back toward the true position, eased off over the passes
+MAX_DRIFT = 4        # no dot ends up more than this many diameters from its true position
+SCALE = 10000        # coordinates are stored as integers out of SCALE
+MIN_SPAN = {"uscf": 200, "plw": 40}
+TICKS = 4
+
+
+def nice_step(span, ticks=TICKS):
+    raw = span / ticks
+    mag = 10 ** math.floor(math.log10(raw))
+    return next(m * mag for m in (1, 2, 5, 10) if m * mag >= raw)
+
+
+def axis(field, values, min_value=None):
+    """Axis range, ticks and outlier mask for one field.
+
+    min_value: values below it (unrated USCF 0) are left out of the
+    quartiles but still sit on the axis.
+    """
+    stats = values if min_value is None else values[values >= min_value]
+    if len(stats) >= 4:
+        q1, q3 = np.percentile(stats, [25, 75])
+        iqr = q3 - q1
+        lo_fence, hi_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    else:
+        lo_fence, hi_fence = -math.inf, math.inf
+    outlier = (values > hi_fence) | ((values < lo_fence) if min_value is None
+                                     else (values >= min_value) & (values < lo_fence))
+    inside = values[~outlier]
+    lo = float(inside.min()) if len(inside) else 0.0
+    hi = float(inside.max()) if len(inside) else 0.0
+    if hi - lo < MIN_SPAN[field]:
+        lo = max(0.0, (lo + hi - MIN_SPAN[field]) / 2)
+        hi = lo + MIN_SPAN[field]
+    step = nice_step(hi - lo)
+    lo = math.floor(lo / step) * step
+    hi = math.ceil(hi / step) * step
+    ticks = [round(lo + i * step, 6) for i in range(int(round((hi - lo) / step)) + 1)]
+    ticks = [int(t) if float(t).is_integer() else t for t in ticks]
+    return {"field": field, "min": ticks[0], "max": ticks[-1], "ticks": ticks}, outlier
+
+
+def dot_size(n, width=PLOT_WIDTH, height=PLOT_HEIGHT):
+    if n == 0:
+        return MAX_DOT
+    return int(max(MIN_DOT, min(MAX_DOT, math.sqrt(width * height * FILL / n))))
+
+
+def relax(pos, radius, width, height, passes=PASSES):
+    """Push apart dots closer than 2 × radius; pos is an (n, 2) array of px centres."""
+    anchor = pos.copy()
+    diameter = 2 * radius
+    cols = int(width // diameter) + 2   # one spare column so x - 1 never wraps a row
+    n = len(pos)
+    # Fixed, well-spread directions for dots sitting exactly on top of each other
+    golden = np.arange(n) * 2.399963
+    spread = np.stack([np.cos(golden), np.sin(golden)], axis=1)
+
+    for k in range(passes):
+        cell = (pos // diameter).astype(np.int64)
+        key = cell[:, 1] * cols + cell[:, 0]
+        order = np.argsort(key, kind="stable")
+        cells, starts, counts = np.unique(key[order], return_index=True, return_counts=True)
+        push = np.zeros_like(pos)
+
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                target = key + dy * cols + dx
+                slot = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+                found = cells[slot] == target
+                i = np.nonzero(found)[0]
+                c = counts[slot[i]]
+                # Every (i, j) pair with j in i's neighbouring cell
+                ii = np.repeat(i, c)
+                within = np.arange(len(ii)) - np.repeat(np.cumsum(c) - c, c)
+                jj = order[np.repeat(starts[slot[i]], c) + within]
+                keep = jj > ii
+                ii, jj = ii[keep], jj[keep]
+
+                delta = pos[ii] - pos[jj]
+                dist = np.hypot(delta[:, 0], delta[:, 1])
+                hit = dist < diameter
+                ii, jj, delta, dist = ii[hit], jj[hit], delta[hit], dist[hit]
+                if not len(ii):
+                    continue
+                same = dist < 1e-6
+                unit = np.where(same[:, None], spread[ii], delta / np.where(same, 1, dist)[:, None])
+                move = ((diameter - dist) / 2)[:, None] * unit
+                np.add.at(push, ii, move)
+                np.add.at(push, jj, -move)
+
+        pos += push
+        pos += SPRING * (1 - k / passes) * (anchor - pos)
+        off = pos - anchor
+        far = np.hypot(off[:, 0], off[:, 1])
+        over = far > MAX_DRIFT * diameter
+        pos[over] = anchor[over] + off[over] * (MAX_DRIFT * diameter / far[over])[:, None]
+        np.clip(pos[:, 0], radius, width - radius, out=pos[:, 0])
+        np.clip(pos[:, 1], radius, height - radius, out=pos[:, 1])
+    return pos
+
+
+class PowerMap:
+    """Board players collected a player at a time, laid out on to_json()."""
+
+    def __init__(self):
+        self.ids = []
+        self.uscf = []
+        self.plw = []
+
+    def add(self, player: dict):
+        self.ids.append(player["id"])
+        self.uscf.append(player.get("uscf", 0))
+        self.plw.append(player.get("plw", 0))
+
+    def layout(self, width=PLOT_WIDTH, height=PLOT_HEIGHT, passes=PASSES) -> dict:
+        ids = self.ids
+        uscf = np.array(self.uscf, dtype=float)
+        plw = np.array(self.plw, dtype=float)
+
+        x_axis, x_out = axis("uscf", uscf, min_value=1)
+        y_axis, y_out = axis("plw", plw)
+        dot = dot_size(len(ids), width, height)
+        radius = dot / 2
+
+        # Value → px of the dot centre, kept a radius inside the plot; y grows upwards
+        def place(values, ax, extent):
+            t = np.clip((values - ax["min"]) / (ax["max"] - ax["min"]), 0, 1)
+            return radius + t * (extent - dot)
+
+        pos = np.stack([place(uscf, x_axis, width), place(plw, y_axis, height)], axis=1)
+        if len(ids) > 1:
+            pos = relax(pos, radius, width, height, passes)
+
+        outliers = {}
+        for k in np.nonzero(x_out | y_out)[0]:
+            outliers[ids[k]] = [f for f, flag in (("uscf", x_out[k]), ("plw", y_out[k])) if flag]
+
+        return {
+            "v": VERSION,
+            "size": [width, height],
+            "dot": dot,
+            "xAxis": x_axis,
+            "yAxis": y_axis,
+            "ids": ids,
+            "x": np.rint(pos[:, 0] / width * SCALE).astype(int).tolist(),
+            "y": np.rint(pos[:, 1] / height * SCALE).astype(int).tolist(),
+            "outliers": outliers,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.layout(), ensure_ascii=False, separators=(",", ":"))
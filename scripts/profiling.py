@@ -0,0 +1,163 @@
+"""
+Shared --profile support for scraper.py, generate-pokemon-data.py and
+scripts/mario_kart_leaderboard.py.
+
+With --profile the run is wrapped in cProfile and tracemalloc. The reports
+are written next to the script's output and named after it:
+
+    <stem>.cpu.txt       hotspots sorted by cumulative and by own time
+    <stem>.pstats        raw cProfile data (snakeviz, pstats)
+    <stem>.alloc.txt     peak heap and the top allocation sites
+    <stem>.phases.json   wall time and heap growth per phase, plus
+                         wall-clock stack samples with --profile-sample
+
+Scripts mark phases with `with phase("fetch"):`, which costs nothing when
+profiling is off.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+TOP_N = 40
+
+_active = None  # the running Profiler, if any
+
+
+def add_profile_arguments(parser):
+    """Add --profile, --profile-dir and --profile-sample to an argparse parser."""
+    parser.add_argument("--profile", action="store_true",
+                        help="Write CPU, allocation and per-phase reports next to the output")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Write profile reports here instead")
+    parser.add_argument("--profile-sample", type=float, default=0, metavar="MS",
+                        help="Also sample the main thread's stack every MS milliseconds")
+
+
+def profiled(args, output_path):
+    """Context manager for a script's run: a Profiler if --profile was given."""
+    if not args.profile:
+        return nullcontext()
+    out_dir = args.profile_dir or os.path.dirname(os.path.abspath(output_path))
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    return Profiler(out_dir, stem, args.profile_sample)
+
+
+@contextmanager
+def phase(name):
+    """Time a named phase of the active profiled run (no-op otherwise)."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    profiler.phase_stack.append(name)
+    start = time.perf_counter()
+    mem_start = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        profiler.phases.append({
+            "phase": "/".join(profiler.phase_stack),
+            "seconds": round(time.perf_counter() - start, 4),
+            "heap_delta_bytes": tracemalloc.get_traced_memory()[0] - mem_start,
+        })
+        profiler.phase_stack.pop()
+
+
+class Profiler:
+    """cProfile + tracemalloc around a block; reports are written on exit."""
+
+    def __init__(self, out_dir, stem, sample_ms=0, top=TOP_N):
+        self.out_dir = out_dir
+        self.stem = stem
+        self.sample_ms = sample_ms
+        self.top = top
+        self.phases = []
+        self.phase_stack = []
+        self.samples = Counter()
+        self._profile = cProfile.Profile()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def __enter__(self):
+        global _active
+        _active = self
+        self._started = time.perf_counter()
+        tracemalloc.start()
+        if self.sample_ms > 0:
+            self._sampler = threading.Thread(
+                target=self._sample, args=(threading.get_ident(),), daemon=True)
+            self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self._profile.disable()
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _active = None
+        self._write_reports(snapshot, peak, time.perf_counter() - self._started)
+        return False
+
+    def _sample(self, thread_id):
+        """Wall-clock sampler: counts (phase, innermost frame) every sample_ms."""
+        interval = self.sample_ms / 1000
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            where = f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+            self.samples["/".join(self.phase_stack) or "-", where] += 1
+
+    def _path(self, suffix):
+        return os.path.join(self.out_dir, f"{self.stem}.{suffix}")
+
+    def _write_reports(self, snapshot, peak, total):
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        self._profile.dump_stats(self._path("pstats"))
+        buf = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buf).strip_dirs()
+        buf.write(f"Total wall time: {total:.3f}s\n\n=== By cumulative time ===\n")
+        stats.sort_stats("cumulative").print_stats(self.top)
+        buf.write("\n=== By own time ===\n")
+        stats.sort_stats("tottime").print_stats(self.top)
+        with open(self._path("cpu.txt"), "w") as f:
+            f.write(buf.getvalue())
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, cProfile.__file__)]
+        snapshot = snapshot.filter_traces(filters)
+        with open(self._path("alloc.txt"), "w") as f:
+            f.write(f"Peak traced heap: {peak / 2**20:.2f} MiB\n")
+            f.write(f"Still allocated at exit: {sum(s.size for s in snapshot.statistics('filename')) / 2**20:.2f} MiB\n\n")
+            f.write("=== Top allocation sites (live at exit) ===\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback[0]}\n")
+
+        sample_secs = self.sample_ms / 1000
+        report = {
+            "total_seconds": round(total, 4),
+            "peak_heap_bytes": peak,
+            "phases": self.phases,
+            "samples": [
+                {"phase": ph, "where": where, "count": n, "approx_seconds": round(n * sample_secs, 3)}
+                for (ph, where), n in self.samples.most_common(self.top)
+            ],
+        }
+        with open(self._path("phases.json"), "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile reports → {self._path('{cpu.txt,alloc.txt,phases.json,pstats}')}")
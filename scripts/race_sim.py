@@ -0,0 +1,144 @@
+"""
+Deterministic Weekly Sprint race simulation.
+
+Mirrors the speed model the race page used to run live with Math.random():
+base speed scales linearly with PLW between MIN_SPEED and MAX_SPEED, and
+every 3–5 s each kart's speed is perturbed by up to ±VARIANCE_MAX. The race
+ends when FINISHERS_TO_END karts have completed TARGET_LAPS.
+
+The simulation is seeded and vectorized across racers, and produces a compact
+keyframe timeline (arc position per racer every keyframe_tick(n) seconds) plus
+the finish order, so every viewer sees the same race and the browser only
+interpolates.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+TARGET_LAPS      = 2
+MIN_SPEED        = 0.008   # arc-frac / sec
+MAX_SPEED        = 0.075   # arc-frac / sec
+VARIANCE_MAX     = 0.018   # ± perturbation
+VAR_INTERVAL_MIN = 3.0     # sec
+VAR_INTERVAL_RNG = 2.0     # sec extra random
+ARC_GAP          = 0.018   # stagger between karts at start
+START_SPREAD     = 0.36    # max arc the whole grid may span (20 karts × ARC_GAP)
+FINISHERS_TO_END = 8
+
+SIM_DT        = 0.05       # sec per simulation step
+# (max field size, sec between keyframes) — multiples of SIM_DT. Larger
+# fields use sparser keyframes to keep race.json small; speeds only change
+# every 3–5 s, so linear interpolation loses nothing visible
+KEYFRAME_TICKS = ((64, 0.25), (256, 0.5), (None, 1.0))
+POS_SCALE     = 10000      # arc positions are stored as ints of 1/POS_SCALE lap
+
+
+def seed_for(racers):
+    """Stable seed from the racer data: same roster → same race."""
+    key = json.dumps([[r["name"], r["plw"]] for r in racers], ensure_ascii=False)
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:4], "big")
+
+
+def keyframe_tick(n):
+    """Keyframe spacing for a field of n karts."""
+    for limit, tick in KEYFRAME_TICKS:
+        if limit is None or n <= limit:
+            return tick
+
+
+def start_gap(n):
+    """Arc gap between karts on the grid; shrinks for big fields."""
+    return min(ARC_GAP, START_SPREAD / max(n - 1, 1))
+
+
+def compute_base_speed(plw):
+    """Vectorized computeBaseSpeed: PLW array → arc-frac/sec."""
+    plw = np.asarray(plw, dtype=float)
+    return MIN_SPEED + (plw / max(plw.max(initial=0), 1)) * (MAX_SPEED - MIN_SPEED)
+
+
+def simulate_race(racers, seed=None):
+    """
+    Simulate the race and return the timeline dict embedded in race.json:
+
+        seed         seed used
+        tick         seconds between keyframes
+        end          race end time (sec) — the last keyframe sits here
+        scale        divide positions by this to get laps
+        frames       [[pos of racer 0, pos of racer 1, ...], ...] — frames[0]
+                     holds absolute positions, later frames the change since
+                     the previous frame (keeps the JSON small)
+        finish       racer indexes in finishing order
+        finishTimes  seconds at which each of `finish` crossed the line
+    """
+    if seed is None:
+        seed = seed_for(racers)
+    rng = np.random.default_rng(seed)
+    n = len(racers)
+    to_finish = min(FINISHERS_TO_END, n)
+    tick = keyframe_tick(n)
+    if n == 0:
+        return {"seed": int(seed), "tick": tick, "end": 0.0, "scale": POS_SCALE,
+                "frames": [], "finish": [], "finishTimes": []}
+
+    base = compute_base_speed([r["plw"] for r in racers])
+    pos = -start_gap(n) * np.arange(n, dtype=float)
+    speed = base.copy()
+    next_var = rng.random(n) * VAR_INTERVAL_RNG
+    finished = np.zeros(n, dtype=bool)
+    finish_time = np.full(n, np.inf)
+
+    per_key = round(tick / SIM_DT)
+    frames = [pos.copy()]
+    step = 0
+    t = 0.0
+    while finished.sum() < to_finish:
+        due = ~finished & (next_var <= t)
+        k = int(due.sum())
+        if k:
+            variance = (rng.random(k) * 2 - 1) * VARIANCE_MAX
+            speed[due] = np.maximum(MIN_SPEED * 0.5, base[due] + variance)
+            next_var[due] = t + VAR_INTERVAL_MIN + rng.random(k) * VAR_INTERVAL_RNG
+
+        moving = ~finished
+        prev_pos = pos
+        new_pos = pos + np.where(moving, speed * SIM_DT, 0.0)
+        crossed = moving & (new_pos >= TARGET_LAPS)
+        finish_time[crossed] = t + (TARGET_LAPS - pos[crossed]) / speed[crossed]
+        new_pos[crossed] = TARGET_LAPS
+        finished |= crossed
+        pos = new_pos
+
+        step += 1
+        t = step * SIM_DT
+        if step % per_key == 0 and finished.sum() < to_finish:
+            frames.append(pos.copy())
+
+    # The race (and every kart) stops the moment the last counted kart
+    # finishes, part-way through the final step
+    end = float(np.sort(finish_time)[to_finish - 1])
+    moved = prev_pos + np.where(moving, speed * (end - (t - SIM_DT)), 0.0)
+    frames.append(np.minimum(moved, TARGET_LAPS))
+
+    order = np.lexsort((np.arange(n), finish_time))[:to_finish]
+    return {
+        "seed": int(seed),
+        "tick": tick,
+        "end": round(end, 3),
+        "scale": POS_SCALE,
+        "frames": _delta_encode(np.rint(np.array(frames) * POS_SCALE).astype(int)),
+        "finish": order.tolist(),
+        "finishTimes": [round(float(finish_time[i]), 3) for i in order],
+    }
+
+
+def _delta_encode(frames):
+    deltas = frames.copy()
+    deltas[1:] = np.diff(frames, axis=0)
+    return deltas.tolist()
+
+
+def finish_order(timeline, racers):
+    """Names in finishing order — handy for checking a seeded race."""
+    return [racers[i]["name"] for i in timeline["finish"]]
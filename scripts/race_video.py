@@ -0,0 +1,446 @@
+"""
+Pre-rendered race video for viewers that can't run the live canvas
+(classroom projector, chat previews, low-power clients).
+
+Frames are drawn with Pillow from the same seeded timeline the page plays
+(race.json "race"), interpolated between keyframes the way the page does,
+and rendered in parallel across a process pool. Written next to race.json:
+
+    race.<hash>.mp4           H.264, when ffmpeg is on PATH
+    race.<hash>.webp          animated WebP, only without ffmpeg (several times the size)
+    race-poster.<hash>.png    the final standings frame
+
+The video is kept small for the clients that fall back to it: a modest
+frame size and rate, and a loop of at most MAX_VIDEO_SECONDS (long races
+play faster). The files are build output, not repo content: the Pages
+deploy renders them from the committed race.json with
+
+    python scripts/race_video.py public/race [--font PressStart2P.ttf]
+
+which also adds race.json's "video" entry to the deployed copy and, when
+the directory sits in public/, the "raceVideo" and "racePoster" entries of
+public/manifest.json.
+
+The drawing follows RACE_JS at a fixed size: oval track laid out by arc
+length, karts with name labels (culled for big fields), lap counter and
+finisher list. Medal emoji become "1." "2." "3." since Pillow fonts have no
+colour glyphs. The files are content-hashed (hashed_output.write_hashed):
+an unchanged race keeps its names, and the files the previous race.json
+named are kept one more round.
+"""
+import io
+import json
+import math
+import pathlib
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from hashed_output import MANIFEST_NAME, write_hashed, update_manifest
+from race_sim import TARGET_LAPS
+
+VIDEO_WIDTH   = 480
+VIDEO_FPS     = 10
+VIDEO_SPEED   = 2.0     # race seconds per video second (at least; see MAX_VIDEO_SECONDS)
+MAX_VIDEO_SECONDS = 20  # loop length cap, hold included; longer races play faster
+HOLD_SECONDS  = 3.5     # final standings held at the end; also the celebration length
+WEBP_QUALITY  = 70
+
+ARC_SAMPLES   = 1200
+LOD_THRESHOLD = 40      # above this many karts only non-overlapping labels are drawn
+LABEL_CELL    = 48      # px, label collision grid
+ORANGE        = (249, 161, 27)
+SKY_TOP       = (26, 10, 46)
+SKY_BOTTOM    = (45, 10, 94)
+GRASS_DARK    = (45, 110, 58)
+GRASS_LIGHT   = (58, 125, 68)
+
+
+def _rgb(color: str) -> tuple:
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _ellipse_points(ex, ey, erx, ery, steps=12):
+    a = np.linspace(0, 2 * np.pi, steps, endpoint=False)
+    return np.stack([ex + erx * np.cos(a), ey + ery * np.sin(a)], axis=1)
+
+
+def _rect_points(x, y, w, h):
+    return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=float)
+
+
+class Track:
+    """Oval geometry for a w×h frame, as resizeCanvas()/buildArcTable() lay it out."""
+
+    def __init__(self, w: int, h: int):
+        self.w, self.h = w, h
+        self.cx, self.cy = w / 2, h / 2
+        self.rx, self.ry = w * 0.41, h * 0.37
+        self.road = min(w, h) * 0.13
+        self.kart_w = max(10, w * 0.021)
+        self.kart_h = max(7, h * 0.040)
+        self.angles = np.linspace(0, 2 * np.pi, ARC_SAMPLES + 1)
+        mid = (self.angles[:-1] + self.angles[1:]) / 2
+        ds = np.hypot(self.rx * np.sin(mid), self.ry * np.cos(mid)) * (2 * np.pi / ARC_SAMPLES)
+        self.lengths = np.concatenate([[0.0], np.cumsum(ds)])
+
+    def theta(self, arc):
+        """Ellipse angle for arc positions in laps (equal arc → equal distance)."""
+        return np.interp(np.mod(arc, 1.0) * self.lengths[-1], self.lengths, self.angles)
+
+    def place(self, arc):
+        """x, y and heading arrays for arc positions in laps."""
+        theta = self.theta(arc)
+        x = self.cx + self.rx * np.cos(theta)
+        y = self.cy + self.ry * np.sin(theta)
+        return x, y, np.arctan2(self.ry * np.cos(theta), -self.rx * np.sin(theta))
+
+
+class Timeline:
+    """Decoded race.json timeline; positions_at() matches the page's positionsAt()."""
+
+    def __init__(self, race: dict, n: int):
+        self.tick = race["tick"]
+        self.end = race["end"]
+        self.finish = race["finish"]
+        self.finish_times = race["finishTimes"]
+        frames = np.asarray(race["frames"], dtype=float).reshape(-1, n)
+        self.pos = np.cumsum(frames, axis=0) / race["scale"]
+
+    def positions_at(self, t: float):
+        count = len(self.pos)
+        if count < 2:
+            return self.pos[0] if count else np.zeros(0)
+        last = count - 1
+        i = int(t // self.tick)
+        if i >= last - 1:
+            i = last - 1
+            t0 = i * self.tick
+            u = (t - t0) / (self.end - t0) if self.end > t0 else 1.0
+        else:
+            u = t / self.tick - i
+        u = min(1.0, max(0.0, u))
+        return self.pos[i] + u * (self.pos[i + 1] - self.pos[i])
+
+
+def _font(path, size):
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+
+class FrameRenderer:
+    """Draws race frames at a given video time; one instance per worker process."""
+
+    def __init__(self, racers: list[dict], race: dict, width: int, height: int,
+                 speed: float, font_path=None):
+        self.track = Track(width, height)
+        self.timeline = Timeline(race, len(racers))
+        self.speed = speed
+        self.labels = [r["name"].split(" ")[0] for r in racers]
+        self.colors = [_rgb(r["color"]) for r in racers]
+        k = self.track.kart_w
+        self.label_size = max(6, min(10, round(k * 0.55)))
+        self.label_font = _font(font_path, self.label_size)
+        self.lap_font = _font(font_path, max(8, round(k * 0.7)))
+        self.row_font = _font(font_path, max(6, round(k * 0.52)))
+        self.winner_font = _font(font_path, max(10, round(k * 0.9)))
+        self.sf_font = _font(font_path, max(7, round(self.track.kart_h * 0.8)))
+        self.label_w = [self.label_font.getlength(label) for label in self.labels]
+        self.background = self._draw_background()
+
+    # ── Static layer ─────────────────────────────────────────────────────────
+    def _draw_background(self) -> Image.Image:
+        tr = self.track
+        w, h = tr.w, tr.h
+        ys, xs = np.mgrid[0:h, 0:w]
+
+        # Sky gradient
+        f = (ys / max(h - 1, 1))[..., None]
+        px = (np.array(SKY_TOP) * (1 - f) + np.array(SKY_BOTTOM) * f).astype(np.uint8)
+
+        # Checkerboard border: two rings of 8px squares
+        sq = 8
+        ci, cj = xs // sq, ys // sq
+        edge = (ci < 2) | (ci * sq >= w - sq * 2) | (cj < 2) | (cj * sq >= h - sq * 2)
+        white = (ci + cj) % 2 == 0
+        px[edge & white] = 255
+        px[edge & ~white] = 17
+
+        # Grass pattern inside the oval (8px tile, lighter quarters top-left/bottom-right)
+        inner = ((xs - tr.cx) / (tr.rx - tr.road / 2)) ** 2 + ((ys - tr.cy) / (tr.ry - tr.road / 2)) ** 2 <= 1
+        light = (xs % 8 < 4) == (ys % 8 < 4)
+        px[inner & light] = GRASS_LIGHT
+        px[inner & ~light] = GRASS_DARK
+
+        img = Image.fromarray(px, "RGB")
+        g = ImageDraw.Draw(img)
+
+        def ring(radius_x, radius_y, width, fill):
+            # Pillow strokes inward from the bounding box; centre the stroke on the radius
+            ox, oy = radius_x + width / 2, radius_y + width / 2
+            g.ellipse([tr.cx - ox, tr.cy - oy, tr.cx + ox, tr.cy + oy], outline=fill, width=round(width))
+
+        ring(tr.rx, tr.ry, tr.road, (46, 46, 46))
+        ring(tr.rx + tr.road / 2 - 2, tr.ry + tr.road / 2 - 2, 3, (255, 255, 255))
+        ring(tr.rx - tr.road / 2 + 2, tr.ry - tr.road / 2 + 2, 3, (255, 255, 255))
+
+        # Centre dashes, 14 on / 18 off along the arc
+        total = tr.lengths[-1]
+        for s in np.arange(0, total, 32):
+            arcs = np.linspace(s, min(s + 14, total), 6) / total
+            x, y, _ = tr.place(arcs)
+            g.line(list(zip(x, y)), fill=(255, 255, 0), width=2)
+
+        # Start/finish stripe at theta = 0 (right side), then the "S/F" label
+        sx, sy = tr.cx + tr.rx, tr.cy
+        step = 5
+        steps = math.ceil(tr.road * 0.55 / step)
+        for i in range(-steps, steps + 1):
+            for j in range(-2, 3):
+                x0, y0 = sx - i * step, sy + j * step
+                g.rectangle([x0, y0, x0 + step - 1, y0 + step - 1],
+                            fill=(255, 255, 255) if (i + j) % 2 == 0 else (17, 17, 17))
+        g.text((sx, sy - tr.ry * 0.18), "S/F", font=self.sf_font, anchor="mm",
+               fill=ORANGE, stroke_width=1, stroke_fill=(0, 0, 0))
+        return img
+
+    # ── Frame ────────────────────────────────────────────────────────────────
+    def race_time(self, v: float) -> float:
+        return min(v * self.speed, self.timeline.end)
+
+    def render(self, v: float) -> Image.Image:
+        """Frame at v seconds of video."""
+        tl, tr = self.timeline, self.track
+        t = self.race_time(v)
+        arc = tl.positions_at(t)
+        img = self.background.copy()
+        g = ImageDraw.Draw(img, "RGBA")
+
+        finished = [(i, ft) for i, ft in zip(tl.finish, tl.finish_times) if ft <= v * self.speed]
+        self._draw_hud(g, arc, finished)
+
+        order = np.argsort(arc, kind="stable")  # leader drawn last, on top
+        x, y, heading = tr.place(arc)
+        for i in order:
+            self._draw_kart(g, x[i], y[i], heading[i], self.colors[i])
+        self._draw_labels(g, order, x, y)
+
+        for place, (i, ft) in enumerate(finished):
+            since = v - ft / self.speed
+            if since < HOLD_SECONDS:
+                self._draw_celebration(g, x[i], y[i], v, place == 0)
+        return img
+
+    def _draw_kart(self, g, x, y, heading, color):
+        W, H = self.track.kart_w, self.track.kart_h
+        c, s = math.cos(heading), math.sin(heading)
+
+        def poly(points, fill):
+            px = x + points[:, 0] * c - points[:, 1] * s
+            py = y + points[:, 0] * s + points[:, 1] * c
+            g.polygon(list(zip(px, py)), fill=fill)
+
+        poly(_ellipse_points(2, 3, W * 0.55, H * 0.35), (0, 0, 0, 89))
+        poly(_rect_points(-W / 2, -H / 2, W, H), color)
+        poly(_rect_points(-W * 0.15, -H * 0.38, W * 0.3, H * 0.55), (180, 230, 255, 217))
+        wx, wy = W * 0.36, H * 0.42
+        for bx, by in ((-wx, -wy), (wx, -wy), (-wx, wy), (wx, wy)):
+            poly(_ellipse_points(bx, by, W * 0.12, H * 0.18, 8), (17, 17, 17))
+
+    def _draw_labels(self, g, order, x, y):
+        fs = self.label_size
+        cull = len(order) > LOD_THRESHOLD
+        grid = {}
+        for i in order[::-1]:  # leaders first
+            tw = self.label_w[i]
+            label_y = y[i] - self.track.kart_h * 0.9 - 4
+            box = (x[i] - tw / 2 - 3, label_y - fs - 1, x[i] + tw / 2 + 3, label_y + 3)
+            if cull:
+                cells = [(gx, gy)
+                         for gx in range(int(box[0] // LABEL_CELL), int(box[2] // LABEL_CELL) + 1)
+                         for gy in range(int(box[1] // LABEL_CELL), int(box[3] // LABEL_CELL) + 1)]
+                if any(box[0] < b[2] and box[2] > b[0] and box[1] < b[3] and box[3] > b[1]
+                       for cell in cells for b in grid.get(cell, ())):
+                    continue
+                for cell in cells:
+                    grid.setdefault(cell, []).append(box)
+            g.rounded_rectangle(box, radius=3, fill=(0, 0, 0, 166))
+            g.text((x[i], label_y), self.labels[i], font=self.label_font, anchor="md",
+                   fill=(255, 255, 255), stroke_width=1, stroke_fill=(0, 0, 0))
+
+    def _draw_hud(self, g, arc, finished):
+        tr = self.track
+        # Lap counter, top centre (follows the first racer, like the page)
+        lap = min(TARGET_LAPS, max(1, math.floor(arc[0] if len(arc) else 0) + 1))
+        g.rectangle([tr.w / 2 - 70, 6, tr.w / 2 + 70, 6 + max(14, tr.kart_w * 0.8) + 6], fill=(0, 0, 0, 140))
+        g.text((tr.w / 2, 10), f"LAP {lap} / {TARGET_LAPS}", font=self.lap_font, anchor="mt",
+               fill=ORANGE, stroke_width=1, stroke_fill=(0, 0, 0))
+
+        # Finishers list, top left
+        if not finished:
+            return
+        line_h = self.row_font.size + 5
+        pad_x, pad_y = 10, 6
+        rows = [(f"{place}. {self.labels[i]}", self.colors[i]) for place, (i, _) in enumerate(finished, 1)]
+        panel_w = max(self.row_font.getlength(text) for text, _ in rows) + pad_x * 2 + 4
+        panel_h = len(rows) * line_h + pad_y * 2
+        g.rounded_rectangle([pad_x, pad_y, pad_x + panel_w, pad_y + panel_h], radius=4, fill=(0, 0, 0, 158))
+        for n, (text, color) in enumerate(rows):
+            g.text((pad_x + 6, pad_y + pad_y * 0.5 + n * line_h), text, font=self.row_font,
+                   anchor="lt", fill=color, stroke_width=1, stroke_fill=(0, 0, 0))
+
+    def _draw_celebration(self, g, x, y, v, winner):
+        ms = v * 1000
+        length = 20 + 8 * math.sin(ms * 0.01)
+        spin = ms * 0.003
+        for k in range(8):
+            a = spin + k / 8 * 2 * math.pi
+            g.line([(x, y), (x + math.cos(a) * length, y + math.sin(a) * length)],
+                   fill=ORANGE if k % 2 == 0 else (255, 255, 255), width=2)
+        if winner:
+            g.text((x, y - self.track.kart_h * 2.5), "WINNER!", font=self.winner_font, anchor="mm",
+                   fill=ORANGE, stroke_width=2, stroke_fill=(0, 0, 0))
+
+
+# ── Parallel rendering ────────────────────────────────────────────────────────
+_renderer = None
+
+
+def _init_worker(*args):
+    global _renderer
+    _renderer = FrameRenderer(*args)
+
+
+def _render_frame(v: float) -> Image.Image:
+    # Palette frames are a third of the size to ship back and hold for the
+    # WebP encoder, which needs every frame at once
+    return _renderer.render(v).quantize(256, method=Image.Quantize.FASTOCTREE)
+
+
+def video_size(width: int) -> tuple[int, int]:
+    """Frame size with the page's aspect ratio; even dimensions for yuv420p."""
+    width -= width % 2
+    return width, round(width * 0.56) // 2 * 2
+
+
+def frame_times(end: float, fps: int, speed: float) -> list[float]:
+    """Video timestamps: the race at `speed`, then HOLD_SECONDS on the result."""
+    count = math.ceil((end / speed + HOLD_SECONDS) * fps)
+    return [k / fps for k in range(count + 1)]
+
+
+def _previous_files(out_dir: pathlib.Path) -> set[str]:
+    """Video files the race.json currently in out_dir names."""
+    path = out_dir / "race.json"
+    if not path.exists():
+        return set()
+    video = json.loads(path.read_text(encoding="utf-8")).get("video") or {}
+    return {video[k] for k in ("mp4", "webp", "poster") if k in video}
+
+
+def _ffmpeg_mp4(frames, size, fps) -> bytes | None:
+    """H.264 MP4 of the frames, or None without ffmpeg."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    w, h = size
+    # +faststart rewrites the file after encoding, so the output can't be a pipe
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "race.mp4"
+        proc = subprocess.Popen(
+            [ffmpeg, "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{w}x{h}", "-r", str(fps), "-i", "-",
+             "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "26", "-preset", "slow",
+             "-movflags", "+faststart", "-map_metadata", "-1",
+             "-fflags", "+bitexact", "-flags:v", "+bitexact", str(path)],
+            stdin=subprocess.PIPE)
+        try:
+            for frame in frames:
+                proc.stdin.write(frame.convert("RGB").tobytes())
+        except BrokenPipeError:
+            pass
+        proc.stdin.close()
+        if proc.wait() != 0:
+            print("  Video: ffmpeg failed, skipping MP4")
+            return None
+        return path.read_bytes()
+
+
+def export_video(out_dir: pathlib.Path, data: dict, width: int = VIDEO_WIDTH, fps: int = VIDEO_FPS,
+                 speed: float = VIDEO_SPEED, font_path=None, jobs=None) -> dict | None:
+    """Render race.json `data` to race.<hash>.mp4 (.webp without ffmpeg) and race-poster.<hash>.png.
+
+    Returns the race.json "video" entry (content-hashed file names), or None
+    for an empty race.
+    """
+    race = data["race"]
+    if not race["frames"]:
+        return None
+    speed = max(speed, race["end"] / (MAX_VIDEO_SECONDS - HOLD_SECONDS))
+    size = video_size(width)
+    times = frame_times(race["end"], fps, speed)
+    init = (data["racers"], race, *size, speed, font_path)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=init) as pool:
+        frames = list(pool.map(_render_frame, times, chunksize=8))
+
+    keep = _previous_files(out_dir)
+    video = {"width": size[0], "height": size[1]}
+    mp4 = _ffmpeg_mp4(frames, size, fps)
+    if mp4 is not None:
+        kind = "mp4"
+        video["mp4"] = write_hashed(out_dir, "race", "mp4", mp4, keep)
+    else:
+        kind = "webp"
+        buf = io.BytesIO()
+        frames[0].save(buf, "WEBP", save_all=True, append_images=frames[1:],
+                       duration=round(1000 / fps), loop=0, quality=WEBP_QUALITY)
+        video["webp"] = write_hashed(out_dir, "race", "webp", buf.getvalue(), keep)
+    # A race now in the other format: its files go after the grace round
+    other = "webp" if kind == "mp4" else "mp4"
+    for old in out_dir.glob(f"race.*.{other}"):
+        if old.name not in keep:
+            old.unlink()
+
+    # Poster: the standings once everyone's celebration has finished
+    poster = FrameRenderer(*init).render(times[-1])
+    buf = io.BytesIO()
+    poster.save(buf, "PNG", optimize=True)
+    video["poster"] = write_hashed(out_dir, "race-poster", "png", buf.getvalue(), keep)
+
+    public_dir = out_dir.resolve().parent
+    if (public_dir / MANIFEST_NAME).exists():
+        rel = out_dir.resolve().name
+        update_manifest(public_dir, raceVideo=f"{rel}/{video[kind]}",
+                        racePoster=f"{rel}/{video['poster']}")
+
+    kb = (out_dir / video[kind]).stat().st_size / 1024
+    print(f"  Video: {len(frames)} frames {size[0]}x{size[1]} @ {fps} fps ({speed:.1f}x), "
+          f"{kind} {kb:.0f} KB + poster → {out_dir}")
+    return video
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the race in a race.json directory to video")
+    parser.add_argument("race_dir", help="Directory holding race.json (e.g. public/race)")
+    parser.add_argument("--width", type=int, default=VIDEO_WIDTH, help="Video width in px")
+    parser.add_argument("--fps", type=int, default=VIDEO_FPS, help="Frame rate")
+    parser.add_argument("--speed", type=float, default=VIDEO_SPEED,
+                        help="Minimum playback speed relative to the live race")
+    parser.add_argument("--font", default=None, help="Press Start 2P font file for the labels")
+    args = parser.parse_args()
+
+    out_dir = pathlib.Path(args.race_dir)
+    path = out_dir / "race.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["video"] = export_video(out_dir, data, args.width, args.fps, args.speed, args.font)
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
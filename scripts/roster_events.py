@@ -0,0 +1,118 @@
+"""
+Change events between two versions of players.json.
+
+Each scrape appends one NDJSON line per change to public/events.ndjson, so
+consumers can follow the roster incrementally instead of diffing whole
+files. Every event has "ts" (scrape time, UTC ISO 8601) and "type":
+
+    week_reset       detect_new_week() fired; Pokémon assignments were cleared
+    join / leave     player entered or dropped off the board (PLW >= 20)
+    plw_change       {"from", "to"}
+    tier_promotion   {"from", "to"} up basic → evolved → final → legendary
+    tier_demotion    {"from", "to"} the other way (usually after a reset)
+    pokemon_change   {"from", "to", "fromName", "toName"} Pokémon id reassigned
+
+Player events also carry "id" and "name". The log is append-only.
+BoardDiff produces the same events for a board streamed a player at a time.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+TIERS = ["basic", "evolved", "final", "legendary"]
+EVENTS_PATH = os.path.join("public", "events.ndjson")
+
+
+def _tier_rank(tier):
+    return TIERS.index(tier) if tier in TIERS else -1
+
+
+class BoardDiff:
+    """diff_players one player at a time, for boards streamed in board order.
+
+    Holds only the compared fields of the old board (any iterable of players,
+    read once); player() returns the events for each new player and finish()
+    the leave events for old players never seen.
+    """
+
+    def __init__(self, old, ts=None):
+        self.ts = ts or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        # id → (name, plw, tier, pokemonId, pokemonName), in old board order
+        self.before = {p["id"]: (p["name"], p["plw"], p["tier"], p["pokemonId"], p.get("pokemonName"))
+                       for p in old}
+        self.seen = set()
+
+    def _event(self, kind, player, **fields):
+        return {"ts": self.ts, "type": kind, "id": player["id"], "name": player["name"], **fields}
+
+    def week_reset(self):
+        return {"ts": self.ts, "type": "week_reset"}
+
+    def player(self, p):
+        self.seen.add(p["id"])
+        prev = self.before.get(p["id"])
+        if prev is None:
+            return [self._event("join", p, plw=p["plw"], tier=p["tier"], pokemonId=p["pokemonId"])]
+        _, plw, tier, pokemon_id, pokemon_name = prev
+        events = []
+        if plw != p["plw"]:
+            events.append(self._event("plw_change", p, **{"from": plw, "to": p["plw"]}))
+        if tier != p["tier"]:
+            kind = "tier_promotion" if _tier_rank(p["tier"]) > _tier_rank(tier) else "tier_demotion"
+            events.append(self._event(kind, p, **{"from": tier, "to": p["tier"]}))
+        if pokemon_id != p["pokemonId"]:
+            events.append(self._event("pokemon_change", p, **{
+                "from": pokemon_id, "to": p["pokemonId"],
+                "fromName": pokemon_name, "toName": p.get("pokemonName")}))
+        return events
+
+    def finish(self):
+        return [self._event("leave", {"id": pid, "name": prev[0]}, plw=prev[1])
+                for pid, prev in self.before.items() if pid not in self.seen]
+
+
+def diff_players(old, new, week_reset=False, ts=None):
+    """Events turning the `old` player list into `new`, in board order."""
+    diff = BoardDiff(old, ts)
+    events = [diff.week_reset()] if week_reset else []
+    for p in new:
+        events.extend(diff.player(p))
+    events.extend(diff.finish())
+    return events
+
+
+def iter_players(path):
+    """load_players a player at a time: players.ndjson is read a line at a time."""
+    if not path.endswith(".ndjson"):
+        yield from load_players(path)
+        return
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except (OSError, ValueError):
+        return
+
+
+def load_players(path):
+    """Previous players.json (or players.ndjson), or [] if there isn't one (or it is unreadable)."""
+    try:
+        with open(path) as f:
+            if path.endswith(".ndjson"):
+                return [json.loads(line) for line in f if line.strip()]
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def event_line(event):
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def append_events(events, path=EVENTS_PATH):
+    if not events:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        for e in events:
+            f.write(event_line(e))
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Synthetic PS11 roster pages for scale testing.
+
+roster_html() builds a ck_data_PS11.html-shaped page with any number of
+players: a club summary table without a PLW column, then one or more roster
+tables (Name, Lessons, Games, Puzzles, Points, PLW, USCF, Group) with
+comma-formatted numbers and blank spacer rows. Output is deterministic for
+a given seed.
+
+serve() puts the pages behind a local HTTP server so the live scrapers can
+be pointed at it (scraper.py --url, mario_kart_leaderboard.py --url):
+
+    http://127.0.0.1:8011/ck_data_PS11.html?players=5000&tables=4&seed=1
+
+Two layouts exercise scripts/roster_harvest.py:
+
+    &page_size=100   server-side pages of 100 rows, linked by a "Next ›" pager
+    &virtual=40      one table in a scroll box that only keeps ~40 rows in
+                     the DOM and re-renders them as it scrolls
+
+Usage:
+    python scripts/roster_fixtures.py --players 10000 --output roster.html
+    python scripts/roster_fixtures.py --players 500 --page-size 50 --output page1.html
+    python scripts/roster_fixtures.py --serve [--port 8011]
+"""
+import argparse
+import functools
+import html
+import itertools
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HEADERS = ["Name", "Lessons", "Games", "Puzzles", "Points", "PLW", "USCF", "Group"]
+GROUPS = ["Pawn", "Knight", "Bishop", "Rook", "Queen", "King"]
+FIRST_NAMES = [
+    "Aaliyah", "Aiden", "Amara", "Ben", "Chloe", "Daniel", "Elena", "Ethan",
+    "Fatima", "Gabriel", "Hana", "Isaac", "Jada", "Kai", "Leo", "Maya",
+    "Mateo", "Nia", "Omar", "Priya", "Quinn", "Rosa", "Sam", "Sofia",
+    "Theo", "Uma", "Victor", "Wen", "Xavier", "Yara", "Zoe", "Zion",
+]
+LAST_NAMES = [
+    "Adams", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Huang",
+    "Ito", "Johnson", "Kim", "Lopez", "Morris", "Nguyen", "Okafor", "Patel",
+    "Quispe", "Rivera", "Singh", "Tang", "Usman", "Vargas", "Williams",
+    "Xu", "Young", "Zhang",
+]
+
+DEFAULT_PORT = 8011
+PAGE_PATH = "/ck_data_PS11.html"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>PS11 Chess Club Data</title>
+<style>table{{border-collapse:collapse}}td,th{{border:1px solid #ccc;padding:2px 6px}}</style>
+</head><body>
+<h2>PS11 Chess Club and Team Stats</h2>
+{tables}
+</body></html>
+"""
+
+ROW_HEIGHT = 24  # px, fixed so the virtual table can compute its window
+
+# Renders only the rows in view (plus a few either side) between two spacer
+# rows sized to stand in for the rest, like a virtualized data grid
+VIRTUAL_TEMPLATE = """<div id="roster-scroll" style="height:480px;overflow-y:auto">
+<table id="roster" style="width:100%">
+<thead><tr>{header}</tr></thead>
+<tbody></tbody>
+</table>
+</div>
+<script>
+const ROWS = {rows};
+const WINDOW = {window}, ROW_H = {row_height};
+const scroller = document.getElementById('roster-scroll');
+const body = document.querySelector('#roster tbody');
+function spacer(h) {{
+  const tr = document.createElement('tr');
+  tr.style.height = h + 'px';
+  return tr;
+}}
+function render() {{
+  const first = Math.max(0, Math.floor(scroller.scrollTop / ROW_H) - 5);
+  const last = Math.min(ROWS.length, first + WINDOW);
+  const trs = [spacer(first * ROW_H)];
+  for (let i = first; i < last; i++) {{
+    const tr = document.createElement('tr');
+    tr.style.height = ROW_H + 'px';
+    for (const text of ROWS[i]) {{
+      const td = document.createElement('td');
+      td.textContent = text;
+      tr.appendChild(td);
+    }}
+    trs.push(tr);
+  }}
+  trs.push(spacer((ROWS.length - last) * ROW_H));
+  body.replaceChildren(...trs);
+}}
+scroller.addEventListener('scroll', render);
+render();
+</script>
+"""
+
+
+def fmt(n):
+    """Numbers as the roster shows them: 1234 → '1,234'."""
+    return f"{n:,}"
+
+
+def player_names(n, rng):
+    """n unique 'First Last' names (numbered once the combinations run out)."""
+    seen = {}
+    for _ in range(n):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        yield name if count == 1 else f"{name} {count}"
+
+
+def player_rows(n, seed=0):
+    """Yield n roster rows as lists of cell strings, in HEADERS order."""
+    rng = random.Random(seed)
+    for name in player_names(n, rng):
+        # Most students are quiet in a given week; a few play a lot
+        plw = 0 if rng.random() < 0.3 else int(rng.paretovariate(1.6) * 12)
+        puzzles = int(rng.expovariate(1 / 900))
+        games = rng.randint(0, 400)
+        lessons = rng.randint(0, 120)
+        points = puzzles * 3 + games * 10 + lessons * 25
+        uscf = rng.choice([0, 0, rng.randint(100, 1800)])
+        group = f"{rng.choice(GROUPS)} {rng.randint(1, 12)}"
+        yield [name, fmt(lessons), fmt(games), fmt(puzzles), fmt(points), fmt(plw), fmt(uscf), group]
+
+
+def _tr(cells, tag="td"):
+    return "<tr>" + "".join(f"<{tag}>{html.escape(c)}</{tag}>" for c in cells) + "</tr>\n"
+
+
+def summary_table(n, tables):
+    """The non-roster table the scrapers have to skip past."""
+    rows = [_tr(["Club", "Students", "Roster tables"], "th"),
+            _tr(["PS11", fmt(n), str(tables)])]
+    return "<table>\n" + "".join(rows) + "</table>\n"
+
+
+def _pager(page, pages, query):
+    """Prev/next links in the style of a server-rendered data table."""
+    def link(n, text, rel):
+        return f'<a rel="{rel}" href="{PAGE_PATH}?{query}&amp;page={n}">{text}</a>'
+    prev = link(page - 1, "‹ Prev", "prev") if page > 1 else '<span class="disabled">‹ Prev</span>'
+    nxt = link(page + 1, "Next ›", "next") if page < pages else '<span class="disabled">Next ›</span>'
+    return f'<div class="pager">{prev} <span>Page {page} of {pages}</span> {nxt}</div>\n'
+
+
+def roster_html(players, tables=1, seed=0, blank_every=25, page=1, page_size=0, query=""):
+    """A roster page: summary table, then `players` rows split over `tables` tables.
+
+    Every `blank_every`-th row is an empty spacer row (0 disables them). With
+    page_size only that page's rows are shown, followed by a pager whose links
+    carry `query` (the page's other URL parameters).
+    """
+    tables = max(1, tables)
+    start, count, pages = 0, players, 1
+    if page_size:
+        pages = max(1, -(-players // page_size))
+        page = min(max(1, page), pages)
+        start = (page - 1) * page_size
+        count = max(0, min(page_size, players - start))
+    per_table = -(-count // tables) if count else 0
+    rows = itertools.islice(player_rows(players, seed), start, start + count)
+    parts = [summary_table(players, tables)]
+    for t in range(tables):
+        n = min(per_table, count - t * per_table)
+        if n <= 0 and t:
+            break
+        parts.append("<table>\n")
+        parts.append(_tr(HEADERS, "th"))
+        for i in range(n):
+            if blank_every and i and i % blank_every == 0:
+                parts.append(_tr([" "] * len(HEADERS)))
+            parts.append(_tr(next(rows)))
+        parts.append("</table>\n")
+    if page_size:
+        parts.append(_pager(page, pages, query))
+    return PAGE_TEMPLATE.format(tables="".join(parts))
+
+
+def virtual_roster_html(players, seed=0, window=40):
+    """A roster page whose table only keeps about `window` rows in the DOM."""
+    rows = json.dumps(list(player_rows(players, seed))).replace("</", "<\\/")
+    header = "".join(f"<th>{html.escape(h)}</th>" for h in HEADERS)
+    body = VIRTUAL_TEMPLATE.format(header=header, rows=rows, window=window, row_height=ROW_HEIGHT)
+    return PAGE_TEMPLATE.format(tables=summary_table(players, 1) + body)
+
+
+# ── Local server ─────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=32)
+def _page_bytes(players, tables, seed, blank_every, page, page_size, virtual, query):
+    if virtual:
+        return virtual_roster_html(players, seed, virtual).encode("utf-8")
+    return roster_html(players, tables, seed, blank_every, page, page_size, query).encode("utf-8")
+
+
+class RosterHandler(BaseHTTPRequestHandler):
+    """GET /ck_data_PS11.html?players=N&tables=K&seed=S&blank=B[&page_size=P&page=I][&virtual=W]"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != PAGE_PATH:
+            self.send_error(404)
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        rest = "&amp;".join(f"{k}={html.escape(v)}" for k, v in sorted(query.items()) if k != "page")
+        try:
+            body = _page_bytes(
+                int(query.get("players", 30)),
+                int(query.get("tables", 1)),
+                int(query.get("seed", 0)),
+                int(query.get("blank", 25)),
+                int(query.get("page", 1)),
+                int(query.get("page_size", 0)),
+                int(query.get("virtual", 0)),
+                rest,
+            )
+        except ValueError:
+            self.send_error(400, "players, tables, seed, blank, page, page_size and virtual must be integers")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT):
+    """Start the fixture server on a background thread. Returns (server, page URL).
+
+    port=0 picks a free port. Call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), RosterHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{PAGE_PATH}"
+
+
+def page_url(base_url, players, tables=1, seed=0, blank_every=25, page_size=0, virtual=0):
+    url = f"{base_url}?players={players}&tables={tables}&seed={seed}&blank={blank_every}"
+    if page_size:
+        url += f"&page_size={page_size}"
+    if virtual:
+        url += f"&virtual={virtual}"
+    return url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate or serve synthetic PS11 roster pages")
+    parser.add_argument("--players", type=int, default=30, help="Number of players (default: 30)")
+    parser.add_argument("--tables", type=int, default=1, help="Roster tables to split players over")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--blank-every", type=int, default=25,
+                        help="Insert an empty row every N rows (0: none)")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="Paginate: write only the first page of this many rows (0: all)")
+    parser.add_argument("--virtual", type=int, default=0,
+                        help="Virtualized table keeping about this many rows in the DOM (0: off)")
+    parser.add_argument("--output", help="Write the page here (default: stdout)")
+    parser.add_argument("--serve", action="store_true", help="Serve pages over HTTP instead")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        server, url = serve(port=args.port)
+        print(f"Serving {page_url(url, args.players, args.tables, args.seed, args.blank_every, args.page_size, args.virtual)}")
+        print("Ctrl-C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    if args.virtual:
+        page = virtual_roster_html(args.players, args.seed, args.virtual)
+    else:
+        page = roster_html(args.players, args.tables, args.seed, args.blank_every, page_size=args.page_size)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(page)
+        print(f"Wrote {args.players} players → {args.output} ({len(page) / 1024:.0f} KB)")
+    else:
+        print(page, end="")
+
+
+if __name__ == "__main__":
+    main()
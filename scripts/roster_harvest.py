@@ -0,0 +1,300 @@
+"""
+Harvest roster tables that paginate or render their rows lazily.
+
+Reading the DOM once silently truncates a roster split over pages, a table
+that loads more rows as it scrolls, or a virtualized table that only keeps
+the rows in view. The harvester reads the PLW tables (every table, if none
+has a PLW header) one window at a time:
+
+  1. the rows currently in the DOM
+  2. jump the table's scroll container (or the page) to the bottom; if new
+     rows show up and the old ones stayed, keep loading at the bottom, if
+     they replaced the old ones, walk the table from the top a screen at
+     a time
+  3. click an enabled "next page" control, wait for the rows to change and
+     start over; a page with nothing new ends the walk
+
+Rows are deduplicated by player key (lower-cased name, as build_players
+keys players) as they arrive, and each window is handed on before the next
+is read, so no more than one window of DOM text is held at a time.
+
+harvest() (Selenium, Playwright sync) and harvest_async() (Playwright async)
+drive the same walk and yield (table, cells, is_header) rows, like
+roster_tables.mark_headers(iter_rows(...)): tables are numbered in page order
+and each one's header row comes first. A table's rows continue on every page,
+after the other tables' rows of the page before, so the header flag (not a
+change of table number) is what marks a header.
+"""
+import asyncio
+import shutil
+import tempfile
+import time
+from html import escape
+
+from roster_tables import NAME_RE
+
+SETTLE = 0.25          # seconds for rows to render after a scroll or click
+PAGE_TIMEOUT = 15      # seconds to wait for the next page's rows
+MAX_PAGES = 500
+
+_TABLES_JS = """
+  const re = /^plw$|^points.last.week$/i;
+  const text = c => c.textContent.replace(/\\s+/g, ' ').trim();
+  const all = Array.from(document.querySelectorAll('table'));
+  const plw = all.filter(t => t.rows[0] && Array.from(t.rows[0].cells).some(c => re.test(text(c))));
+  const tables = plw.length ? plw : all;
+"""
+
+# Rows of every roster table as cell text, header row first
+READ_TABLES_JS = """() => {""" + _TABLES_JS + """
+  return tables.map(t => Array.from(t.rows, r => Array.from(r.cells, text)));
+}"""
+
+# What changes when a new page is shown; null while there is no table yet
+SIGNATURE_JS = """() => {""" + _TABLES_JS + """
+  const t = tables[0];
+  if (!t || t.rows.length < 2) return null;
+  const rows = t.rows;
+  return JSON.stringify([location.href, rows.length, text(rows[1]), text(rows[rows.length - 1])]);
+}"""
+
+# Scroll the first table's scroll container (or the page): 'top', 'bottom'
+# or 'step' (most of a screen down)
+SCROLL_JS = """(how) => {""" + _TABLES_JS + """
+  let el = tables[0] ? tables[0].parentElement : null;
+  while (el && el !== document.body && el !== document.documentElement) {
+    const overflow = getComputedStyle(el).overflowY;
+    if ((overflow === 'auto' || overflow === 'scroll') && el.scrollHeight > el.clientHeight + 1) break;
+    el = el.parentElement;
+  }
+  if (!el || el === document.body || el === document.documentElement) {
+    el = document.scrollingElement || document.documentElement;
+  }
+  const before = el.scrollTop;
+  if (how === 'top') el.scrollTop = 0;
+  else if (how === 'bottom') el.scrollTop = el.scrollHeight;
+  else el.scrollTop = before + el.clientHeight * 0.9;
+  return { moved: el.scrollTop !== before };
+}"""
+
+# Click an enabled "next page" control; false when there is none
+NEXT_PAGE_JS = """() => {
+  const label = /^(next\\b.*|›|»|>|→)$/i;
+  const controls = document.querySelectorAll(
+    'a, button, [role="button"], input[type="button"], input[type="submit"]');
+  for (const el of controls) {
+    const text = (el.getAttribute('aria-label') || el.value || el.textContent || '')
+      .replace(/\\s+/g, ' ').trim();
+    if (!(el.matches('[rel~="next"]') || label.test(text))) continue;
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true' || el.closest('.disabled')) continue;
+    el.click();
+    return true;
+  }
+  return false;
+}"""
+
+
+def player_key(name):
+    return name.lower().strip()
+
+
+class _Window:
+    """Dedupe state: turns each window's tables into the rows not seen before."""
+
+    def __init__(self):
+        self.seen = set()
+        self.headed = set()   # tables whose header row was already yielded
+        self.name_cols = {}
+        self.windows = 0
+        self.duplicates = 0
+
+    def new_rows(self, tables):
+        """Header rows not yet passed on plus unseen players; sets self.added."""
+        self.windows += 1
+        self.added = 0
+        rows = []
+        for t, table in enumerate(tables or []):
+            if not table:
+                continue
+            header, data = table[0], table[1:]
+            if t not in self.headed:
+                self.headed.add(t)
+                self.name_cols[t] = next((i for i, c in enumerate(header) if NAME_RE.match(c)), 0)
+                rows.append((t, header, True))
+            col = self.name_cols[t]
+            for cells in data:
+                key = player_key(cells[col]) if col < len(cells) else ""
+                if not key:
+                    continue
+                if key in self.seen:
+                    self.duplicates += 1
+                    continue
+                self.seen.add(key)
+                self.added += 1
+                rows.append((t, cells, False))
+        return rows
+
+
+def _walk(settle, page_timeout, max_pages):
+    """The harvest as a sequence of steps, independent of the browser library.
+
+    Yields ("eval", js, arg) and is sent back the result (None on error),
+    ("sleep", seconds), and ("rows", [(table, cells, is_header), ...]) to pass on.
+    """
+    state = _Window()
+
+    def read(tables=None):
+        if tables is None:
+            tables = yield ("eval", READ_TABLES_JS, None)
+        rows = state.new_rows(tables)
+        if rows:
+            yield ("rows", rows)
+        return state.added
+
+    def first_rows(tables):
+        # Skipping spacer rows, which virtualized tables keep at the top
+        return [next((r for r in t[1:] if any(c.strip() for c in r)), None) for t in tables or []]
+
+    pages = 0
+    while True:
+        pages += 1
+        tables = yield ("eval", READ_TABLES_JS, None)
+        new = yield from read(tables)
+        if pages > 1 and not new:
+            break  # "next" led back to rows we have (wrapped around or stuck)
+
+        # Rows that only render on scroll
+        pos = yield ("eval", SCROLL_JS, "bottom")
+        if pos and pos.get("moved"):
+            yield ("sleep", settle)
+            after = yield ("eval", READ_TABLES_JS, None)
+            top = first_rows(tables)
+            if top and first_rows(after) != top:
+                # Virtualized: the top rows were swapped out, so walk every
+                # window from the top to keep the rows in order
+                yield ("eval", SCROLL_JS, "top")
+                while True:
+                    pos = yield ("eval", SCROLL_JS, "step")
+                    if not pos or not pos.get("moved"):
+                        break
+                    yield ("sleep", settle)
+                    yield from read()
+            else:
+                # Appended below the old rows: keep loading at the bottom
+                more = yield from read(after)
+                while more:
+                    yield ("eval", SCROLL_JS, "bottom")
+                    yield ("sleep", settle)
+                    more = yield from read()
+
+        if pages >= max_pages:
+            print(f"  Harvest: stopped at {max_pages} pages")
+            break
+        before = yield ("eval", SIGNATURE_JS, None)
+        clicked = yield ("eval", NEXT_PAGE_JS, None)
+        if not clicked:
+            break
+        # Wait for different rows, then for them to stop changing (a page
+        # loaded by navigation may still be parsing)
+        deadline = time.monotonic() + page_timeout
+        last = before
+        while True:
+            yield ("sleep", settle)
+            sig = yield ("eval", SIGNATURE_JS, None)
+            if sig is not None and sig != before and sig == last:
+                break
+            last = sig
+            if time.monotonic() > deadline:
+                print(f"  Harvest: page {pages + 1} never showed new rows, stopping")
+                sig = None
+                break
+        if sig is None:
+            break
+
+    print(f"  Harvest: {len(state.seen)} players from {pages} page(s), {state.windows} window(s), "
+          f"{state.duplicates} repeated rows skipped")
+
+
+def harvest(evaluate, settle=SETTLE, page_timeout=PAGE_TIMEOUT, max_pages=MAX_PAGES):
+    """Yield (table, cells, is_header) rows across pages and scroll windows.
+
+    evaluate(js, arg) runs a JS function expression in the page and returns
+    its result: page.evaluate for Playwright, selenium_evaluate(driver) for
+    Selenium.
+    """
+    walk = _walk(settle, page_timeout, max_pages)
+    result = None
+    while True:
+        try:
+            step = walk.send(result)
+        except StopIteration:
+            return
+        result = None
+        if step[0] == "rows":
+            yield from step[1]
+        elif step[0] == "sleep":
+            time.sleep(step[1])
+        else:
+            try:
+                result = evaluate(step[1], step[2])
+            except Exception:
+                pass  # page navigating mid-call; the walk polls again
+
+
+async def harvest_async(evaluate, settle=SETTLE, page_timeout=PAGE_TIMEOUT, max_pages=MAX_PAGES):
+    """harvest() for an async evaluate (Playwright's async page.evaluate)."""
+    walk = _walk(settle, page_timeout, max_pages)
+    result = None
+    while True:
+        try:
+            step = walk.send(result)
+        except StopIteration:
+            return
+        result = None
+        if step[0] == "rows":
+            for row in step[1]:
+                yield row
+        elif step[0] == "sleep":
+            await asyncio.sleep(step[1])
+        else:
+            try:
+                result = await evaluate(step[1], step[2])
+            except Exception:
+                pass  # page navigating mid-call; the walk polls again
+
+
+def selenium_evaluate(driver):
+    """evaluate(js, arg) for a Selenium driver."""
+    return lambda js, arg=None: driver.execute_script(f"return ({js})(arguments[0]);", arg)
+
+
+# ── Saving harvested rows ────────────────────────────────────────────────────
+def _tr(cells, tag):
+    return "<tr>" + "".join(f"<{tag}>{escape(c)}</{tag}>" for c in cells) + "</tr>\n"
+
+
+def tee_html(rows, f):
+    """Pass (table, cells, is_header) rows through while writing them to f as
+    HTML tables (header in <th>).
+
+    Pages interleave the tables' rows, so each table is spooled to a temp
+    file as its rows arrive and f gets one <table> per table, in order, once
+    the rows run out. The file reads back with roster_tables.iter_rows /
+    PlwTable / pandas like a roster shown on a single page.
+    """
+    spools = {}
+    try:
+        for table, cells, is_header in rows:
+            spool = spools.get(table)
+            if spool is None:
+                spool = spools[table] = tempfile.TemporaryFile("w+", encoding="utf-8")
+            spool.write(_tr(cells, "th" if is_header else "td"))
+            yield table, cells, is_header
+        for table in sorted(spools):
+            spools[table].seek(0)
+            f.write("<table>\n")
+            shutil.copyfileobj(spools[table], f)
+            f.write("</table>\n")
+    finally:
+        for spool in spools.values():
+            spool.close()
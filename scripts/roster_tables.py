@@ -0,0 +1,212 @@
+"""
+Streaming roster-table extraction for the PS11 roster pages.
+
+Replaces pandas.read_html for the race script: the page is fed to a stdlib
+HTMLParser in chunks, rows are yielded as soon as they close, and scanning
+stops at the end of the first table whose header has a PLW column.
+"""
+import heapq
+import re
+from html.parser import HTMLParser
+
+PLW_RE  = re.compile(r"(?i)^plw$|^points.last.week$")
+NAME_RE = re.compile(r"(?i)^name$|^student|^player")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _RowParser(HTMLParser):
+    """Collects (table_index, [cell text, ...]) tuples as each <tr> closes."""
+
+    def __init__(self, cell_tags=("td", "th")):
+        super().__init__(convert_charrefs=True)
+        self.cell_tags = cell_tags
+        self.rows = []        # completed rows, drained by iter_rows()
+        self._tables = []     # stack of open table indexes
+        self._count = 0
+        self._cells = None    # cells of the open <tr>
+        self._text = None     # text fragments of the open <td>/<th>
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._tables.append(self._count)
+            self._count += 1
+        elif not self._tables:
+            return
+        elif tag == "tr":
+            self._close_row()
+            self._cells = []
+        elif tag in self.cell_tags:
+            self._close_cell()
+            if self._cells is None:
+                self._cells = []
+            self._text = []
+        elif tag == "br" and self._text is not None:
+            self._text.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "table":
+            self._close_row()
+            if self._tables:
+                self._tables.pop()
+        elif tag == "tr":
+            self._close_row()
+        elif tag in self.cell_tags:
+            self._close_cell()
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _close_cell(self):
+        if self._text is not None:
+            self._cells.append(" ".join("".join(self._text).split()))
+            self._text = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._cells is not None and self._tables:
+            self.rows.append((self._tables[-1], self._cells))
+        self._cells = None
+
+
+def iter_rows(html, chunk_size=CHUNK_SIZE, cell_tags=("td", "th")):
+    """Yield (table_index, cells) for every row in `html`, chunk by chunk.
+
+    cell_tags=("td",) mirrors Selenium's find_elements('td'): header cells
+    are left out and header rows come through empty. `html` may also be an
+    open text file, which is read a chunk at a time.
+    """
+    parser = _RowParser(cell_tags)
+    if hasattr(html, "read"):
+        chunks = iter(lambda: html.read(chunk_size), "")
+    else:
+        chunks = (html[start:start + chunk_size] for start in range(0, len(html), chunk_size))
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.rows:
+            yield from parser.rows
+            parser.rows = []
+    parser.close()
+    yield from parser.rows
+
+
+def mark_headers(rows):
+    """(table, cells) rows of page HTML → (table, cells, is_header): the
+    first row of each table is its header, as roster_harvest marks them."""
+    current = None
+    for table, cells in rows:
+        yield table, cells, table != current
+        current = table
+
+
+def parse_int(text):
+    """'1,234' → 1234; blanks and non-numeric cells → 0."""
+    clean = (text or "").replace(",", "").strip()
+    try:
+        return int(float(clean))
+    except ValueError:
+        return 0
+
+
+class PlwTable:
+    """The first table with a PLW header, plus the headers of tables skipped.
+
+    rows= takes (table, cells, is_header) rows instead of html, e.g. from
+    roster_harvest.harvest(); a harvested table continues on every page, so
+    those are read to the end rather than stopping at the next table.
+    """
+
+    def __init__(self, html=None, chunk_size=CHUNK_SIZE, rows=None):
+        self.headers = []     # header row of every table scanned
+        self.name_col = None
+        self.plw_col = None
+        self._paged = rows is not None
+        self._rows = iter(rows) if self._paged else mark_headers(iter_rows(html, chunk_size))
+        self._table = self._locate()
+
+    @property
+    def found(self):
+        return self._table is not None
+
+    def _locate(self):
+        for table, cells, is_header in self._rows:
+            if not is_header:
+                continue
+            self.headers.append(cells)
+            plw = [i for i, c in enumerate(cells) if PLW_RE.match(c)]
+            if not plw:
+                continue
+            self.plw_col = plw[0]
+            named = [i for i, c in enumerate(cells) if NAME_RE.match(c)]
+            if named:
+                self.name_col = named[0]
+            return table
+        return None
+
+    def __iter__(self):
+        """Yield (name, plw) for each data row; stops when the table ends."""
+        if self._table is None:
+            return
+        for table, cells, is_header in self._rows:
+            if table != self._table:
+                if table > self._table and not self._paged:
+                    break
+                continue
+            if is_header:
+                continue
+            if self.name_col is None:
+                # First non-numeric column heuristic (pandas' "object" dtype)
+                self.name_col = next(
+                    (i for i, c in enumerate(cells)
+                     if i != self.plw_col and c and not c.replace(",", "").replace(".", "").isdigit()),
+                    None,
+                )
+                if self.name_col is None:
+                    continue
+            if max(self.name_col, self.plw_col) >= len(cells):
+                continue
+            name = cells[self.name_col].strip()
+            if not name:
+                continue
+            yield name, parse_int(cells[self.plw_col])
+
+
+def top_by_plw(rows, n):
+    """Top `n` (name, plw) rows by PLW with a bounded min-heap; ties keep page order.
+
+    n of 0/None keeps every row (full-roster race), still sorted by PLW.
+    """
+    if not n:
+        ranked = sorted(((plw, -seq, name) for seq, (name, plw) in enumerate(rows)), reverse=True)
+        return [(name, plw) for plw, _, name in ranked]
+    heap = []
+    for seq, (name, plw) in enumerate(rows):
+        item = (plw, -seq, name)
+        if len(heap) < n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [(name, plw) for plw, _, name in sorted(heap, reverse=True)]
+
+
+def read_plw_table_pandas(html):
+    """pandas.read_html backend: (name, plw) rows of the first PLW table, or None."""
+    import io
+    import pandas as pd
+
+    for tbl in pd.read_html(io.StringIO(html)):
+        plw_col = next((c for c in tbl.columns if PLW_RE.match(str(c).strip())), None)
+        if plw_col is None:
+            continue
+        name_col = next((c for c in tbl.columns if NAME_RE.match(str(c).strip())), None)
+        if name_col is None:
+            name_col = next((c for c in tbl.columns if tbl[c].dtype == object), None)
+        if name_col is None:
+            return None
+        df = tbl[[name_col, plw_col]].copy()
+        df.columns = ["name", "plw"]
+        df["plw"] = pd.to_numeric(df["plw"], errors="coerce").fillna(0)
+        df = df[df["name"].notna() & (df["name"].astype(str).str.strip() != "")]
+        return [(str(r.name).strip(), int(r.plw)) for r in df.itertuples(index=False)]
+    return None
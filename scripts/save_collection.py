@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Save the weekly Pokemon collection snapshot.
+
+Copies public/players.json into public/collections/<date>.json as
+{"date": ..., "players": [...]}, refreshes public/collections/index.json
+(the list of saved dates), folds the week into aggregates.json (see
+collection_aggregates.py) and into the per-player history shards under
+collections/players/ (see player_shards.py). Replaces the jq steps of save-collection.yml so
+the pipeline runner can call it as a stage.
+
+Usage:
+    python scripts/save_collection.py [--date YYYY-MM-DD]
+"""
+import argparse
+import json
+import pathlib
+from datetime import date as Date
+
+from collection_aggregates import AGGREGATES_FILE, rebuild_aggregates, update_aggregates, write_aggregates
+from hashed_output import write_hashed_entry
+from player_shards import rebuild_shards, update_shards
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+PLAYERS_PATH = REPO_ROOT / "public" / "players.json"
+COLLECTIONS_DIR = REPO_ROOT / "public" / "collections"
+
+
+def write_json(path: pathlib.Path, data):
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def save_snapshot(players_path: pathlib.Path, collections_dir: pathlib.Path, date: str) -> dict | None:
+    """Write collections/<date>.json. Returns the snapshot, or None without players.json."""
+    if not players_path.exists():
+        print(f"No {players_path.name} found, skipping")
+        return None
+    players = json.loads(players_path.read_text(encoding="utf-8"))
+    snapshot = {"date": date, "players": players}
+    collections_dir.mkdir(parents=True, exist_ok=True)
+    write_json(collections_dir / f"{date}.json", snapshot)
+    print(f"Saved collection for {date}")
+    return snapshot
+
+
+def update_index(collections_dir: pathlib.Path) -> list[str]:
+    """Rewrite index.json with every dated snapshot, oldest first."""
+    dates = sorted(p.stem for p in collections_dir.glob("20*.json"))
+    write_json(collections_dir / "index.json", dates)
+    return dates
+
+
+def publish_hashed(collections_dir: pathlib.Path):
+    """Content-hashed copies of index.json and aggregates.json, listed in public/manifest.json."""
+    for key, name in (("collections", "index.json"), ("aggregates", AGGREGATES_FILE)):
+        path = collections_dir / name
+        if path.exists():
+            stem = pathlib.Path(name).stem
+            write_hashed_entry(collections_dir.parent, key, collections_dir.name, stem, "json",
+                               path.read_text(encoding="utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--date", default=Date.today().isoformat(),
+                        help="Snapshot date (default: today)")
+    parser.add_argument("--players", default=str(PLAYERS_PATH),
+                        help="players.json to snapshot")
+    parser.add_argument("--collections", default=str(COLLECTIONS_DIR),
+                        help="Collections directory")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Only rebuild aggregates.json and player shards from every saved snapshot")
+    args = parser.parse_args()
+
+    collections_dir = pathlib.Path(args.collections)
+    if args.rebuild:
+        agg = rebuild_aggregates(collections_dir)
+        write_aggregates(collections_dir / AGGREGATES_FILE, agg)
+        print(f"Rebuilt aggregates: {len(agg['weeks'])} weeks, {len(agg['players'])} players")
+        print(f"Rebuilt {rebuild_shards(collections_dir)} player shards")
+        publish_hashed(collections_dir)
+        return
+
+    snapshot = save_snapshot(pathlib.Path(args.players), collections_dir, args.date)
+    if snapshot is None:
+        return
+    dates = update_index(collections_dir)
+    print(f"Index: {len(dates)} collections")
+    agg = update_aggregates(collections_dir, snapshot)
+    print(f"Aggregates: {len(agg['weeks'])} weeks, {len(agg['players'])} players")
+    print(f"Player shards: {update_shards(collections_dir, snapshot)} files updated")
+    publish_hashed(collections_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Prebuilt player search index for the dashboard.
+
+Instead of scanning every player on each keystroke, the dashboard looks
+queries up in search.<hash>.json, which the scraper writes next to
+players.json (manifest.json "search" points at it):
+
+    {"v": 2,
+     "ids": [player id, ...],            doc number → id, in board order
+     "tri": {"abc": [doc, ...], ...}}    trigrams of each searched field
+
+Postings are ascending doc numbers. The searched fields (name,
+pokemonName) go through normalize() first: accents folded, lower case,
+any run of other characters → one space. app/search.ts mirrors it: a
+query of three or more characters intersects the postings of its
+trigrams and checks the few candidates for the substring. Shorter
+queries have no postings; they match anywhere in a name, as the scan
+before the index did, so the dashboard scans the board for them.
+"""
+import json
+import re
+import unicodedata
+
+VERSION = 2  # 1 also had word-prefix postings for 1–2 character queries
+FIELDS = ("name", "pokemonName")
+
+
+def normalize(text: str) -> str:
+    """'Flabébé  Jr.' → 'flabebe jr'"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.category(c).startswith("M")).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Postings built a player at a time, in board order."""
+
+    def __init__(self):
+        self.ids = []
+        self.tri = {}
+
+    def add(self, player: dict):
+        doc = len(self.ids)
+        self.ids.append(player["id"])
+        grams = set()
+        for field in FIELDS:
+            grams |= trigrams(normalize(str(player.get(field) or "")))
+        for key in grams:
+            self.tri.setdefault(key, []).append(doc)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "v": VERSION,
+            "ids": self.ids,
+            "tri": dict(sorted(self.tri.items())),
+        }, ensure_ascii=False, separators=(",", ":"))
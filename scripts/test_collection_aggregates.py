@@ -0,0 +1,65 @@
+"""
+Incremental aggregates (scripts/collection_aggregates.py) against a rebuild
+from every saved snapshot.
+
+    python -m pytest scripts/test_collection_aggregates.py
+"""
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from collection_aggregates import AGGREGATES_FILE, rebuild_aggregates, update_aggregates
+
+# Weekly saves across the September season boundary
+DATES = ["2026-08-10", "2026-08-17", "2026-08-24", "2026-08-31",
+         "2026-09-07", "2026-09-14", "2026-09-21", "2026-09-28"]
+TIERS = ["basic", "evolved", "final", "legendary"]
+
+
+def snapshot(date, rng, roster=30):
+    """A week's board: a random subset of the roster, legendary tiers common
+    enough for streaks to start and break, and a repeated row."""
+    players = []
+    for i in rng.sample(range(roster), rng.randint(roster // 2, roster)):
+        plw = rng.choice([20, 35, 60, 100, 150, 150])
+        tier = "legendary" if plw >= 100 else rng.choice(TIERS[:3])
+        players.append({"id": f"p{i}", "name": f"Player {i}", "plw": plw, "tier": tier})
+    players.append(dict(players[0]))
+    return {"date": date, "players": players}
+
+
+def save(collections_dir, snap):
+    (collections_dir / f"{snap['date']}.json").write_text(json.dumps(snap), encoding="utf-8")
+    return update_aggregates(collections_dir, snap, k=5)
+
+
+def saved_aggregates(collections_dir):
+    return json.loads((collections_dir / AGGREGATES_FILE).read_text(encoding="utf-8"))
+
+
+def rebuilt(collections_dir):
+    return json.loads(json.dumps(rebuild_aggregates(collections_dir, k=5)))
+
+
+def test_incremental_saves_match_a_rebuild(tmp_path):
+    rng = random.Random(1)
+    for date in DATES:
+        save(tmp_path, snapshot(date, rng))
+    agg = saved_aggregates(tmp_path)
+    assert agg == rebuilt(tmp_path)
+    assert sorted(agg["leaderboards"]["seasons"]) == ["2025-26", "2026-27"]
+    assert agg["leaderboards"]["allTime"]["longestLegendaryStreak"][0]["value"] > 1
+
+
+def test_out_of_order_and_repeated_saves_match_a_rebuild(tmp_path):
+    rng = random.Random(2)
+    order = DATES[4:] + DATES[:4] + [DATES[5], DATES[-1]]
+    for date in order:
+        save(tmp_path, snapshot(date, rng))
+        assert saved_aggregates(tmp_path) == rebuilt(tmp_path)
+    # Appending after a backfill goes back to the incremental path
+    save(tmp_path, snapshot("2026-10-05", rng))
+    assert saved_aggregates(tmp_path) == rebuilt(tmp_path)
@@ -0,0 +1,68 @@
+"""
+Incremental player shards (scripts/player_shards.py) against a rebuild from
+every saved snapshot.
+
+    python -m pytest scripts/test_player_shards.py
+"""
+import json
+import os
+import random
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from player_shards import SHARDS_DIR, rebuild_shards, update_shards
+
+DATES = ["2026-09-07", "2026-09-14", "2026-09-21", "2026-09-28"]
+
+
+def snapshot(date, ids):
+    return {"date": date, "players": [
+        {"id": f"p{i}", "name": f"Player {i}", "plw": 20 + i, "tier": "basic",
+         "pokemonId": i, "puzzles": i * 3}
+        for i in ids]}
+
+
+def save(collections_dir, snap):
+    (collections_dir / f"{snap['date']}.json").write_text(json.dumps(snap), encoding="utf-8")
+    update_shards(collections_dir, snap)
+
+
+def shards(collections_dir):
+    return {path.name: json.loads(path.read_text(encoding="utf-8"))
+            for path in sorted((collections_dir / SHARDS_DIR).glob("*.json"))}
+
+
+def rebuilt(collections_dir, tmp_path):
+    copy = tmp_path / "rebuilt"
+    shutil.copytree(collections_dir, copy)
+    rebuild_shards(copy)
+    return shards(copy)
+
+
+def test_incremental_saves_match_a_rebuild(tmp_path):
+    collections = tmp_path / "collections"
+    collections.mkdir()
+    rng = random.Random(3)
+    for date in DATES:
+        save(collections, snapshot(date, rng.sample(range(20), 12)))
+    assert shards(collections) == rebuilt(collections, tmp_path)
+
+
+def test_resaving_a_date_drops_players_no_longer_on_it(tmp_path):
+    collections = tmp_path / "collections"
+    collections.mkdir()
+    for date in DATES:
+        save(collections, snapshot(date, [*range(10), *([11] if date == DATES[2] else [])]))
+    # Re-saves: p9 drops off two weeks, p11 off its only week, p10 joins one
+    save(collections, snapshot(DATES[2], [*range(9), 10]))
+    save(collections, snapshot(DATES[1], range(10)))
+    save(collections, snapshot(DATES[1], range(9)))
+
+    result = shards(collections)
+    assert result == rebuilt(collections, tmp_path)
+    assert result["p9.json"]["dates"] == [DATES[0], DATES[3]]
+    assert result["index.json"]["p9"]["weeks"] == 2
+    assert result["p10.json"]["dates"] == [DATES[2]]
+    assert "p11.json" not in result and "p11" not in result["index.json"]
@@ -0,0 +1,102 @@
+"""
+Harvest round trips over the synthetic roster (scripts/roster_fixtures.py).
+
+FixturePages stands in for a browser's page.evaluate: it answers the
+harvester's JS with the tables of roster_html() pages and turns pages on
+NEXT_PAGE_JS, so paginated rosters are walked without a browser.
+
+    python -m pytest scripts/test_roster_harvest.py
+"""
+import io
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import scraper
+from roster_fixtures import roster_html
+from roster_harvest import NEXT_PAGE_JS, READ_TABLES_JS, SCROLL_JS, SIGNATURE_JS, harvest, tee_html
+from roster_tables import PLW_RE, PlwTable, iter_rows
+
+PLAYERS = 200
+
+
+class FixturePages:
+    """evaluate(js, arg) over roster_html(players, tables, page_size=...) pages."""
+
+    def __init__(self, players, tables, page_size):
+        self.pages = [roster_html(players, tables, page=p, page_size=page_size)
+                      for p in range(1, -(-players // page_size) + 1)]
+        self.page = 0
+
+    def tables(self):
+        # READ_TABLES_JS: every row (th and td) of the tables with a PLW header
+        tables = {}
+        for table, cells in iter_rows(self.pages[self.page]):
+            tables.setdefault(table, []).append(cells)
+        return [rows for rows in tables.values() if any(PLW_RE.match(c) for c in rows[0])]
+
+    def __call__(self, js, arg=None):
+        if js == READ_TABLES_JS:
+            return self.tables()
+        if js == SIGNATURE_JS:
+            first = self.tables()[0]
+            return json.dumps([self.page, len(first), first[1], first[-1]])
+        if js == SCROLL_JS:
+            return {"moved": False}
+        if js == NEXT_PAGE_JS:
+            if self.page + 1 < len(self.pages):
+                self.page += 1
+                return True
+            return False
+        raise ValueError(js)
+
+
+def names(table_rows):
+    return [row[0] for row in map(scraper.roster_row, table_rows) if row]
+
+
+def single_page(tables):
+    return roster_html(PLAYERS, tables)
+
+
+def test_paginated_tables_keep_every_player():
+    for tables in (1, 2, 3):
+        rows = harvest(FixturePages(PLAYERS, tables, page_size=50), settle=0)
+        harvested = names(scraper.data_rows(rows))
+        assert len(harvested) == PLAYERS
+        assert sorted(harvested) == sorted(names(scraper.html_table_rows(single_page(tables))))
+
+
+def test_headers_are_marked_once_per_table():
+    rows = list(harvest(FixturePages(PLAYERS, 2, page_size=50), settle=0))
+    headers = [(table, cells) for table, cells, is_header in rows if is_header]
+    assert [table for table, _ in headers] == [0, 1]
+    assert all(cells[0] == "Name" for _, cells in headers)
+    assert not any(cells[0] == "Name" for _, cells, is_header in rows if not is_header)
+
+
+def test_saved_harvest_reads_back_like_a_single_page():
+    # Each page splits its rows over the tables, so tables hold other players
+    # than on the single page; the saved file keeps each table's rows together
+    buf = io.StringIO()
+    rows = list(tee_html(harvest(FixturePages(PLAYERS, 2, page_size=50), settle=0), buf))
+    saved = buf.getvalue()
+    by_table = sorted((r for r in rows if not r[2]), key=lambda r: r[0])
+    assert names(scraper.html_table_rows(saved)) == names(scraper.data_rows(by_table))
+    assert sorted(names(scraper.html_table_rows(saved))) == sorted(
+        names(scraper.html_table_rows(single_page(2))))
+
+    buf = io.StringIO()
+    for _ in tee_html(harvest(FixturePages(PLAYERS, 1, page_size=50), settle=0), buf):
+        pass
+    assert buf.getvalue().count("<table>") == 1
+    assert list(PlwTable(buf.getvalue())) == list(PlwTable(single_page(1)))
+
+
+def test_plw_table_reads_harvested_rows_across_pages():
+    rows = harvest(FixturePages(PLAYERS, 1, page_size=50), settle=0)
+    assert list(PlwTable(rows=rows)) == list(PlwTable(single_page(1)))